@@ -0,0 +1,319 @@
+# analysis_stream.py
+# 기출 PDF 분석 결과 스트리밍 저장 + 파일별 체크포인트 (중단 후 재시작 시 이어서 분석)
+
+"""
+사용 예시:
+    stream = AnalysisStream(output_dir, 'csat_meta_analysis', headers, ANALYZER_VERSION)
+    stream.open(pdf_files)                      # 체크포인트와 맞지 않는 기존 결과 정리
+    for pdf_path in pdf_files:
+        if stream.is_done(pdf_path):
+            continue
+        rows = ...                              # 파일 하나 분석
+        stream.append(pdf_path, rows)           # CSV/JSONL 추가 + 체크포인트 기록
+    stream.finalize(sort_key)                   # (년도, 과목, 번호) 순 정렬 후 JSON 배열 저장
+
+    # 멀티코어: PDF 단위로 나누고, 문제가 많은 PDF는 문제 단위로 다시 나눔
+    for pdf_path, rows in analyze_files_parallel(analyzer, pending, max_workers=8):
+        stream.append(pdf_path, rows)
+
+출력 파일 (output_dir 기준):
+    <name>.csv              CSV (파일 하나가 끝날 때마다 행 추가)
+    <name>.jsonl            {"source": PDF 경로, "row": 결과} 한 줄씩 (재시작 시 기준 데이터)
+    <name>.json             전체 결과 배열 (finalize 시 저장, 기존 형식 유지)
+    <name>.checkpoint.json  {PDF 경로: {mtime, version, rows}}
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+# 문제 수가 이보다 많은 PDF는 문제 단위로 나눠서 여러 워커에 분배
+SPLIT_MIN_PROBLEMS = 40
+PROBLEM_CHUNK_SIZE = 10
+
+
+class AnalysisStream:
+    """
+    파일 단위 분석 결과 스트리밍 저장소
+
+    - 파일 하나의 결과를 CSV/JSONL에 추가한 뒤 체크포인트를 기록하므로,
+      중간에 중단되어도 체크포인트에 있는 파일의 결과는 모두 보존됨
+    - 체크포인트 키: PDF 경로 + 수정 시간 + 분석기 버전 (하나라도 다르면 다시 분석)
+    """
+
+    def __init__(self, output_dir, name, headers, version, fill_value=None):
+        self.output_dir = Path(output_dir)
+        self.headers = list(headers)
+        self.version = version
+        self.fill_value = fill_value  # CSV에 없는 항목 기본값 (None이면 빈 칸)
+        self.csv_path = self.output_dir / f'{name}.csv'
+        self.jsonl_path = self.output_dir / f'{name}.jsonl'
+        self.json_path = self.output_dir / f'{name}.json'
+        self.checkpoint_path = self.output_dir / f'{name}.checkpoint.json'
+        self.checkpoint = {}
+        self.skipped = 0
+        self.appended = 0
+
+    @staticmethod
+    def _file_key(pdf_path):
+        return str(Path(pdf_path).resolve())
+
+    @staticmethod
+    def _mtime(pdf_path):
+        try:
+            return os.stat(pdf_path).st_mtime
+        except OSError:
+            return None
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"[경고] 체크포인트 로드 실패: {e}")
+            return {}
+
+    def _save_checkpoint(self):
+        """체크포인트 저장 (임시 파일 → 교체)"""
+        temp_file = self.checkpoint_path.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'files': self.checkpoint}, f,
+                      ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.checkpoint_path)
+
+    def _load_records(self):
+        """JSONL에서 (source, row) 레코드 로드 (마지막 줄이 깨졌으면 무시)"""
+        records = []
+        try:
+            with open(self.jsonl_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    records.append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _csv_row(self, row):
+        return {header: row.get(header, self.fill_value) for header in self.headers}
+
+    def _rewrite(self, records):
+        """유효한 레코드만으로 CSV/JSONL 다시 쓰기"""
+        with open(self.jsonl_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        with open(self.csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.headers, extrasaction='ignore')
+            writer.writeheader()
+            for record in records:
+                if record.get('row'):
+                    writer.writerow(self._csv_row(record['row']))
+
+    def open(self, pdf_files, resume=True):
+        """
+        스트림 시작
+
+        Args:
+            pdf_files: 이번 실행에서 분석할 PDF 목록
+            resume: False면 체크포인트와 기존 결과를 모두 버리고 처음부터 분석
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.skipped = 0
+        self.appended = 0
+
+        current = {self._file_key(p): self._mtime(p) for p in pdf_files}
+        saved = self._load_checkpoint() if resume else {}
+
+        # 버전/수정 시간이 같고 아직 폴더에 있는 파일만 유효
+        self.checkpoint = {
+            key: entry for key, entry in saved.items()
+            if key in current and entry.get('version') == self.version
+            and entry.get('mtime') == current[key]
+        }
+
+        records = self._load_records() if resume else []
+        valid = [r for r in records if r.get('source') in self.checkpoint]
+
+        # 체크포인트 기록 전에 중단된 파일의 행, 무효화된 파일의 행,
+        # 체크포인트 없이 저장된 이전 형식 결과가 있으면 정리
+        if (not resume or not self.checkpoint_path.exists() or not self.csv_path.exists()
+                or len(valid) != len(records) or set(saved) != set(self.checkpoint)):
+            self._rewrite(valid)
+            self._save_checkpoint()
+
+    def is_done(self, pdf_path):
+        """이미 분석이 끝난 파일인지 (체크포인트 기준)"""
+        done = self._file_key(pdf_path) in self.checkpoint
+        if done:
+            self.skipped += 1
+        return done
+
+    def append(self, pdf_path, rows):
+        """
+        파일 하나의 결과 추가 (CSV/JSONL 추가 → 디스크 반영 → 체크포인트 기록)
+
+        Args:
+            pdf_path: 분석한 PDF 경로
+            rows: 결과 딕셔너리 리스트 (None 항목은 JSON에만 기록)
+        """
+        key = self._file_key(pdf_path)
+
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps({'source': key, 'row': row}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        write_header = not self.csv_path.exists() or self.csv_path.stat().st_size == 0
+        with open(self.csv_path, 'a', encoding='utf-8-sig' if write_header else 'utf-8',
+                  newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.headers, extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            for row in rows:
+                if row:
+                    writer.writerow(self._csv_row(row))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.checkpoint[key] = {
+            'mtime': self._mtime(pdf_path),
+            'version': self.version,
+            'rows': len(rows),
+            'completedAt': int(time.time() * 1000),
+        }
+        self._save_checkpoint()
+        self.appended += len(rows)
+
+    def finalize(self, sort_key=None):
+        """
+        전체 결과를 JSON 배열로 저장 (기존 출력 형식)
+
+        Args:
+            sort_key: 결과 행 정렬 키 함수 (지정하면 CSV/JSONL도 같은 순서로 다시 씀)
+                      - 병렬 처리로 파일 완료 순서가 달라져도 출력은 항상 같음
+
+        Returns:
+            전체 결과 리스트 (이전 실행에서 분석한 파일 포함)
+        """
+        records = [r for r in self._load_records() if r.get('source') in self.checkpoint]
+        if sort_key is not None:
+            # 파일 경로를 보조 키로 사용 (파일 내 행 순서는 안정 정렬로 유지)
+            records.sort(key=lambda r: (sort_key(r.get('row') or {}), r['source']))
+            self._rewrite(records)
+
+        results = [r.get('row') for r in records]
+        temp_file = self.json_path.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.json_path)
+        return results
+
+
+# ========== 멀티코어 분석 (워커 프로세스) ==========
+
+_WORKER_STATE = {}
+
+
+def _init_analysis_worker(analyzer):
+    """워커 초기화: 분석기 객체를 프로세스당 한 번만 전달받음"""
+    _WORKER_STATE['analyzer'] = analyzer
+
+
+def _prepare_in_worker(pdf_path, split_min_problems):
+    """
+    PDF 하나의 텍스트/문제 추출 (문제가 적으면 분석까지 수행)
+
+    Returns:
+        None (텍스트 추출 실패) 또는 (file_info, 분석 전 문제 리스트 또는 None, 결과 행 또는 None)
+    """
+    analyzer = _WORKER_STATE['analyzer']
+    prepared = analyzer.prepare_pdf(pdf_path)
+    if prepared is None:
+        return None
+    file_info, problems = prepared
+    if len(problems) < split_min_problems:
+        return file_info, None, analyzer.analyze_problems(problems, file_info)
+    return file_info, problems, None
+
+
+def _analyze_chunk_in_worker(problems, file_info):
+    """문제 묶음 분석"""
+    return _WORKER_STATE['analyzer'].analyze_problems(problems, file_info)
+
+
+def analyze_files_parallel(analyzer, pdf_files, max_workers=None,
+                           split_min_problems=SPLIT_MIN_PROBLEMS, chunk_size=PROBLEM_CHUNK_SIZE):
+    """
+    여러 PDF를 워커 프로세스로 분석 (완료되는 파일부터 바로 반환)
+
+    analyzer는 prepare_pdf(pdf_path) -> (file_info, problems) 또는 None,
+    analyze_problems(problems, file_info) -> 결과 행 리스트 를 제공해야 함
+
+    Args:
+        analyzer: 분석기 객체 (워커마다 한 번 pickle로 전달)
+        pdf_files: 분석할 PDF 목록
+        max_workers: 워커 수 (None이면 CPU 코어 수)
+        split_min_problems: 이 이상 문제가 있는 PDF는 문제 단위로 분배
+        chunk_size: 문제 단위 분배 시 작업 하나당 문제 수
+
+    Yields:
+        (pdf_path, 결과 행 리스트) - 행은 파일 내 문제 순서 유지, 추출/분석 실패 시 None
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_analysis_worker,
+                             initargs=(analyzer,)) as executor:
+        pending = {
+            executor.submit(_prepare_in_worker, pdf_path, split_min_problems): (pdf_path, None)
+            for pdf_path in pdf_files
+        }
+        split_results = {}  # pdf_path -> 청크별 결과 (순서 유지용 리스트)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pdf_path, chunk_index = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 실패한 파일은 체크포인트에 남기지 않음 (다음 실행에서 다시 분석)
+                    print(f"  [오류] {Path(pdf_path).name}: {e}")
+                    if chunk_index is None or split_results.pop(pdf_path, None) is not None:
+                        yield pdf_path, None
+                    continue
+
+                if chunk_index is not None:
+                    if pdf_path not in split_results:
+                        continue  # 같은 파일의 다른 묶음이 이미 실패함
+                    chunks = split_results[pdf_path]
+                    chunks[chunk_index] = result
+                    if all(chunk is not None for chunk in chunks):
+                        del split_results[pdf_path]
+                        yield pdf_path, [row for chunk in chunks for row in chunk]
+                    continue
+
+                if result is None:
+                    yield pdf_path, None
+                    continue
+
+                file_info, problems, rows = result
+                if problems is None:
+                    yield pdf_path, rows
+                    continue
+
+                # 큰 PDF: 문제 묶음별로 다시 분배
+                chunk_count = (len(problems) + chunk_size - 1) // chunk_size
+                split_results[pdf_path] = [None] * chunk_count
+                for i in range(chunk_count):
+                    chunk = problems[i * chunk_size:(i + 1) * chunk_size]
+                    future = executor.submit(_analyze_chunk_in_worker, chunk, file_info)
+                    pending[future] = (pdf_path, i)
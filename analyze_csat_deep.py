@@ -4,12 +4,33 @@
 
 import os
 import re
-import csv
-import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import sys
 
+from pdf_text_cache import get_page_texts
+from pdf_segmenter import join_pages, missing_numbers, segment_pdf, segment_text
+from analysis_stream import AnalysisStream, analyze_files_parallel
+from taxonomy import scan_keywords, MINOR_UNIT_KEYWORDS, CONCEPT_KEYWORDS, TRAP_KEYWORDS
+from problem_store import ProblemStore, load_analysis_store
+
+# 분석 규칙이 바뀌면 올려서 체크포인트 무효화
+ANALYZER_VERSION = '2026.10-deep-6'
+
+DEEP_HEADERS = [
+    '출제년도', '시행월', '문항번호', '배점', '과목구분',
+    '공식정답률', '난이도등급', '풀이소요시간', '오답률1위선지', '체감난이도',
+    '대단원', '중단원', '핵심개념태그', '개념난이도', '필수선행개념',
+    '문제형식', '조건제시방식', '풀이단계수', '계산복잡도', '함정유형',
+    '출제의도', '출제빈도', '연계여부', '변별력지수', '킬러여부판정'
+]
+
+
+def result_sort_key(row: Dict) -> Tuple:
+    """결과 병합 순서: (출제년도, 과목, 문항번호)"""
+    return (str(row.get('출제년도') or ''), str(row.get('과목구분') or ''),
+            int(row.get('문항번호') or 0))
+
 # AI 분석을 위한 프롬프트 템플릿
 META_ANALYSIS_PROMPT = """당신은 대한민국 수능 수학 출제 경향을 20년간 연구한 최고 전문가입니다.
 아래 수능 문제를 25개 메타 분류 기준으로 심도 있게 분석하세요.
@@ -104,62 +125,21 @@ class DeepCSATAnalyzer:
         # 기본 분석 결과 로드
         self.basic_results = self.load_basic_results()
     
-    def load_basic_results(self) -> List[Dict]:
-        """기본 분석 결과 로드"""
+    def load_basic_results(self) -> Optional[ProblemStore]:
+        """기본 분석 결과 로드 (컬럼 저장소, 행은 RowView로 접근, 출제년도가 빈 행 제외)"""
         csv_path = self.output_dir / 'csat_meta_analysis.csv'
-        if not csv_path.exists():
-            return []
-        
-        results = []
-        with open(csv_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                results.append(row)
-        return results
+        return load_analysis_store(csv_path)
     
     def extract_text_from_pdf(self, pdf_path: Path) -> str:
-        """PDF에서 텍스트 추출"""
-        try:
-            import pdfplumber
-            text_parts = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            return '\n'.join(text_parts)
-        except:
-            try:
-                import fitz
-                doc = fitz.open(pdf_path)
-                text_parts = [page.get_text() for page in doc]
-                doc.close()
-                return '\n'.join(text_parts)
-            except:
-                return ""
+        """PDF에서 텍스트 추출 (페이지 텍스트 캐시 사용)"""
+        return self.extract_pages_from_pdf(pdf_path)[0]
     
-    def extract_problem_text(self, full_text: str, problem_number: int) -> str:
-        """특정 문제 번호의 텍스트 추출"""
-        # 문제 번호 패턴
-        pattern = re.compile(rf'^{problem_number}\.\s+', re.MULTILINE)
-        match = pattern.search(full_text)
-        
-        if not match:
-            return ""
-        
-        start_pos = match.start()
-        
-        # 다음 문제 번호 찾기
-        next_pattern = re.compile(rf'^{problem_number + 1}\.\s+', re.MULTILINE)
-        next_match = next_pattern.search(full_text, start_pos)
-        
-        if next_match:
-            end_pos = next_match.start()
-        else:
-            # 마지막 문제인 경우
-            end_pos = len(full_text)
-        
-        return full_text[start_pos:end_pos].strip()
+    def extract_pages_from_pdf(self, pdf_path: Path) -> Tuple[str, List[int]]:
+        """PDF에서 텍스트 + 페이지별 시작 위치 추출 (번호 다시 시작을 페이지 경계에서만 허용하기 위함)"""
+        try:
+            return join_pages(get_page_texts(pdf_path) or [])
+        except Exception:
+            return "", []
     
     def analyze_with_ai(self, problem_text: str, file_info: Dict, problem_number: int) -> Dict:
         """AI를 활용한 심층 분석"""
@@ -197,19 +177,6 @@ class DeepCSATAnalyzer:
         analysis['풀이소요시간'] = f"{solving_time}분"
         analysis['오답률1위선지'] = '미상'  # 실제 통계 필요
         analysis['체감난이도'] = f"{(solving_time * 100) / answer_rate:.1f}" if answer_rate > 0 else "0"
-    
-    def determine_difficulty_grade(self, answer_rate: float) -> str:
-        """난이도등급 결정"""
-        if answer_rate >= 95:
-            return '1등급컷용'
-        elif answer_rate >= 80:
-            return '2-3등급용'
-        elif answer_rate >= 50:
-            return '4-6등급용'
-        elif answer_rate >= 30:
-            return '변별용'
-        else:
-            return '킬러용'
         
         # C. 개념 분류 (더 정확하게)
         concept_info = self.analyze_concepts_advanced(problem_text, analysis['과목구분'])
@@ -225,6 +192,19 @@ class DeepCSATAnalyzer:
         
         return analysis
     
+    def determine_difficulty_grade(self, answer_rate: float) -> str:
+        """난이도등급 결정"""
+        if answer_rate >= 95:
+            return '1등급컷용'
+        elif answer_rate >= 80:
+            return '2-3등급용'
+        elif answer_rate >= 50:
+            return '4-6등급용'
+        elif answer_rate >= 30:
+            return '변별용'
+        else:
+            return '킬러용'
+    
     def estimate_answer_rate_advanced(self, problem_text: str, problem_number: int) -> float:
         """정답률 고급 추정"""
         # 기본 추정
@@ -295,31 +275,14 @@ class DeepCSATAnalyzer:
         result = {}
         result['대단원'] = subject
         
-        # 중단원 정확히 추정
-        minor_unit_map = {
-            '미적분': {
-                '수열의극한': ['수열', '극한', '급수'],
-                '미분법': ['미분', '도함수', '접선'],
-                '적분법': ['적분', '넓이', '부피']
-            },
-            '기하': {
-                '이차곡선': ['포물선', '타원', '쌍곡선'],
-                '평면벡터': ['벡터', '내적', '외적'],
-                '공간도형': ['공간', '도형', '좌표']
-            },
-            '확률과통계': {
-                '경우의수': ['경우', '순열', '조합'],
-                '확률': ['확률', '사건', '조건부'],
-                '통계': ['평균', '분산', '표준편차']
-            }
-        }
-        
+        # 중단원 정확히 추정 (키워드 스캔은 문제 텍스트당 한 번)
+        hits = scan_keywords(problem_text)
         result['중단원'] = '미상'
-        if subject in minor_unit_map:
+        if subject in MINOR_UNIT_KEYWORDS:
             best_match = None
             best_score = 0
-            for unit, keywords in minor_unit_map[subject].items():
-                score = sum(1 for kw in keywords if kw in problem_text)
+            for unit, keywords in MINOR_UNIT_KEYWORDS[subject].items():
+                score = hits.count_present(keywords)
                 if score > best_score:
                     best_score = score
                     best_match = unit
@@ -345,27 +308,7 @@ class DeepCSATAnalyzer:
     
     def count_concepts_advanced(self, text: str) -> int:
         """핵심 개념 개수 고급 추정"""
-        concepts = set()
-        
-        concept_keywords = {
-            '함수': ['함수', 'f(x)', 'g(x)'],
-            '미분': ['미분', '도함수', 'f\'(x)'],
-            '적분': ['적분', '∫', '넓이'],
-            '극한': ['극한', 'lim', '수렴'],
-            '수열': ['수열', '등차', '등비'],
-            '확률': ['확률', 'P(', '사건'],
-            '통계': ['평균', '분산', '표준편차'],
-            '벡터': ['벡터', '내적', '외적'],
-            '곡선': ['포물선', '타원', '쌍곡선'],
-            '로그': ['로그', 'log'],
-            '지수': ['지수', 'a^x'],
-            '삼각': ['삼각', 'sin', 'cos', 'tan']
-        }
-        
-        for concept, keywords in concept_keywords.items():
-            if any(kw in text for kw in keywords):
-                concepts.add(concept)
-        
+        concepts = scan_keywords(text).matched_groups(CONCEPT_KEYWORDS)
         return len(concepts) if concepts else 1
     
     def determine_concept_difficulty_advanced(self, text: str) -> str:
@@ -481,18 +424,7 @@ class DeepCSATAnalyzer:
     
     def determine_trap_type_advanced(self, text: str) -> str:
         """함정유형 고급 결정"""
-        trap_indicators = {
-            '특수경우형': ['특수', '경우', '예외'],
-            '부호실수형': ['부호', '+', '-', '양수', '음수'],
-            '조건누락형': ['조건', '단', '단,'],
-            '복합함정형': ['조건', '특수', '부호']
-        }
-        
-        scores = {}
-        for trap_type, keywords in trap_indicators.items():
-            score = sum(1 for kw in keywords if kw in text)
-            if score > 0:
-                scores[trap_type] = score
+        scores = scan_keywords(text).group_scores(TRAP_KEYWORDS)
         
         if not scores:
             return '없음'
@@ -558,9 +490,67 @@ class DeepCSATAnalyzer:
         
         return result
     
-    def run_deep_analysis(self):
-        """심층 분석 실행"""
-        pdf_files = list(self.base_dir.glob('*.pdf'))
+    def parse_file_info(self, filename: str) -> Dict:
+        """파일명에서 출제년도/과목 추출"""
+        year_match = re.search(r'(\d{4})학년도', filename)
+        year = year_match.group(1) if year_match else '미상'
+        
+        subject = '미상'
+        if '기하' in filename:
+            subject = '기하'
+        elif '미적' in filename:
+            subject = '미적분'
+        elif '확률' in filename:
+            subject = '확률과통계'
+        
+        return {
+            'year': year,
+            'subject': subject,
+            'exam_month': '11월'
+        }
+    
+    def prepare_pdf(self, pdf_path: Path) -> Optional[Tuple[Dict, List[Tuple[int, str]]]]:
+        """
+        PDF 하나의 파일 정보 + (문항번호, 문제 텍스트) 목록 추출
+
+        Returns:
+            (file_info, problems) 또는 None (텍스트 추출 실패)
+        """
+        file_info = self.parse_file_info(Path(pdf_path).name)
+
+        # 단어 좌표 기반 분할 우선 (번호가 빠졌으면 텍스트 경로와 비교해 문제를 더 많이 찾은 쪽)
+        segmented = segment_pdf(pdf_path)
+        spans = segmented['problems'] if segmented else []
+        if not spans or missing_numbers(spans):
+            text, page_starts = self.extract_pages_from_pdf(pdf_path)
+            text_spans = segment_text(text, page_starts) if text else []
+            if not spans and not text:
+                return None
+            if len(text_spans) > len(spans):
+                spans = text_spans
+        
+        # 같은 번호가 다시 나오면 처음 것, 번호 순
+        by_number = {}
+        for span in spans:
+            if span['text']:
+                by_number.setdefault(span['number'], span['text'])
+        problems = sorted(by_number.items())
+        
+        return file_info, problems
+    
+    def analyze_problems(self, problems: List[Tuple[int, str]], file_info: Dict) -> List[Dict]:
+        """문제 목록 심층 분석 (워커 프로세스에서도 사용)"""
+        return [self.analyze_with_ai(problem_text, file_info, num) for num, problem_text in problems]
+    
+    def run_deep_analysis(self, resume: bool = True, max_workers: int = 1):
+        """
+        심층 분석 실행 (파일 하나가 끝날 때마다 결과 저장)
+
+        Args:
+            resume: True면 체크포인트에 있는 파일(경로/수정 시간/분석기 버전 동일)은 건너뜀
+            max_workers: 워커 프로세스 수 (1이면 순차 처리, None이면 CPU 코어 수)
+        """
+        pdf_files = sorted(self.base_dir.glob('*.pdf'))
         
         if not pdf_files:
             print(f"[오류] PDF 파일을 찾을 수 없습니다: {self.base_dir}")
@@ -568,101 +558,69 @@ class DeepCSATAnalyzer:
         
         print(f"[심층 분석 시작] 총 {len(pdf_files)}개 PDF 파일\n")
         
-        all_results = []
+        stream = AnalysisStream(self.output_dir, 'csat_deep_analysis', DEEP_HEADERS,
+                                ANALYZER_VERSION, fill_value='미상')
+        stream.open(pdf_files, resume=resume)
         
+        pending = []
         for i, pdf_path in enumerate(pdf_files, 1):
-            print(f"[{i}/{len(pdf_files)}] {pdf_path.name} 심층 분석 중...")
-            
-            try:
-                # 파일 정보
-                year_match = re.search(r'(\d{4})학년도', pdf_path.name)
-                year = year_match.group(1) if year_match else '미상'
-                
-                subject = '미상'
-                if '기하' in pdf_path.name:
-                    subject = '기하'
-                elif '미적' in pdf_path.name:
-                    subject = '미적분'
-                elif '확률' in pdf_path.name:
-                    subject = '확률과통계'
-                
-                file_info = {
-                    'year': year,
-                    'subject': subject,
-                    'exam_month': '11월'
-                }
-                
-                # PDF 텍스트 추출
-                text = self.extract_text_from_pdf(pdf_path)
-                
-                if not text:
-                    print(f"  [경고] 텍스트 추출 실패")
+            if stream.is_done(pdf_path):
+                print(f"[{i}/{len(pdf_files)}] {pdf_path.name} 이전 분석 결과 사용 (건너뜀)")
+            else:
+                pending.append(pdf_path)
+        
+        if max_workers != 1 and len(pending) > 1:
+            # 멀티코어: PDF 단위 (큰 PDF는 문제 단위) 분배, 완료되는 파일부터 저장
+            print(f"[병렬] {len(pending)}개 PDF, 워커 {max_workers or '전체 코어'}\n")
+            for pdf_path, file_results in analyze_files_parallel(self, pending, max_workers):
+                if file_results is None:
+                    print(f"  [경고] {pdf_path.name} 심층 분석 실패")
                     continue
+                stream.append(pdf_path, file_results)
+                print(f"  [완료] {pdf_path.name}: {len(file_results)}개 문제 심층 분석 완료")
+        else:
+            for i, pdf_path in enumerate(pending, 1):
+                print(f"[{i}/{len(pending)}] {pdf_path.name} 심층 분석 중...")
                 
-                # 문제 번호 추출
-                problem_numbers = re.findall(r'^(\d+)\.\s+', text, re.MULTILINE)
-                problem_numbers = [int(n) for n in problem_numbers if n.isdigit()]
-                problem_numbers = sorted(set(problem_numbers))
-                
-                print(f"  [발견] {len(problem_numbers)}개 문제")
-                
-                # 각 문제 심층 분석
-                for num in problem_numbers:
-                    problem_text = self.extract_problem_text(text, num)
+                try:
+                    # 파일 정보 + 문제 텍스트 추출
+                    prepared = self.prepare_pdf(pdf_path)
                     
-                    if not problem_text:
+                    if prepared is None:
+                        print(f"  [경고] 텍스트 추출 실패")
                         continue
                     
-                    analysis = self.analyze_with_ai(problem_text, file_info, num)
-                    all_results.append(analysis)
-                
-                print(f"  [완료] {len(problem_numbers)}개 문제 심층 분석 완료\n")
-                
-            except Exception as e:
-                print(f"  [오류] {e}\n")
-                import traceback
-                traceback.print_exc()
-                continue
+                    file_info, problems = prepared
+                    print(f"  [발견] {len(problems)}개 문제")
+                    
+                    # 각 문제 심층 분석 후 파일 단위로 바로 저장 + 체크포인트 기록
+                    stream.append(pdf_path, self.analyze_problems(problems, file_info))
+                    
+                    print(f"  [완료] {len(problems)}개 문제 심층 분석 완료\n")
+                    
+                except Exception as e:
+                    print(f"  [오류] {e}\n")
+                    import traceback
+                    traceback.print_exc()
+                    continue
         
-        # 결과 저장
-        self.save_deep_results(all_results)
+        # (출제년도, 과목, 문항번호) 순으로 병합
+        all_results = stream.finalize(result_sort_key)
         
-        print(f"\n[완료] 총 {len(all_results)}개 문제 심층 분석 완료")
+        print(f"\n[저장] 심층 분석 CSV: {stream.csv_path}")
+        print(f"[저장] 심층 분석 JSON: {stream.json_path}")
+        print(f"\n[완료] 총 {len(all_results)}개 문제 심층 분석 완료 "
+              f"(이번 실행 {stream.appended}개, 이전 결과 재사용 {stream.skipped}개 파일)")
         print(f"결과 저장 위치: {self.output_dir}")
     
-    def save_deep_results(self, results: List[Dict]):
-        """심층 분석 결과 저장"""
-        if not results:
-            return
-        
-        headers = [
-            '출제년도', '시행월', '문항번호', '배점', '과목구분',
-            '공식정답률', '난이도등급', '풀이소요시간', '오답률1위선지', '체감난이도',
-            '대단원', '중단원', '핵심개념태그', '개념난이도', '필수선행개념',
-            '문제형식', '조건제시방식', '풀이단계수', '계산복잡도', '함정유형',
-            '출제의도', '출제빈도', '연계여부', '변별력지수', '킬러여부판정'
-        ]
-        
-        csv_path = self.output_dir / 'csat_deep_analysis.csv'
-        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            for result in results:
-                if result:  # None 체크
-                    # 모든 필드가 있는지 확인하고 없으면 기본값 추가
-                    clean_result = {}
-                    for header in headers:
-                        clean_result[header] = result.get(header, '미상')
-                    writer.writerow(clean_result)
-        
-        print(f"[저장] 심층 분석 CSV: {csv_path}")
-        
-        json_path = self.output_dir / 'csat_deep_analysis.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        
-        print(f"[저장] 심층 분석 JSON: {json_path}")
-
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='수능 수학 기출 심층 메타분석')
+    parser.add_argument('--full', action='store_true', help='체크포인트 무시하고 전체 재분석')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='워커 프로세스 수 (0이면 전체 코어, 기본 1 = 순차 처리)')
+    args = parser.parse_args()
+    
     analyzer = DeepCSATAnalyzer()
-    analyzer.run_deep_analysis()
+    analyzer.run_deep_analysis(resume=not args.full, max_workers=args.workers or None)
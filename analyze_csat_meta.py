@@ -4,25 +4,34 @@
 
 import os
 import re
-import csv
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-try:
-    import pdfplumber
-    PDF_LIBRARY = 'pdfplumber'
-except ImportError:
-    try:
-        import fitz  # PyMuPDF
-        PDF_LIBRARY = 'pymupdf'
-    except ImportError:
-        try:
-            import PyPDF2
-            PDF_LIBRARY = 'pypdf2'
-        except ImportError:
-            PDF_LIBRARY = None
+from pdf_text_cache import available_backends, get_page_texts
+from pdf_segmenter import join_pages, missing_numbers, segment_pdf, segment_text
+from analysis_stream import AnalysisStream, analyze_files_parallel
+
+# 분석 규칙이 바뀌면 올려서 체크포인트 무효화
+ANALYZER_VERSION = '2026.10-meta-5'
+
+# CSV 헤더 (25개 항목 순서대로)
+META_HEADERS = [
+    '출제년도', '시행월', '문항번호', '배점', '과목구분',
+    '공식정답률', '난이도등급', '풀이소요시간', '오답률1위선지', '체감난이도',
+    '대단원', '중단원', '핵심개념태그', '개념난이도', '필수선행개념',
+    '문제형식', '조건제시방식', '풀이단계수', '계산복잡도', '함정유형',
+    '출제의도', '출제빈도', '연계여부', '변별력지수', '킬러여부판정'
+]
+
+
+def result_sort_key(row: Dict) -> Tuple:
+    """결과 병합 순서: (출제년도, 과목, 문항번호)"""
+    return (str(row.get('출제년도') or ''), str(row.get('과목구분') or ''),
+            int(row.get('문항번호') or 0))
+
+# 설치된 PDF 라이브러리 (pdf_text_cache 우선순위, 없으면 None)
+PDF_LIBRARY = next(iter(available_backends()), None)
 
 class CSATMetaAnalyzer:
     """수능 수학 문제 메타분석 전문가"""
@@ -33,33 +42,12 @@ class CSATMetaAnalyzer:
         self.output_dir.mkdir(exist_ok=True)
         
     def extract_text_from_pdf(self, pdf_path: Path) -> str:
-        """PDF에서 텍스트 추출"""
-        if PDF_LIBRARY == 'pdfplumber':
-            text_parts = []
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-            return '\n'.join(text_parts)
-        
-        elif PDF_LIBRARY == 'pymupdf':
-            doc = fitz.open(pdf_path)
-            text_parts = []
-            for page in doc:
-                text_parts.append(page.get_text())
-            doc.close()
-            return '\n'.join(text_parts)
-        
-        elif PDF_LIBRARY == 'pypdf2':
-            with open(pdf_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                text_parts = []
-                for page in reader.pages:
-                    text_parts.append(page.extract_text())
-            return '\n'.join(text_parts)
-        
-        return ""
+        """PDF에서 텍스트 추출 (페이지 텍스트 캐시 사용)"""
+        return self.extract_pages_from_pdf(pdf_path)[0]
+    
+    def extract_pages_from_pdf(self, pdf_path: Path) -> Tuple[str, List[int]]:
+        """PDF에서 텍스트 + 페이지별 시작 위치 추출 (번호 다시 시작을 페이지 경계에서만 허용하기 위함)"""
+        return join_pages(get_page_texts(pdf_path) or [])
     
     def parse_filename(self, filename: str) -> Dict[str, str]:
         """파일명에서 정보 추출"""
@@ -99,43 +87,18 @@ class CSATMetaAnalyzer:
         
         return info
     
-    def extract_problems(self, text: str) -> List[Dict]:
-        """텍스트에서 문제 추출"""
-        problems = []
-        
-        # 문제 번호 패턴 (1. 2. 3. 또는 ① ② ③)
-        problem_pattern = re.compile(r'(\d+)\.\s+', re.MULTILINE)
-        
-        lines = text.split('\n')
-        current_problem = None
-        current_number = None
-        
-        for i, line in enumerate(lines):
-            # 문제 번호 찾기
-            match = problem_pattern.match(line.strip())
-            if match:
-                # 이전 문제 저장
-                if current_problem:
-                    problems.append(current_problem)
-                
-                # 새 문제 시작
-                current_number = int(match.group(1))
-                current_problem = {
-                    'number': current_number,
-                    'text': line,
-                    'full_text': line,
-                    'start_line': i
-                }
-            elif current_problem:
-                # 문제 내용 계속 추가
-                current_problem['full_text'] += '\n' + line
-                current_problem['text'] += '\n' + line
-        
-        # 마지막 문제 저장
-        if current_problem:
-            problems.append(current_problem)
-        
-        return problems
+    def extract_problems(self, text: str, page_starts: Optional[List[int]] = None) -> List[Dict]:
+        """텍스트에서 문제 추출 (pdf_segmenter.segment_text로 한 번에 분할)"""
+        return [
+            {
+                'number': span['number'],
+                'text': span['text'],
+                'full_text': span['text'],
+                'start_line': span['line'],
+                'page': span['page'],
+            }
+            for span in segment_text(text, page_starts)
+        ]
     
     def analyze_problem_meta(self, problem: Dict, file_info: Dict, problem_text: str) -> Dict:
         """25개 메타 분류 기준으로 문제 분석"""
@@ -454,14 +417,61 @@ class CSATMetaAnalyzer:
         
         return result
     
-    def analyze_all_pdfs(self):
-        """모든 PDF 파일 분석"""
+    def prepare_pdf(self, pdf_path: Path) -> Optional[Tuple[Dict, List[Dict]]]:
+        """
+        PDF 하나의 파일 정보 + 문제 목록 추출
+
+        Returns:
+            (file_info, problems) 또는 None (텍스트 추출 실패)
+        """
+        file_info = self.parse_filename(Path(pdf_path).name)
+
+        # 단어 좌표 기반 분할 우선 (2단 편집에서도 단이 섞이지 않음)
+        segmented = segment_pdf(pdf_path)
+        spans = segmented['problems'] if segmented else []
+        word_problems = [
+            {
+                'number': span['number'],
+                'text': span['text'],
+                'full_text': span['text'],
+                'page': span['page'],
+                'bbox': span['bbox'],
+            }
+            for span in spans
+        ]
+        if spans and not missing_numbers(spans):
+            return file_info, word_problems
+
+        # 번호가 빠졌으면 텍스트 경로와 비교 (문제를 더 많이 찾은 쪽)
+        text, page_starts = self.extract_pages_from_pdf(pdf_path)
+        problems = self.extract_problems(text, page_starts) if text else []
+        if spans and len(spans) >= len(problems):
+            return file_info, word_problems
+        if not text:
+            return None
+        return file_info, problems
+    
+    def analyze_problems(self, problems: List[Dict], file_info: Dict) -> List[Dict]:
+        """문제 목록 메타분석 (워커 프로세스에서도 사용)"""
+        return [
+            self.analyze_problem_meta(problem, file_info, problem['full_text'])
+            for problem in problems
+        ]
+    
+    def analyze_all_pdfs(self, resume: bool = True, max_workers: int = 1):
+        """
+        모든 PDF 파일 분석 (파일 하나가 끝날 때마다 결과 저장)
+
+        Args:
+            resume: True면 체크포인트에 있는 파일(경로/수정 시간/분석기 버전 동일)은 건너뜀
+            max_workers: 워커 프로세스 수 (1이면 순차 처리, None이면 CPU 코어 수)
+        """
         if not PDF_LIBRARY:
             print("[오류] PDF 읽기 라이브러리가 설치되어 있지 않습니다.")
             print("설치: pip install pdfplumber pymupdf PyPDF2")
             return
         
-        pdf_files = list(self.base_dir.glob('*.pdf'))
+        pdf_files = sorted(self.base_dir.glob('*.pdf'))
         
         if not pdf_files:
             print(f"[오류] PDF 파일을 찾을 수 없습니다: {self.base_dir}")
@@ -469,78 +479,66 @@ class CSATMetaAnalyzer:
         
         print(f"[시작] 총 {len(pdf_files)}개 PDF 파일 분석 시작\n")
         
-        all_results = []
+        stream = AnalysisStream(self.output_dir, 'csat_meta_analysis', META_HEADERS, ANALYZER_VERSION)
+        stream.open(pdf_files, resume=resume)
         
+        pending = []
         for i, pdf_path in enumerate(pdf_files, 1):
-            print(f"[{i}/{len(pdf_files)}] {pdf_path.name} 분석 중...")
-            
-            try:
-                # 파일 정보 추출
-                file_info = self.parse_filename(pdf_path.name)
-                
-                # PDF 텍스트 추출
-                text = self.extract_text_from_pdf(pdf_path)
-                
-                if not text:
-                    print(f"  [경고] 텍스트 추출 실패")
+            if stream.is_done(pdf_path):
+                print(f"[{i}/{len(pdf_files)}] {pdf_path.name} 이전 분석 결과 사용 (건너뜀)")
+            else:
+                pending.append(pdf_path)
+        
+        if max_workers != 1 and len(pending) > 1:
+            # 멀티코어: PDF 단위 (큰 PDF는 문제 단위) 분배, 완료되는 파일부터 저장
+            print(f"[병렬] {len(pending)}개 PDF, 워커 {max_workers or '전체 코어'}\n")
+            for pdf_path, file_results in analyze_files_parallel(self, pending, max_workers):
+                if file_results is None:
+                    print(f"  [경고] {pdf_path.name} 분석 실패")
                     continue
+                stream.append(pdf_path, file_results)
+                print(f"  [완료] {pdf_path.name}: {len(file_results)}개 문제 분석 완료")
+        else:
+            for i, pdf_path in enumerate(pending, 1):
+                print(f"[{i}/{len(pending)}] {pdf_path.name} 분석 중...")
                 
-                # 문제 추출
-                problems = self.extract_problems(text)
-                
-                print(f"  [발견] {len(problems)}개 문제 추출")
-                
-                # 각 문제 분석
-                for problem in problems:
-                    analysis = self.analyze_problem_meta(
-                        problem, file_info, problem['full_text']
-                    )
-                    all_results.append(analysis)
-                
-                print(f"  [완료] {len(problems)}개 문제 분석 완료\n")
-                
-            except Exception as e:
-                print(f"  [오류] {e}\n")
-                continue
+                try:
+                    # 파일 정보 + 문제 추출
+                    prepared = self.prepare_pdf(pdf_path)
+                    
+                    if prepared is None:
+                        print(f"  [경고] 텍스트 추출 실패")
+                        continue
+                    
+                    file_info, problems = prepared
+                    print(f"  [발견] {len(problems)}개 문제 추출")
+                    
+                    # 각 문제 분석 후 파일 단위로 바로 저장 + 체크포인트 기록
+                    stream.append(pdf_path, self.analyze_problems(problems, file_info))
+                    
+                    print(f"  [완료] {len(problems)}개 문제 분석 완료\n")
+                    
+                except Exception as e:
+                    print(f"  [오류] {e}\n")
+                    continue
         
-        # 결과 저장
-        self.save_results(all_results)
+        # (출제년도, 과목, 문항번호) 순으로 병합
+        all_results = stream.finalize(result_sort_key)
         
-        print(f"\n[완료] 총 {len(all_results)}개 문제 분석 완료")
+        print(f"\n[저장] CSV 파일: {stream.csv_path}")
+        print(f"[저장] JSON 파일: {stream.json_path}")
+        print(f"\n[완료] 총 {len(all_results)}개 문제 분석 완료 "
+              f"(이번 실행 {stream.appended}개, 이전 결과 재사용 {stream.skipped}개 파일)")
         print(f"결과 저장 위치: {self.output_dir}")
     
-    def save_results(self, results: List[Dict]):
-        """결과를 CSV로 저장"""
-        if not results:
-            print("[경고] 저장할 결과가 없습니다.")
-            return
-        
-        # CSV 헤더 (25개 항목 순서대로)
-        headers = [
-            '출제년도', '시행월', '문항번호', '배점', '과목구분',
-            '공식정답률', '난이도등급', '풀이소요시간', '오답률1위선지', '체감난이도',
-            '대단원', '중단원', '핵심개념태그', '개념난이도', '필수선행개념',
-            '문제형식', '조건제시방식', '풀이단계수', '계산복잡도', '함정유형',
-            '출제의도', '출제빈도', '연계여부', '변별력지수', '킬러여부판정'
-        ]
-        
-        # CSV 파일 저장
-        csv_path = self.output_dir / 'csat_meta_analysis.csv'
-        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            for result in results:
-                writer.writerow(result)
-        
-        print(f"[저장] CSV 파일: {csv_path}")
-        
-        # JSON 파일도 저장 (상세 정보용)
-        json_path = self.output_dir / 'csat_meta_analysis.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        
-        print(f"[저장] JSON 파일: {json_path}")
-
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='수능 수학 기출 메타분석')
+    parser.add_argument('--full', action='store_true', help='체크포인트 무시하고 전체 재분석')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='워커 프로세스 수 (0이면 전체 코어, 기본 1 = 순차 처리)')
+    args = parser.parse_args()
+    
     analyzer = CSATMetaAnalyzer()
-    analyzer.analyze_all_pdfs()
+    analyzer.analyze_all_pdfs(resume=not args.full, max_workers=args.workers or None)
@@ -8,15 +8,11 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
-try:
-    import PyPDF2
-    PDF_LIBRARY = 'PyPDF2'
-except ImportError:
-    try:
-        import fitz  # PyMuPDF
-        PDF_LIBRARY = 'pymupdf'
-    except ImportError:
-        PDF_LIBRARY = None
+from pdf_text_cache import available_backends
+from pdf_utils import extract_text_from_pdf
+
+# 설치된 PDF 라이브러리 (pdf_text_cache 우선순위, 없으면 None)
+PDF_LIBRARY = next(iter(available_backends()), None)
 
 
 class PDF25FieldAnalyzer:
@@ -28,24 +24,11 @@ class PDF25FieldAnalyzer:
         self.problems = []
         
     def extract_text_from_pdf(self) -> str:
-        """PDF에서 텍스트 추출"""
-        if PDF_LIBRARY == 'PyPDF2':
-            with open(self.pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-        elif PDF_LIBRARY == 'pymupdf':
-            import fitz
-            doc = fitz.open(self.pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text() + "\n"
-            doc.close()
-            return text
-        else:
+        """PDF에서 텍스트 추출 (페이지 텍스트 캐시 사용)"""
+        text = extract_text_from_pdf(self.pdf_path)
+        if text is None:
             raise ImportError("PDF 라이브러리가 설치되지 않았습니다.")
+        return text
     
     def parse_problems(self, text: str) -> List[Dict]:
         """텍스트에서 문제들을 파싱"""
@@ -0,0 +1,272 @@
+# batch_convert_latex.py
+# Mathpix LaTeX 일괄 변환 (convert_*_latex.py 개별 실행 대체)
+
+"""
+사용법:
+python batch_convert_latex.py --dir "C:/Users/a/Documents/MathPDF/tex/수1"
+python batch_convert_latex.py --manifest manifest.json --workers 4 --summary batch_summary.json
+python batch_convert_latex.py --dir "C:/.../tex" --mode stream   # 대용량 .tex (메모리 맵, 메모리 일정)
+python batch_convert_latex.py --dir "C:/.../tex" --group-by book   # 검토 결과를 책 단위로 집계
+
+매니페스트 형식:
+  - .json: ["a.tex", {"tex": "b.tex", "output_dir": "...", "base_filename": "..."}]
+  - .txt : 한 줄에 .tex 경로 하나 (# 주석 허용)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mathpix_latex_processor_optimized import OptimizedMathpixProcessor, stream_problems
+from convert_template import save_for_deepseek
+from review_engine import validate_problems, aggregate_reports, render_aggregate
+from path_index import parse_name
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+
+def collect_jobs(directory=None, manifest=None, output_dir=None, recursive=False):
+    """
+    변환 작업 목록 생성
+
+    Args:
+        directory: .tex 파일이 있는 디렉토리
+        manifest: 매니페스트 파일 경로 (.json 또는 .txt)
+        output_dir: 출력 디렉토리 (None이면 .tex 파일과 같은 폴더)
+        recursive: 하위 폴더까지 검색 여부
+
+    Returns:
+        [{'tex': Path, 'output_dir': Path, 'base_filename': str}, ...]
+    """
+    entries = []
+
+    if directory:
+        base = Path(directory)
+        pattern = '**/*.tex' if recursive else '*.tex'
+        entries.extend({'tex': str(p)} for p in sorted(base.glob(pattern)))
+
+    if manifest:
+        manifest_path = Path(manifest)
+        if manifest_path.suffix.lower() == '.json':
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        else:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                items = [line.strip() for line in f
+                         if line.strip() and not line.strip().startswith('#')]
+        for item in items:
+            entry = {'tex': item} if isinstance(item, str) else dict(item)
+            # 매니페스트의 상대 경로는 매니페스트 위치 기준
+            tex_path = Path(entry['tex'])
+            if not tex_path.is_absolute():
+                entry['tex'] = str(manifest_path.parent / tex_path)
+            entries.append(entry)
+
+    jobs = []
+    for entry in entries:
+        tex_path = Path(entry['tex'])
+        jobs.append({
+            'tex': tex_path,
+            'output_dir': Path(entry.get('output_dir') or output_dir or tex_path.parent),
+            'base_filename': entry.get('base_filename') or tex_path.stem,
+        })
+
+    return jobs
+
+
+def convert_one(tex_path, output_dir, base_filename, mode='fast', quiet=True):
+    """
+    .tex 파일 하나 변환 (워커 프로세스에서 실행)
+
+    Returns:
+        파일별 결과 딕셔너리 (시간, 문제 수, 출력 경로, 오류)
+    """
+    result = {
+        'tex': str(tex_path),
+        'base_filename': base_filename,
+        'success': False,
+        'problem_count': 0,
+        'is_valid': False,
+        'csv_path': None,
+        'json_path': None,
+        'read_sec': 0.0,
+        'extract_sec': 0.0,
+        'save_sec': 0.0,
+        'total_sec': 0.0,
+        'error': None,
+        'review': None,
+    }
+    start = time.perf_counter()
+    log = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(log) if quiet else contextlib.nullcontext():
+            if mode == 'stream':
+                # 파일 읽기와 추출이 겹치므로 read_sec은 0
+                t_read = time.perf_counter()
+                problems = list(stream_problems(tex_path))
+            else:
+                with open(tex_path, 'r', encoding='utf-8') as f:
+                    latex_content = f.read()
+                t_read = time.perf_counter()
+                result['read_sec'] = t_read - start
+
+                processor = OptimizedMathpixProcessor(latex_content, output_dir, base_filename)
+                if mode == 'parallel':
+                    problems = processor.extract_problems_parallel()
+                else:
+                    problems = processor.extract_problems_fast()
+            # 검토는 출력 없이 결과만 모음 (요약은 print_summary에서 한 번에 출력)
+            review = validate_problems(problems, source=base_filename)
+            review['meta'] = parse_name(base_filename)
+            is_valid = review['passed']
+            t_extract = time.perf_counter()
+            result['extract_sec'] = t_extract - t_read
+
+            if is_valid or len(problems) > 0:
+                csv_path, json_path = save_for_deepseek(problems, output_dir, base_filename)
+                result['csv_path'] = str(csv_path)
+                result['json_path'] = str(json_path)
+            result['save_sec'] = time.perf_counter() - t_extract
+
+        result['problem_count'] = len(problems)
+        result['is_valid'] = is_valid
+        result['review'] = review
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['total_sec'] = time.perf_counter() - start
+    return result
+
+
+def batch_convert(jobs, max_workers=4, mode='fast', quiet=True):
+    """
+    여러 .tex 파일을 한 번에 변환 (프로세스 풀)
+
+    Args:
+        jobs: collect_jobs() 결과
+        max_workers: 워커 수 (1이면 현재 프로세스에서 순차 처리)
+        mode: 파일 내부 추출 모드 ('fast', 'parallel' 또는 'stream')
+        quiet: 파일별 상세 로그 숨김 여부
+
+    Returns:
+        작업 순서대로 정렬된 파일별 결과 리스트
+    """
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [
+            convert_one(job['tex'], job['output_dir'], job['base_filename'], mode, quiet)
+            for job in jobs
+        ]
+
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                convert_one, job['tex'], job['output_dir'], job['base_filename'], mode, quiet
+            ): i
+            for i, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                results[i] = {
+                    'tex': str(jobs[i]['tex']),
+                    'base_filename': jobs[i]['base_filename'],
+                    'success': False,
+                    'problem_count': 0,
+                    'total_sec': 0.0,
+                    'error': str(e),
+                }
+    return results
+
+
+def print_summary(results, wall_sec, group_by='subject'):
+    """파일별 처리 시간 + 검토 집계 요약 출력"""
+    print("=" * 80)
+    print("[일괄 변환 결과]")
+    print("=" * 80)
+
+    for r in results:
+        status = "✅" if r['success'] else "❌"
+        line = f"{status} {r['base_filename']}: {r['problem_count']}개 문제, {r['total_sec']:.3f}초"
+        if r.get('error'):
+            line += f" (오류: {r['error']})"
+        print(line)
+
+    success_count = sum(1 for r in results if r['success'])
+    problem_count = sum(r['problem_count'] for r in results)
+    cpu_sec = sum(r['total_sec'] for r in results)
+
+    print("\n" + "-" * 80)
+    print(f"[파일] {success_count}/{len(results)}개 성공")
+    print(f"[문제] 총 {problem_count}개")
+    print(f"[시간] 전체 {wall_sec:.3f}초 (파일별 합계 {cpu_sec:.3f}초)")
+
+    slowest = sorted(results, key=lambda r: r['total_sec'], reverse=True)[:5]
+    if slowest:
+        print("\n[가장 느린 파일]")
+        for r in slowest:
+            print(f"  - {r['base_filename']}: {r['total_sec']:.3f}초")
+
+    reviews = [r['review'] for r in results if r.get('review')]
+    if reviews:
+        print()
+        render_aggregate(aggregate_reports(reviews, group_by=group_by))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mathpix LaTeX 일괄 변환')
+    parser.add_argument('--dir', type=str, help='.tex 파일 디렉토리')
+    parser.add_argument('--manifest', type=str, help='매니페스트 파일 (.json 또는 .txt)')
+    parser.add_argument('--output-dir', type=str, help='출력 디렉토리 (기본: .tex 파일과 같은 폴더)')
+    parser.add_argument('--recursive', action='store_true', help='하위 폴더까지 검색')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='워커 프로세스 수')
+    parser.add_argument('--mode', type=str, default='fast', choices=['fast', 'parallel', 'stream'],
+                        help='파일 내부 추출 모드')
+    parser.add_argument('--summary', type=str, help='요약 JSON 저장 경로')
+    parser.add_argument('--verbose', action='store_true', help='파일별 상세 로그 출력')
+    parser.add_argument('--group-by', type=str, default='subject', choices=['subject', 'book', 'year', 'kind'],
+                        help='검토 결과 집계 기준 (파일명 규칙 기준, 기본: subject)')
+
+    args = parser.parse_args()
+
+    if not args.dir and not args.manifest:
+        print("❌ --dir 또는 --manifest 중 하나가 필요합니다.")
+        return False
+
+    jobs = collect_jobs(args.dir, args.manifest, args.output_dir, args.recursive)
+    if not jobs:
+        print("❌ 변환할 .tex 파일이 없습니다.")
+        return False
+
+    print(f"[일괄 변환 시작] {len(jobs)}개 파일, 워커 {args.workers}개")
+    start = time.perf_counter()
+    results = batch_convert(jobs, max_workers=args.workers, mode=args.mode, quiet=not args.verbose)
+    wall_sec = time.perf_counter() - start
+
+    print_summary(results, wall_sec, group_by=args.group_by)
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'wall_sec': wall_sec, 'files': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n[요약 저장 완료] {args.summary}")
+
+    return all(r['success'] for r in results)
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,305 @@
+# benchmark_latex.py
+# LaTeX 추출 핵심 경로 벤치마크 (convert_*_latex.py에 들어 있는 latex_content를 코퍼스로 사용)
+
+"""
+사용법:
+python benchmark_latex.py                                   # 측정 + 저장된 기준값과 비교
+python benchmark_latex.py --sizes 1,4 --repeat 5
+python benchmark_latex.py --save-baseline                   # 현재 결과를 기준값으로 저장
+python benchmark_latex.py --quick                           # 크기 1배, 1회만 (빠른 확인)
+
+측정 대상 (크기별):
+  extract_body, find_problem_boundaries, clean_problem_text, extract_options_generic,
+  extract_problems_fast, extract_problems_parallel
+
+코퍼스:
+  convert_*_latex.py의 `latex_content = \"\"\"...\"\"\"` 문자열을 ast로 읽어(스크립트는 실행하지 않음)
+  본문을 이어 붙이고, 크기 N배는 그 본문을 N번 반복한 문서
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import sys
+import os
+import time
+from pathlib import Path
+
+from latex_utils import extract_body, extract_options_generic
+from mathpix_utils import find_problem_boundaries, clean_problem_text
+from mathpix_latex_processor_optimized import (
+    OptimizedMathpixProcessor, build_marker_index, find_prev_marker, find_next_marker,
+    sections_before
+)
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+REPO_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = REPO_DIR / 'data' / 'benchmark_latex_baseline.json'
+DEFAULT_SIZES = (1, 2, 4)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25   # 기준값보다 25% 넘게 느려지면 회귀로 판단
+
+
+def harvest_corpus(pattern='convert_*_latex.py'):
+    """
+    convert 스크립트에 들어 있는 latex_content 문자열 수집
+
+    Returns:
+        {스크립트 파일명: LaTeX 문자열} (파일명 순)
+    """
+    corpus = {}
+    for path in sorted(REPO_DIR.glob(pattern)):
+        try:
+            tree = ast.parse(path.read_text(encoding='utf-8'))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Assign):
+                continue
+            if not any(isinstance(target, ast.Name) and target.id == 'latex_content' for target in node.targets):
+                continue
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                corpus[path.name] = node.value.value
+    return corpus
+
+
+def build_document(corpus, scale):
+    """코퍼스 본문을 scale번 이어 붙인 LaTeX 문서"""
+    bodies = [extract_body(latex) for latex in corpus.values()]
+    body = '\n'.join(bodies * scale)
+    return '\\begin{document}\n' + body + '\n\\end{document}'
+
+
+def prepare_inputs(latex_content):
+    """
+    문서 하나에서 함수별 입력 준비 (측정 시간에서 제외)
+
+    Returns:
+        {'body', 'marker_index', 'boundaries': [(위치, 이전 마커, 다음 마커, 섹션)],
+         'questions': [(텍스트, 시작 위치)], 'options': [선택지 텍스트]}
+    """
+    body = extract_body(latex_content)
+    marker_index = build_marker_index(body)
+    boundaries = []
+    questions = []
+    options = []
+    for pos, _ in marker_index['markers']:
+        prev_marker = find_prev_marker(marker_index, pos)
+        next_marker = find_next_marker(marker_index, pos)
+        sections = sections_before(marker_index, pos)
+        boundaries.append((pos, prev_marker, next_marker, sections))
+        start, end = find_problem_boundaries(body, pos, prev_marker, next_marker, sections,
+                                             tokens=marker_index['tokens'])
+        questions.append((body[start:pos], start))
+        options.append(body[pos:end])
+    return {
+        'body': body,
+        'marker_index': marker_index,
+        'boundaries': boundaries,
+        'questions': questions,
+        'options': options,
+    }
+
+
+def _time_best(func, repeat):
+    """repeat번 실행해서 (최소 시간, 평균 시간, 마지막 결과)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times), result
+
+
+def benchmark_size(corpus, scale, repeat, workers):
+    """
+    크기 하나에 대해 모든 대상 함수 측정
+
+    Returns:
+        [{'name', 'scale', 'seconds', 'mean_seconds', 'problems', 'bytes',
+          'problems_per_sec', 'mb_per_sec'}, ...]
+    """
+    latex_content = build_document(corpus, scale)
+    inputs = prepare_inputs(latex_content)
+    body = inputs['body']
+    tokens = inputs['marker_index']['tokens']
+    marker_count = len(inputs['marker_index']['markers'])
+
+    def run_boundaries():
+        for pos, prev_marker, next_marker, sections in inputs['boundaries']:
+            find_problem_boundaries(body, pos, prev_marker, next_marker, sections, tokens=tokens)
+        return marker_count
+
+    def run_clean():
+        malformed = []   # 경고 출력이 측정에 섞이지 않도록 목록으로 받음
+        for text, start in inputs['questions']:
+            clean_problem_text(text, body_context=body, problem_start=start, malformed=malformed)
+        return len(inputs['questions'])
+
+    def run_options():
+        for text in inputs['options']:
+            extract_options_generic(text, num_options=5)
+        return len(inputs['options'])
+
+    def run_fast():
+        return len(OptimizedMathpixProcessor(latex_content, None, 'bench').extract_problems_fast())
+
+    def run_parallel():
+        processor = OptimizedMathpixProcessor(latex_content, None, 'bench')
+        return len(processor.extract_problems_parallel(max_workers=workers))
+
+    def run_extract_body():
+        extract_body(latex_content)
+        return marker_count
+
+    def utf8_size(texts):
+        return sum(len(text.encode('utf-8')) for text in texts)
+
+    document_bytes = utf8_size([latex_content])
+    # (이름, 함수, 처리하는 입력 바이트 수)
+    cases = [
+        ('extract_body', run_extract_body, document_bytes),
+        ('find_problem_boundaries', run_boundaries, utf8_size([body])),
+        ('clean_problem_text', run_clean, utf8_size(text for text, _ in inputs['questions'])),
+        ('extract_options_generic', run_options, utf8_size(inputs['options'])),
+        ('extract_problems_fast', run_fast, document_bytes),
+        ('extract_problems_parallel', run_parallel, document_bytes),
+    ]
+
+    results = []
+    for name, func, byte_count in cases:
+        seconds, mean_seconds, problems = _time_best(func, repeat)
+        results.append({
+            'name': name,
+            'scale': scale,
+            'seconds': seconds,
+            'mean_seconds': mean_seconds,
+            'problems': problems,
+            'bytes': byte_count,
+            'problems_per_sec': problems / seconds if seconds > 0 else 0.0,
+            'mb_per_sec': byte_count / 1e6 / seconds if seconds > 0 else 0.0,
+        })
+    return results
+
+
+def result_key(result):
+    return f"{result['name']}@x{result['scale']}"
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    기준값과 비교
+
+    Returns:
+        [(키, 기준 시간, 현재 시간, 비율, 회귀 여부), ...] (기준값에 있는 항목만)
+    """
+    baseline_map = {result_key(r): r for r in baseline.get('results', [])}
+    rows = []
+    for result in results:
+        key = result_key(result)
+        base = baseline_map.get(key)
+        if base is None or base['seconds'] <= 0:
+            continue
+        ratio = result['seconds'] / base['seconds']
+        rows.append((key, base['seconds'], result['seconds'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_results(results):
+    print(f"{'항목':<36}{'시간(ms)':>12}{'문제/초':>12}{'MB/초':>10}")
+    print("-" * 70)
+    for r in results:
+        print(f"{result_key(r):<36}{r['seconds'] * 1000:>12.2f}"
+              f"{r['problems_per_sec']:>12.1f}{r['mb_per_sec']:>10.2f}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\n[기준값 비교] (허용 범위 +{threshold:.0%})")
+    print(f"{'항목':<36}{'기준(ms)':>12}{'현재(ms)':>12}{'비율':>8}")
+    print("-" * 70)
+    for key, base_sec, now_sec, ratio, regressed in rows:
+        mark = '  ⚠️ 회귀' if regressed else ''
+        print(f"{key:<36}{base_sec * 1000:>12.2f}{now_sec * 1000:>12.2f}{ratio:>8.2f}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LaTeX 추출 핵심 경로 벤치마크')
+    parser.add_argument('--sizes', type=str, default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='코퍼스 반복 배수 목록 (예: 1,2,4)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='항목별 반복 횟수 (최소 시간 사용)')
+    parser.add_argument('--workers', type=int, default=4, help='extract_problems_parallel 워커 수')
+    parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE), help='기준값 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='현재 결과를 기준값으로 저장')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='회귀 판단 기준 (0.25 = 25%% 느려짐)')
+    parser.add_argument('--output', type=str, help='결과 JSON 저장 경로')
+    parser.add_argument('--quick', action='store_true', help='크기 1배, 1회만 측정')
+
+    args = parser.parse_args()
+    sizes = [1] if args.quick else [int(s) for s in args.sizes.split(',') if s.strip()]
+    repeat = 1 if args.quick else args.repeat
+
+    corpus = harvest_corpus()
+    if not corpus:
+        print("❌ convert_*_latex.py에서 latex_content를 찾지 못했습니다.")
+        return False
+    corpus_chars = sum(len(latex) for latex in corpus.values())
+    print(f"[코퍼스] 스크립트 {len(corpus)}개, {corpus_chars:,}자")
+
+    results = []
+    for scale in sizes:
+        print(f"[측정] x{scale}")
+        results.extend(benchmark_size(corpus, scale, repeat, args.workers))
+
+    print()
+    print_results(results)
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'corpus_files': len(corpus),
+        'corpus_chars': corpus_chars,
+        'repeat': repeat,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[결과 저장] {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[기준값 저장] {baseline_path}")
+        return True
+
+    if not baseline_path.exists():
+        print(f"\n[참고] 기준값 파일 없음: {baseline_path} (--save-baseline으로 생성)")
+        return True
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare_with_baseline(results, baseline, args.threshold)
+    print_comparison(rows, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"\n❌ 회귀 {len(regressions)}건")
+        return False
+    print("\n✅ 회귀 없음")
+    return True
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,242 @@
+# benchmark_ocr.py
+# OCR 해상도/전처리 벤치마크 (300 DPI + ocr_preprocess vs 600 DPI 원본)
+
+"""
+사용법:
+python benchmark_ocr.py 교재.pdf                          # 앞 3페이지, 설정별 정확도/시간
+python benchmark_ocr.py a.pdf b.pdf --pages 1-10
+python benchmark_ocr.py 교재.pdf --simulate-scan           # 기울기/잡티를 넣어 스캔본 흉내
+python benchmark_ocr.py 교재.pdf --output ocr_bench.json
+python benchmark_ocr.py 교재.pdf --lang kor                 # 언어 하나로 고정 (기본은 운영 설정의 언어 재시도 순서)
+
+정답 텍스트:
+  텍스트 레이어가 있는 페이지(page_router 판정 'text')의 텍스트 레이어를 정답으로 사용
+  정확도 = 공백을 뺀 문자열 유사도 (difflib.SequenceMatcher.ratio, 1.0 = 완전 일치)
+
+OCR은 extract_direct_poppler와 같은 Tesseract 옵션(TESSERACT_CONFIG)과
+언어 재시도 순서(OCR_LANGS, 결과가 OCR_MIN_CHARS 이하이면 다음 언어)로 실행
+
+측정 설정 (SETTINGS):
+  raw@600         600 DPI, 전처리 없음
+  enhance@600     600 DPI, 대비/선명도 향상 (extract_direct_poppler 현재 설정)
+  raw@300         300 DPI, 전처리 없음
+  preprocess@300  300 DPI, ocr_preprocess.preprocess_for_ocr
+
+preprocess@300의 정확도가 raw@600보다 허용 오차 이상 낮으면 실패(종료 코드 1)
+(통과 결과를 확인한 뒤에만 extract_direct_poppler.OCR_DPI를 300으로 낮출 것)
+"""
+
+import argparse
+import difflib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from extract_direct_poppler import OCR_LANGS, OCR_MIN_CHARS, TESSERACT_CONFIG
+from ocr_preprocess import preprocess_for_ocr
+from page_router import ROUTE_TEXT, get_page_router
+from pdf_ocr_cache import TESSERACT_AVAILABLE, PDFOCRCache, enhance_for_ocr, ocr_image
+from pdf_text_cache import get_page_texts
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+# (이름, DPI, 전처리 함수)
+SETTINGS = (
+    ('raw@600', 600, None),
+    ('enhance@600', 600, enhance_for_ocr),
+    ('raw@300', 300, None),
+    ('preprocess@300', 300, preprocess_for_ocr),
+)
+REFERENCE_SETTING = 'raw@600'
+CANDIDATE_SETTING = 'preprocess@300'
+DEFAULT_PAGES = '1-3'
+DEFAULT_TOLERANCE = 0.005   # 정확도가 이만큼까지 낮아도 같은 것으로 봄
+
+SCAN_SKEW_ANGLE = 1.5       # --simulate-scan 기울기 (도)
+SCAN_NOISE_RATIO = 0.001    # --simulate-scan 잡티 픽셀 비율
+
+
+def text_accuracy(reference, text):
+    """공백을 뺀 문자열 유사도 (0~1)"""
+    reference = ''.join(reference.split())
+    text = ''.join((text or '').split())
+    if not reference:
+        return 1.0 if not text else 0.0
+    return difflib.SequenceMatcher(None, reference, text, autojunk=False).ratio()
+
+
+def simulate_scan(image, seed):
+    """스캔본 흉내: 회전 + 점 잡티 (같은 페이지는 DPI와 상관없이 같은 잡티 비율)"""
+    import numpy as np
+    from PIL import Image
+    rotated = image.convert('L').rotate(SCAN_SKEW_ANGLE, resample=Image.BICUBIC, fillcolor=255)
+    pixels = np.array(rotated)
+    rng = np.random.default_rng(seed)
+    pixels[rng.random(pixels.shape) < SCAN_NOISE_RATIO] = 0
+    return Image.fromarray(pixels)
+
+
+def sample_pages(pdf_path, page_nums):
+    """정답 텍스트로 쓸 수 있는 페이지 {페이지: 텍스트 레이어}"""
+    decisions = get_page_router().route_pages(pdf_path, page_nums)
+    if not decisions:
+        return {}
+    usable = [p for p, decision in decisions.items() if decision['route'] == ROUTE_TEXT]
+    if not usable:
+        return {}
+    start, end = min(usable), max(usable) + 1
+    texts = get_page_texts(pdf_path, start, end)
+    return {p: texts[p - start] for p in usable}
+
+
+def benchmark_setting(pdf_path, references, setting, langs, simulate, work_dir):
+    """설정 하나로 렌더링 → 전처리 → OCR (운영과 같은 옵션/언어 재시도), 페이지별 시간/정확도"""
+    from PIL import Image
+
+    name, dpi, preprocess = setting
+    cache = PDFOCRCache(work_dir)
+
+    start = time.perf_counter()
+    images = cache.render_pages(pdf_path, list(references), dpi)   # 연속 구간당 렌더링 1회
+    render_sec = time.perf_counter() - start
+
+    pages = []
+    for page_num, reference in references.items():
+        if page_num not in images:
+            continue
+        with Image.open(images[page_num]) as image:
+            image.load()
+            if simulate:
+                image = simulate_scan(image, seed=page_num)
+            megapixels = image.size[0] * image.size[1] / 1e6
+
+            start = time.perf_counter()
+            if preprocess is not None:
+                image = preprocess(image)
+            preprocess_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            text = ocr_image(image, langs, TESSERACT_CONFIG, OCR_MIN_CHARS)
+            ocr_sec = time.perf_counter() - start
+
+        pages.append({
+            'page': page_num,
+            'megapixels': megapixels,
+            'preprocess_sec': preprocess_sec,
+            'ocr_sec': ocr_sec,
+            'accuracy': text_accuracy(reference, text),
+        })
+
+    count = max(1, len(pages))
+    return {
+        'name': name,
+        'pdf': str(pdf_path),
+        'dpi': dpi,
+        'pages': pages,
+        'render_sec': render_sec,
+        'preprocess_sec': sum(p['preprocess_sec'] for p in pages),
+        'ocr_sec': sum(p['ocr_sec'] for p in pages),
+        'megapixels': sum(p['megapixels'] for p in pages) / count,
+        'accuracy': sum(p['accuracy'] for p in pages) / count,
+    }
+
+
+def summarize(results):
+    """설정별 합계 (여러 PDF 합산, 정확도는 페이지 평균)"""
+    summary = {}
+    for result in results:
+        item = summary.setdefault(result['name'], {'name': result['name'], 'dpi': result['dpi'],
+                                                   'pages': 0, 'render_sec': 0.0, 'preprocess_sec': 0.0,
+                                                   'ocr_sec': 0.0, '_accuracy': 0.0, '_megapixels': 0.0})
+        item['pages'] += len(result['pages'])
+        item['render_sec'] += result['render_sec']
+        item['preprocess_sec'] += result['preprocess_sec']
+        item['ocr_sec'] += result['ocr_sec']
+        item['_accuracy'] += sum(p['accuracy'] for p in result['pages'])
+        item['_megapixels'] += sum(p['megapixels'] for p in result['pages'])
+    for item in summary.values():
+        count = max(1, item['pages'])
+        item['accuracy'] = item.pop('_accuracy') / count
+        item['megapixels'] = item.pop('_megapixels') / count
+        item['total_sec'] = item['render_sec'] + item['preprocess_sec'] + item['ocr_sec']
+    return list(summary.values())
+
+
+def print_summary(summary):
+    print(f"{'설정':<18}{'페이지':>6}{'MP/쪽':>8}{'렌더(s)':>9}{'전처리(s)':>10}{'OCR(s)':>9}{'합계(s)':>9}{'정확도':>8}")
+    print("-" * 77)
+    for item in summary:
+        print(f"{item['name']:<18}{item['pages']:>6}{item['megapixels']:>8.1f}{item['render_sec']:>9.2f}"
+              f"{item['preprocess_sec']:>10.2f}{item['ocr_sec']:>9.2f}{item['total_sec']:>9.2f}"
+              f"{item['accuracy']:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OCR 해상도/전처리 벤치마크')
+    parser.add_argument('pdfs', nargs='+', help='텍스트 레이어가 있는 표본 PDF')
+    parser.add_argument('--pages', type=str, default=DEFAULT_PAGES, help='페이지 범위 (1부터, 예: 1-3)')
+    parser.add_argument('--lang', type=str, help=f"Tesseract 언어 하나로 고정 (기본: {' → '.join(OCR_LANGS)} 순서로 재시도)")
+    parser.add_argument('--simulate-scan', action='store_true', help='기울기/잡티를 넣어 스캔본 흉내')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'{CANDIDATE_SETTING} 정확도 허용 오차 ({REFERENCE_SETTING} 대비)')
+    parser.add_argument('--output', type=str, help='결과 JSON 저장 경로')
+
+    args = parser.parse_args()
+    if not TESSERACT_AVAILABLE:
+        print("❌ pytesseract가 설치되지 않았습니다.")
+        return False
+
+    langs = (args.lang,) if args.lang else OCR_LANGS
+    first, _, last = args.pages.partition('-')
+    page_nums = range(int(first) - 1, int(last or first))
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='ocr_bench_') as work_dir:
+        for pdf in args.pdfs:
+            references = sample_pages(pdf, page_nums)
+            if not references:
+                print(f"[건너뜀] {pdf}: 텍스트 레이어가 있는 페이지 없음")
+                continue
+            print(f"[측정] {Path(pdf).name}: {len(references)}페이지")
+            for setting in SETTINGS:
+                results.append(benchmark_setting(pdf, references, setting, langs,
+                                                 args.simulate_scan, Path(work_dir) / setting[0]))
+
+    if not results:
+        print("❌ 측정할 페이지가 없습니다.")
+        return False
+
+    summary = summarize(results)
+    print()
+    print_summary(summary)
+
+    if args.output:
+        report = {'python': sys.version.split()[0], 'platform': sys.platform, 'lang': list(langs),
+                  'config': TESSERACT_CONFIG,
+                  'simulate_scan': args.simulate_scan, 'summary': summary, 'results': results}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[결과 저장] {args.output}")
+
+    by_name = {item['name']: item for item in summary}
+    reference, candidate = by_name[REFERENCE_SETTING], by_name[CANDIDATE_SETTING]
+    speedup = reference['total_sec'] / candidate['total_sec'] if candidate['total_sec'] else 0.0
+    print(f"\n{CANDIDATE_SETTING}: 정확도 {candidate['accuracy']:.3f} "
+          f"({REFERENCE_SETTING} {reference['accuracy']:.3f}), {speedup:.1f}배 빠름")
+    if candidate['accuracy'] + args.tolerance < reference['accuracy']:
+        print(f"❌ {CANDIDATE_SETTING} 정확도가 {REFERENCE_SETTING}보다 낮습니다")
+        return False
+    print(f"✅ {CANDIDATE_SETTING} 정확도가 {REFERENCE_SETTING} 이상 (허용 오차 {args.tolerance})")
+    return True
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
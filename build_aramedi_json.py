@@ -6,6 +6,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from taxonomy import scan_keywords, HINT_CONCEPT_KEYWORDS
+
 class AramedProblemGenerator:
     """
     Aramed AI 문제 해설 생성기
@@ -29,17 +31,7 @@ class AramedProblemGenerator:
     def generate_hint1(self) -> str:
         """힌트1: 개념 확인"""
         # 문제 텍스트에서 핵심 개념 추출 시도
-        concepts = []
-        if "n제곱근" in self.problem_text or "거듭제곱근" in self.problem_text:
-            concepts.append("실수인 n제곱근의 개수")
-        if "등차수열" in self.problem_text:
-            concepts.append("등차수열")
-        if "등비수열" in self.problem_text:
-            concepts.append("등비수열")
-        if "로그" in self.problem_text:
-            concepts.append("로그함수")
-        if "지수" in self.problem_text:
-            concepts.append("지수함수")
+        concepts = scan_keywords(self.problem_text).matched_groups(HINT_CONCEPT_KEYWORDS)
         
         if concepts:
             concept_str = ", ".join(concepts)
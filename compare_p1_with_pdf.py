@@ -4,6 +4,8 @@
 import sys
 import os
 from pathlib import Path
+from pdf_utils import extract_text_from_pdf
+from path_index import glob_indexed
 import re
 
 # Windows 콘솔 인코딩 설정
@@ -58,38 +60,6 @@ provided_data = {
     }
 }
 
-def extract_text_from_pdf(pdf_path):
-    """PDF에서 텍스트 추출"""
-    try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except ImportError:
-            try:
-                import fitz  # PyMuPDF
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
-            except ImportError:
-                print("[오류] PDF 라이브러리가 설치되어 있지 않습니다.")
-                print("다음 중 하나를 설치해주세요: pdfplumber, PyPDF2, PyMuPDF")
-                return None
-
 def normalize_text(text):
     """텍스트 정규화 (공백, 줄바꿈 제거 등)"""
     if not text:
@@ -241,20 +211,20 @@ def main():
     pdf_path = None
     
     if organized_dir.exists():
-        for pdf_file in organized_dir.glob('*드릴*P1*.pdf'):
+        for pdf_file in glob_indexed(organized_dir, '*드릴*P1*.pdf'):
             pdf_path = pdf_file
             break
     
     # 원본 폴더에서도 찾기
     if pdf_path is None:
-        for pdf_file in base_dir.glob('*드릴*P1*.pdf'):
+        for pdf_file in glob_indexed(base_dir, '*드릴*P1*.pdf'):
             if 'organized' not in str(pdf_file):
                 pdf_path = pdf_file
                 break
     
     # 미적분 폴더에서 찾기
     if pdf_path is None:
-        for pdf_file in base_dir.glob('*미적분*P1*.pdf'):
+        for pdf_file in glob_indexed(base_dir, '*미적분*P1*.pdf'):
             pdf_path = pdf_file
             break
     
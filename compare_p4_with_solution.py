@@ -4,6 +4,8 @@
 import sys
 import os
 from pathlib import Path
+from path_index import glob_indexed
+from pdf_utils import extract_text_from_pdf
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -11,36 +13,6 @@ if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
         sys.stdout.reconfigure(encoding='utf-8')
 
-def extract_text_from_pdf(pdf_path):
-    """PDF에서 텍스트 추출"""
-    try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except ImportError:
-            try:
-                import fitz
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
-            except ImportError:
-                return None
-
 def find_solution_pdf():
     """해설 PDF 찾기"""
     base_dir = Path(r'C:\Users\a\Documents\MathPDF')
@@ -53,7 +25,7 @@ def find_solution_pdf():
     
     if organized_dir.exists():
         for pattern in search_patterns:
-            for pdf_file in organized_dir.glob(pattern):
+            for pdf_file in glob_indexed(organized_dir, pattern):
                 if pdf_file.exists():
                     return pdf_file
     
@@ -0,0 +1,196 @@
+# conversion_cache.py
+# Mathpix LaTeX 변환 결과 캐시 (내용 해시 기반, LRU 제거)
+# Node 쪽 data/cache_store.json (src/database/cache_manager.js)에 대응하는 Python 파이프라인용 저장소
+
+import atexit
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from latex_utils import extract_body
+
+CACHE_DIR = Path(__file__).resolve().parent / 'data'
+CACHE_FILE = CACHE_DIR / 'conversion_cache.json'
+
+
+class ConversionCache:
+    """
+    LaTeX 본문 해시 + 추출기 버전을 키로 하는 변환 결과 캐시
+
+    - 항목 수 / 전체 크기 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - 파일 형식: {"items": [...], "stats": {...}, "lastSaved": ...}
+    - get(적중)/set/delete는 변경 표시만 하고, 파일 전체 저장은 autosave_interval초에 한 번 +
+      flush() 호출 시 + 프로세스 종료 시 (배치 실행에서 파일마다 최대 50MB를 다시 쓰지 않음)
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, max_entries=500, max_bytes=50 * 1024 * 1024,
+                 autosave=True, autosave_interval=60.0):
+        self.cache_file = Path(cache_file)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.autosave = autosave
+        self.autosave_interval = autosave_interval
+        self.dirty = False
+        self.last_saved = time.monotonic()
+        self.cache = OrderedDict()  # key -> item (앞쪽이 가장 오래 사용하지 않은 항목)
+        self.total_bytes = 0
+        self.initialized = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'saves': 0,
+            'evictions': 0,
+        }
+
+    def init(self):
+        """초기화 - 파일에서 캐시 로드"""
+        if self.initialized:
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            items = sorted(cache_data.get('items', []), key=lambda item: item.get('accessedAt', 0))
+            for item in items:
+                self.cache[item['key']] = item
+                self.total_bytes += item.get('size', 0)
+            self.stats.update(cache_data.get('stats', {}))
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"[경고] 변환 캐시 로드 실패: {e}")
+
+        self.initialized = True
+        self._evict()
+        if self.autosave:
+            atexit.register(self.flush)
+
+    def save(self):
+        """캐시 파일에 저장 (임시 파일 → 교체)"""
+        self.init()
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        cache_data = {
+            'items': list(self.cache.values()),
+            'stats': self.stats,
+            'lastSaved': int(time.time() * 1000),
+        }
+        temp_file = self.cache_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f, ensure_ascii=False)
+        os.replace(temp_file, self.cache_file)
+        self.dirty = False
+        self.last_saved = time.monotonic()
+
+    def flush(self):
+        """변경된 내용이 있으면 저장 (배치 끝에서 호출)"""
+        if self.initialized and self.dirty:
+            self.save()
+
+    def _mark_dirty(self):
+        """변경 표시 (autosave면 마지막 저장 후 autosave_interval초가 지났을 때만 저장)"""
+        self.dirty = True
+        if self.autosave and time.monotonic() - self.last_saved >= self.autosave_interval:
+            self.save()
+
+    @staticmethod
+    def make_key(latex_content, extractor_version, kind='problem'):
+        """
+        캐시 키 생성 (전처리부 제외한 본문 + 추출기 버전 + 종류)
+
+        Args:
+            latex_content: Mathpix LaTeX 전체
+            extractor_version: 추출기 버전 문자열 (바뀌면 기존 캐시 무효화)
+            kind: 'problem' 또는 'solution'
+        """
+        body = extract_body(latex_content)
+        digest = hashlib.sha256()
+        digest.update(f"{extractor_version}::{kind}::".encode('utf-8'))
+        digest.update(body.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        캐시에서 값 가져오기
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        self.init()
+
+        item = self.cache.get(key)
+        if item is None:
+            self.stats['misses'] += 1
+            return None
+
+        # 최근 사용으로 이동
+        self.cache.move_to_end(key)
+        item['accessedAt'] = int(time.time() * 1000)
+        item['accessCount'] = item.get('accessCount', 0) + 1
+        self.stats['hits'] += 1
+        # 사용 순서도 저장해야 다음 실행의 LRU 제거가 최근 사용을 반영함
+        self._mark_dirty()
+        return item['value']
+
+    def set(self, key, value):
+        """캐시에 값 저장 (상한 초과 시 LRU 제거)"""
+        self.init()
+
+        size = len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        if key in self.cache:
+            self.total_bytes -= self.cache.pop(key).get('size', 0)
+
+        now = int(time.time() * 1000)
+        self.cache[key] = {
+            'key': key,
+            'value': value,
+            'size': size,
+            'createdAt': now,
+            'accessedAt': now,
+            'accessCount': 0,
+        }
+        self.total_bytes += size
+        self.stats['saves'] += 1
+        self._evict()
+        self._mark_dirty()
+
+    def delete(self, key):
+        """캐시에서 항목 제거"""
+        self.init()
+
+        item = self.cache.pop(key, None)
+        if item is None:
+            return False
+        self.total_bytes -= item.get('size', 0)
+        self._mark_dirty()
+        return True
+
+    def clear(self):
+        """캐시 비우기"""
+        self.init()
+
+        self.cache.clear()
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'saves': 0, 'evictions': 0}
+        self.save()
+
+    def _evict(self):
+        """상한을 넘는 동안 가장 오래 사용하지 않은 항목 제거"""
+        while self.cache and (len(self.cache) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, item = self.cache.popitem(last=False)
+            self.total_bytes -= item.get('size', 0)
+            self.stats['evictions'] += 1
+
+    def get_stats(self):
+        """캐시 통계"""
+        total = self.stats['hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] / total * 100) if total > 0 else 0
+        return {
+            **self.stats,
+            'size': len(self.cache),
+            'bytes': self.total_bytes,
+            'hitRate': f"{hit_rate:.2f}%",
+        }
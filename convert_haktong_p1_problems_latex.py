@@ -6,7 +6,7 @@ import sys
 import os
 from pathlib import Path
 from latex_utils import (
-    extract_body, extract_options_generic, clean_latex_text
+    extract_body, extract_options_generic, extract_boogi_choices, clean_latex_text
 )
 from convert_template import review_problems, save_for_deepseek
 
@@ -354,25 +354,8 @@ def extract_problems_from_latex(latex_content, debug=False):
                     next_pos = markers[i][0]
                     search_text = body[problem_start:min(next_pos, problem_end + 500)]
                 
-                found_options = {}
-                for opt_num in range(1, 6):
-                    # 전각 괄호: （1）~（5）
-                    pattern1 = rf'（{opt_num}）\s*([^（]+?)(?=（[1-5]）|$|\\section|\\end)'
-                    # 반각 괄호: (1)~(5)
-                    pattern2 = rf'\({opt_num}\)\s*([^(]+?)(?=\([1-5]\)|$|\\section|\\end)'
-                    
-                    # search_text 전체에서 검색
-                    match1 = re.search(pattern1, search_text, re.DOTALL)
-                    match2 = re.search(pattern2, search_text, re.DOTALL)
-                    match = match1 or match2
-                    
-                    if match:
-                        option_text = clean_latex_text(match.group(1))
-                        # 보기 내용이 선택지에 포함되지 않도록 확인
-                        # 선택지가 ㄱ,ㄴ,ㄷ 조합이어야 함
-                        if ('ㄱ' in option_text or 'ㄴ' in option_text or 'ㄷ' in option_text or 
-                            'ᄀ' in option_text or 'ᄂ' in option_text or 'ᄃ' in option_text):
-                            found_options[opt_num] = option_text
+                # 선택지 (1)~(5): 마커를 한 번만 스캔해서 ㄱ,ㄴ,ㄷ 조합 선택지만 추출
+                found_options = extract_boogi_choices(search_text)
                 
                 # 순서대로 정렬
                 for opt_num in sorted(found_options.keys()):
@@ -6,6 +6,7 @@ import csv
 import sys
 import os
 from pathlib import Path
+from path_index import glob_indexed
 from datetime import datetime
 import json
 
@@ -244,7 +245,7 @@ def find_original_pdf():
     
     if organized_dir.exists():
         for pattern in search_patterns:
-            for pdf_file in organized_dir.glob(pattern):
+            for pdf_file in glob_indexed(organized_dir, pattern):
                 if pdf_file.exists():
                     return pdf_file
     
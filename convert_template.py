@@ -13,6 +13,7 @@ from latex_utils import (
     extract_options_generic, extract_problem_with_options,
     clean_latex_text, test_pattern
 )
+from review_engine import validate_problems, render_report
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -60,58 +61,15 @@ def extract_problems_from_latex(latex_content, debug=False):
 
 
 def review_problems(problems):
-    """문제 데이터 검토"""
-    print("=" * 60)
-    print("[문제 데이터 검토]")
-    print("=" * 60)
-    
-    issues = []
-    
-    for prob in problems:
-        idx = prob.get("index", "?")
-        print(f"\n[문제 {idx}]")
-        
-        # LaTeX 검사
-        question = prob.get("question", "")
-        if '$' in question and question.count('$') % 2 != 0:
-            issues.append(f"문제 {idx}: LaTeX 수식 괄호 불일치")
-            print("[LaTeX] 오류: 수식 괄호 불일치")
-        else:
-            print("[LaTeX] 정상")
-        
-        print(f"[내용 길이] {len(question)}자")
-        
-        # 유형 확인
-        answer_type = prob.get("answer_type", "")
-        print(f"[유형] {answer_type}")
-        
-        if answer_type == "multiple_choice":
-            options = prob.get("options", [])
-            print(f"[선택지 수] {len(options)}개")
-            if len(options) == 5:
-                print("[선택지] 정상")
-            else:
-                issues.append(f"문제 {idx}: 선택지 수 오류 ({len(options)}개)")
-                print(f"[선택지] 오류: {len(options)}개 (5개여야 함)")
-    
-    print("\n" + "=" * 60)
-    print("[검토 결과]")
-    print("=" * 60)
-    print(f"[총 문제수] {len(problems)}개")
-    
-    mc_count = sum(1 for p in problems if p.get("answer_type") == "multiple_choice")
-    sa_count = sum(1 for p in problems if p.get("answer_type") == "short_answer")
-    print(f"[객관식] {mc_count}개")
-    print(f"[주관식] {sa_count}개")
-    
-    if issues:
-        print("\n[오류]")
-        for issue in issues:
-            print(f"  - {issue}")
-    else:
-        print("\n[오류] 없음")
+    """
+    문제 데이터 검토 (review_engine.validate_problems 결과를 요약 출력)
     
-    return len(issues) == 0
+    Returns:
+        검토 통과 여부 (bool)
+    """
+    report = validate_problems(problems)
+    render_report(report)
+    return report['passed']
 
 
 def save_for_deepseek(problems, output_dir, base_filename):
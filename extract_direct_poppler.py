@@ -2,206 +2,62 @@
 # Poppler를 직접 사용하여 PDF를 이미지로 변환 후 OCR
 
 import sys
-import os
-import subprocess
-import tempfile
 from pathlib import Path
-from PIL import Image
 
-try:
-    import pytesseract
-    import os
-    # Tesseract 경로 설정
-    possible_paths = [
-        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-        r'C:\Users\{}\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
-    ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            pytesseract.pytesseract.tesseract_cmd = path
-            print(f'[정보] Tesseract 경로 설정: {path}')
-            break
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
+from page_router import get_page_router
+from pdf_ocr_cache import TESSERACT_AVAILABLE, available_renderers, enhance_for_ocr, ocr_page_texts
+
+# 렌더링/OCR 설정 (pdftocairo 우선, 한국어+영어 → 한국어 → 영어 순으로 재시도)
+OCR_DPI = 600  # OCR 정확도 향상 (300 DPI + ocr_preprocess로 낮추려면 먼저 benchmark_ocr.py로 정확도 확인)
+PDFTOPPM_DPI = 300  # pdftocairo가 없을 때 pdftoppm 대체 경로의 DPI (기존 설정)
+OCR_LANGS = ('kor+eng', 'kor', 'eng')
+TESSERACT_CONFIG = '--oem 3 --psm 6'  # 문단 구조 강제 인식
+OCR_MIN_CHARS = 50  # 결과가 이 길이 이하이면 다음 언어로 재시도
+
+
+def render_settings():
+    """(렌더러, DPI): pdftocairo가 있으면 OCR_DPI, pdftoppm만 있으면 PDFTOPPM_DPI"""
+    if available_renderers(('pdftocairo',)):
+        return ('pdftocairo',), OCR_DPI
+    return ('pdftoppm',), PDFTOPPM_DPI
+
+
+def extract_texts_with_ocr(pdf_path, page_nums, max_workers=None):
+    """
+    페이지별 텍스트 (page_router: 텍스트 레이어 품질이 낮은 페이지만 Poppler 렌더링 + 병렬 OCR,
+    결과는 pdf_text_cache / pdf_ocr_cache에 저장)
+
+    Returns:
+        {페이지: 텍스트} (실패 시 None)
+    """
+    if not TESSERACT_AVAILABLE:
+        print('[경고] pytesseract가 설치되지 않았습니다. 텍스트 레이어가 있는 페이지만 추출합니다.')
+
+    renderers, dpi = render_settings()
+    ocr_options = dict(dpi=dpi, lang=OCR_LANGS, config=TESSERACT_CONFIG,
+                       min_chars=OCR_MIN_CHARS, preprocess=enhance_for_ocr, renderers=renderers)
+    print(f'[진행] 텍스트 추출 중... ({len(page_nums)}페이지, 품질이 낮은 페이지만 OCR: DPI {dpi}, 옵션: {TESSERACT_CONFIG})')
+    texts = get_page_router().page_texts(pdf_path, page_nums, max_workers or 1, **ocr_options)
+    if texts is None:
+        # 텍스트 레이어를 읽을 수 없으면 (PDF 라이브러리 없음) 전부 OCR
+        texts = ocr_page_texts(pdf_path, page_nums, max_workers=max_workers, **ocr_options)
+    return texts
+
 
 def extract_text_with_ocr(pdf_path, page_num=0):
     """Poppler를 직접 사용하여 PDF를 이미지로 변환 후 OCR"""
-    if not TESSERACT_AVAILABLE:
-        print('[오류] pytesseract가 설치되지 않았습니다.')
+    texts = extract_texts_with_ocr(pdf_path, [page_num])
+    if texts is None:
         return None
-    
-    poppler_bin = r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0\Library\bin'
-    
-    # pdftocairo 시도 (더 안정적일 수 있음)
-    pdftocairo_exe = os.path.join(poppler_bin, 'pdftocairo.exe')
-    pdftoppm_exe = os.path.join(poppler_bin, 'pdftoppm.exe')
-    
-    exe_to_use = None
-    if os.path.exists(pdftocairo_exe):
-        exe_to_use = pdftocairo_exe
-        print('[정보] pdftocairo 사용')
-    elif os.path.exists(pdftoppm_exe):
-        exe_to_use = pdftoppm_exe
-        print('[정보] pdftoppm 사용')
-    else:
-        print(f'[오류] Poppler 실행 파일을 찾을 수 없습니다.')
-        return None
-    
-    try:
-        # 임시 디렉토리 생성
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, f'page-{page_num + 1}.png')
-            
-            print(f'[진행] PDF를 이미지로 변환 중... (페이지 {page_num + 1})')
-            
-            # pdftocairo 또는 pdftoppm 실행 (DPI 600으로 높게 설정)
-            if 'pdftocairo' in exe_to_use:
-                cmd = [
-                    exe_to_use,
-                    '-png',
-                    '-r', '600',  # DPI 600 (OCR 정확도 향상)
-                    '-f', str(page_num + 1),  # 첫 페이지
-                    '-l', str(page_num + 1),  # 마지막 페이지
-                    str(pdf_path),
-                    output_file.replace('.png', '')  # 확장자 제거 (pdftocairo가 자동 추가)
-                ]
-            else:
-                cmd = [
-                    exe_to_use,
-                    '-png',
-                    '-r', '300',  # DPI
-                    '-f', str(page_num + 1),  # 첫 페이지
-                    '-l', str(page_num + 1),  # 마지막 페이지
-                    str(pdf_path),
-                    output_file.replace('.png', '')  # 확장자 제거
-                ]
-            
-            # 환경 변수에 Poppler bin 경로 추가 (DLL 찾기 위해)
-            env = os.environ.copy()
-            current_path = env.get('PATH', '')
-            if poppler_bin not in current_path:
-                env['PATH'] = poppler_bin + os.pathsep + current_path
-            
-            # 작업 디렉토리를 Poppler bin으로 설정하여 DLL을 찾을 수 있도록
-            # shell=True로 시도 (Windows에서 더 안정적일 수 있음)
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=poppler_bin, shell=False, timeout=30)
-            except subprocess.TimeoutExpired:
-                print('[오류] pdftoppm 실행 시간 초과')
-                return None
-            except FileNotFoundError:
-                # 절대 경로로 재시도
-                cmd[0] = exe_to_use
-                result = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=poppler_bin, shell=False, timeout=30)
-            
-            if result.returncode != 0:
-                print(f'[오류] pdftoppm 실행 실패 (코드: {result.returncode})')
-                if result.stdout:
-                    print(f'[출력] {result.stdout}')
-                if result.stderr:
-                    print(f'[오류 메시지] {result.stderr}')
-                return None
-            
-            if result.stdout:
-                print(f'[정보] pdftoppm 출력: {result.stdout}')
-            
-            # 생성된 이미지 파일 찾기
-            if 'pdftocairo' in exe_to_use:
-                # pdftocairo는 파일명에 페이지 번호를 추가 (예: page-1-01.png)
-                image_files = list(Path(temp_dir).glob('*.png'))
-            else:
-                image_files = list(Path(temp_dir).glob('page-*.png'))
-            
-            if not image_files:
-                print('[오류] 이미지 파일이 생성되지 않았습니다.')
-                print(f'[디버그] 임시 디렉토리 내용: {list(Path(temp_dir).iterdir())}')
-                return None
-            
-            image_file = image_files[0]
-            print(f'[완료] 이미지 생성 완료: {image_file.name}')
-            
-            # OCR 처리
-            print('[진행] OCR 처리 중... (시간이 걸릴 수 있습니다)')
-            try:
-                image = Image.open(image_file)
-                print(f'[정보] 원본 이미지 크기: {image.size}, 모드: {image.mode}')
-                
-                # 이미지 전처리: 흑백 변환 및 대비 향상
-                # 1. 그레이스케일 변환
-                if image.mode != 'L':
-                    image = image.convert('L')
-                    print('[전처리] 그레이스케일 변환 완료')
-                
-                # 2. 대비 향상 (ImageEnhance 사용)
-                enhancer = ImageEnhance.Contrast(image)
-                image = enhancer.enhance(2.0)  # 대비 2배 증가
-                print('[전처리] 대비 향상 완료 (2.0x)')
-                
-                # 3. 선명도 향상 (선택적)
-                enhancer_sharp = ImageEnhance.Sharpness(image)
-                image = enhancer_sharp.enhance(1.5)  # 선명도 1.5배 증가
-                print('[전처리] 선명도 향상 완료 (1.5x)')
-                
-                print(f'[정보] 전처리 후 이미지 크기: {image.size}')
-                
-                # 사용 가능한 언어 확인
-                try:
-                    available_langs = pytesseract.get_languages()
-                    print(f'[정보] 사용 가능한 언어: {available_langs}')
-                except:
-                    pass
-                
-                # Tesseract 설정: --oem 3 --psm 6 (문단 구조 강제 인식)
-                tesseract_config = '--oem 3 --psm 6'
-                print(f'[설정] Tesseract 옵션: {tesseract_config}')
-                
-                # 먼저 한국어+영어 시도
-                text = None
-                lang_options = ['kor+eng', 'kor', 'eng']
-                for lang_option in lang_options:
-                    try:
-                        print(f'[시도] 언어: {lang_option}')
-                        text = pytesseract.image_to_string(image, lang=lang_option, config=tesseract_config)
-                        if text and len(text.strip()) > 50:  # 의미있는 텍스트가 추출되었는지 확인
-                            print(f'[성공] 언어 {lang_option}로 OCR 완료: {len(text)} 문자')
-                            break
-                        else:
-                            print(f'[경고] 언어 {lang_option} 결과가 너무 짧음: {len(text) if text else 0} 문자')
-                    except Exception as lang_error:
-                        print(f'[경고] 언어 {lang_option} 실패: {lang_error}')
-                        continue
-                
-                if not text:
-                    print('[오류] 모든 언어 옵션 실패')
-                    return None
-                
-                print(f'[최종] OCR 결과 길이: {len(text)} 문자')
-                
-                if not text or len(text.strip()) == 0:
-                    print('[경고] OCR 결과가 비어있습니다.')
-                    print('[디버그] 이미지 파일을 확인해보세요.')
-                    # 이미지 파일을 현재 디렉토리에 복사 (디버깅용)
-                    debug_image = Path('debug_page1.png')
-                    import shutil
-                    shutil.copy(image_file, debug_image)
-                    print(f'[디버그] 이미지 저장: {debug_image.absolute()}')
-                    return None
-                
-                return text
-            except Exception as e:
-                print(f'[오류] OCR 처리 실패: {e}')
-                import traceback
-                traceback.print_exc()
-                return None
-    
-    except Exception as e:
-        print(f'[오류] 처리 중 오류 발생: {e}')
-        import traceback
-        traceback.print_exc()
+
+    text = texts.get(page_num)
+    if not text or len(text.strip()) == 0:
+        print('[경고] OCR 결과가 비어있습니다.')
         return None
 
+    print(f'[최종] OCR 결과 길이: {len(text)} 문자')
+    return text
+
 def analyze_problem_structure(text):
     """텍스트에서 문제와 해설 구분"""
     if not text:
@@ -3,6 +3,7 @@
 
 import sys
 from pathlib import Path
+from path_index import glob_indexed
 
 # 우선순위: pdfplumber > PyPDF2 (pymupdf는 DLL 오류로 제외)
 PDF_LIBRARY = None
@@ -105,13 +106,13 @@ def main():
     # organized 폴더에서 P1 파일 찾기
     organized_dir = base_dir / 'organized' / '수1'
     if organized_dir.exists():
-        for pdf_file in organized_dir.glob('*P1*.pdf'):
+        for pdf_file in glob_indexed(organized_dir, '*P1*.pdf'):
             pdf_path = pdf_file
             break
     
     # 원본 폴더에서도 찾기
     if pdf_path is None:
-        for pdf_file in base_dir.glob('*P1*.pdf'):
+        for pdf_file in glob_indexed(base_dir, '*P1*.pdf'):
             if 'organized' not in str(pdf_file):
                 pdf_path = pdf_file
                 break
@@ -2,126 +2,41 @@
 # 이미지 스캔본 PDF에서 OCR을 사용하여 문제와 해설 추출
 
 import sys
-import io
 from pathlib import Path
 
-# PyMuPDF를 사용하여 PDF를 이미지로 변환
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-    try:
-        from pdf2image import convert_from_path
-        PDF2IMAGE_AVAILABLE = True
-    except ImportError:
-        PDF2IMAGE_AVAILABLE = False
+from page_router import get_page_router
+from pdf_ocr_cache import TESSERACT_AVAILABLE, ocr_page_texts
 
-try:
-    import pytesseract
-    TESSERACT_AVAILABLE = True
-    # Tesseract 경로 자동 탐색 (Windows 일반 설치 경로)
-    import os
-    possible_paths = [
-        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-        r'C:\Users\{}\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
-    ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            pytesseract.pytesseract.tesseract_cmd = path
-            print(f'[정보] Tesseract 경로 설정: {path}')
-            break
-except ImportError:
-    TESSERACT_AVAILABLE = False
 
-from PIL import Image
+def extract_texts_with_ocr(pdf_path, page_nums, max_workers=None):
+    """
+    페이지별 텍스트 (page_router: 텍스트 레이어 품질이 낮은 페이지만 이미지 변환 후 병렬 OCR,
+    PyMuPDF 우선, 없으면 pdf2image)
 
-def extract_text_with_ocr(pdf_path, page_num=0):
-    """PDF를 이미지로 변환 후 OCR로 텍스트 추출"""
+    Returns:
+        {페이지: 텍스트} (실패 시 None)
+    """
     if not TESSERACT_AVAILABLE:
-        print('[오류] pytesseract가 설치되지 않았습니다. pip install pytesseract')
-        print('[참고] Tesseract OCR 엔진도 별도로 설치해야 합니다.')
+        print('[경고] pytesseract가 설치되지 않았습니다. 텍스트 레이어가 있는 페이지만 추출합니다.')
+        print('[참고] OCR이 필요하면: pip install pytesseract (Tesseract OCR 엔진도 별도로 설치)')
         print('      Windows: https://github.com/UB-Mannheim/tesseract/wiki')
+
+    # OCR 설정 (한국어 + 영어, DPI 300)
+    ocr_options = dict(dpi=300, lang='kor+eng', renderers=('pymupdf', 'pdf2image'))
+    print(f'[진행] 텍스트 추출 중... ({len(page_nums)}페이지, 품질이 낮은 페이지만 OCR)')
+    texts = get_page_router().page_texts(pdf_path, page_nums, max_workers or 1, **ocr_options)
+    if texts is None:
+        # 텍스트 레이어를 읽을 수 없으면 (PDF 라이브러리 없음) 전부 OCR
+        texts = ocr_page_texts(pdf_path, page_nums, max_workers=max_workers, **ocr_options)
+    return texts
+
+
+def extract_text_with_ocr(pdf_path, page_num=0):
+    """PDF를 이미지로 변환 후 OCR로 텍스트 추출"""
+    texts = extract_texts_with_ocr(pdf_path, [page_num])
+    if texts is None:
         return None
-    
-    try:
-        image = None
-        
-        # 방법 1: PyMuPDF 사용 (우선)
-        if PYMUPDF_AVAILABLE:
-            try:
-                print(f'[진행] PDF를 이미지로 변환 중... (PyMuPDF 사용, 페이지 {page_num + 1})')
-                import fitz
-                doc = fitz.open(pdf_path)
-                if page_num >= len(doc):
-                    print(f'[오류] 페이지 {page_num + 1}이 존재하지 않습니다. 총 페이지: {len(doc)}')
-                    doc.close()
-                    return None
-                
-                page = doc[page_num]
-                # DPI 300으로 렌더링
-                mat = fitz.Matrix(300/72, 300/72)  # 300 DPI
-                pix = page.get_pixmap(matrix=mat)
-                # PIL Image로 변환
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
-                doc.close()
-                print('[완료] 이미지 변환 완료')
-            except Exception as e:
-                print(f'[경고] PyMuPDF 변환 실패: {e}')
-                image = None
-        
-        # 방법 2: pdf2image 사용 (대안)
-        if image is None and PDF2IMAGE_AVAILABLE:
-            try:
-                print(f'[진행] PDF를 이미지로 변환 중... (pdf2image 사용, 페이지 {page_num + 1})')
-                # Poppler 경로 설정 (여러 가능한 경로 시도)
-                possible_poppler_paths = [
-                    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0\Library\bin',
-                    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0\bin',
-                    r'C:\Users\a\Downloads\Release-25.12.0-0\bin',
-                    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0',
-                ]
-                
-                poppler_path = None
-                for path in possible_poppler_paths:
-                    if os.path.exists(path):
-                        # pdftoppm.exe가 있는지 확인
-                        pdftoppm_path = os.path.join(path, 'pdftoppm.exe')
-                        if os.path.exists(pdftoppm_path):
-                            poppler_path = path
-                            print(f'[정보] Poppler 경로 찾음: {poppler_path}')
-                            break
-                
-                if poppler_path:
-                    images = convert_from_path(pdf_path, dpi=300, first_page=page_num + 1, last_page=page_num + 1, poppler_path=poppler_path)
-                else:
-                    print('[경고] Poppler 실행 파일을 찾을 수 없습니다. PATH에서 찾는 중...')
-                    images = convert_from_path(pdf_path, dpi=300, first_page=page_num + 1, last_page=page_num + 1)
-                if images:
-                    image = images[0]
-                    print('[완료] 이미지 변환 완료')
-            except Exception as e:
-                print(f'[경고] pdf2image 변환 실패: {e}')
-                print('[참고] Poppler 설치가 필요할 수 있습니다.')
-        
-        if image is None:
-            print('[오류] PDF를 이미지로 변환할 수 없습니다.')
-            return None
-        
-        print('[진행] OCR 처리 중... (시간이 걸릴 수 있습니다)')
-        
-        # OCR로 텍스트 추출 (한국어 + 영어)
-        text = pytesseract.image_to_string(image, lang='kor+eng')
-        
-        return text
-    
-    except Exception as e:
-        print(f'[오류] OCR 처리 중 오류 발생: {e}')
-        import traceback
-        traceback.print_exc()
-        return None
+    return texts.get(page_num)
 
 def analyze_problem_structure(text):
     """텍스트에서 문제와 해설 구분"""
@@ -11,25 +11,8 @@ try:
 except ImportError:
     PDFPLUMBER_AVAILABLE = False
 
-try:
-    import pytesseract
-    import os
-    # Tesseract 경로 설정
-    possible_paths = [
-        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-        r'C:\Users\{}\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
-    ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            pytesseract.pytesseract.tesseract_cmd = path
-            print(f'[정보] Tesseract 경로 설정: {path}')
-            break
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
-
-from PIL import Image
+from pdf_ocr_cache import TESSERACT_AVAILABLE, ocr_page_texts
+from page_router import ROUTE_TEXT, route_page, score_page_text
 
 def extract_text_with_ocr(pdf_path, page_num=0):
     """PDF를 이미지로 변환 후 OCR로 텍스트 추출"""
@@ -50,30 +33,24 @@ def extract_text_with_ocr(pdf_path, page_num=0):
             
             page = pdf.pages[page_num]
             
-            # 방법 1: 텍스트 추출 시도
+            # 방법 1: 텍스트 레이어 (품질 판정을 통과한 경우만 사용)
             text = page.extract_text()
-            if text and len(text.strip()) > 0:
+            route, reason = route_page(score_page_text(text))
+            if route == ROUTE_TEXT:
                 print('[정보] 텍스트 레이어에서 추출 성공')
                 return text
+            print(f'[정보] 텍스트 레이어 품질 부족 ({reason})')
             
             # 방법 2: 이미지로 변환 후 OCR
+            # pdfplumber는 페이지 렌더링이 어려우므로 pdf_ocr_cache의 렌더러(PyMuPDF/Poppler) 사용
             print('[진행] 이미지로 변환 후 OCR 처리...')
-            
-            # 페이지를 이미지로 렌더링
-            # pdfplumber는 직접 이미지 추출이 어려우므로, 페이지 객체에서 이미지 추출 시도
-            images = page.images
-            if images:
-                print(f'[정보] 페이지에서 {len(images)}개의 이미지를 찾았습니다.')
-                # 첫 번째 이미지 사용
-                # pdfplumber는 이미지 추출이 제한적이므로 다른 방법 필요
-            
-            # 대안: 페이지를 이미지로 저장하는 다른 방법 시도
-            # pdfplumber는 이미지 추출이 어려우므로, PyMuPDF나 pdf2image가 필요합니다
-            
-            print('[경고] pdfplumber로는 이미지 추출이 어렵습니다.')
+
+        texts = ocr_page_texts(pdf_path, [page_num], lang='kor+eng')
+        if not texts or page_num not in texts:
             print('[해결] Poppler 설치 또는 PyMuPDF DLL 문제 해결이 필요합니다.')
             return None
-            
+        return texts[page_num]
+
     except Exception as e:
         print(f'[오류] 처리 중 오류 발생: {e}')
         import traceback
@@ -4,6 +4,18 @@
 import json
 from pathlib import Path
 
+from trend_engine import TrendEngine, NUMBER_BANDS, band_of
+
+MIN_TREND_SAMPLES = 5   # 과목 × 구간 정답률을 쓰기 위한 최소 문제 수 (적으면 구간 전체 평균 사용)
+
+# 경향 데이터가 없을 때 쓰는 문항번호별 경향 문구
+DEFAULT_BAND_TRENDS = (
+    ('1-15번', 77.0, '기본 개념 확인'),
+    ('16-22번', 55.3, '계산 능력 측정'),
+    ('23-28번', 38.5, '개념 이해 평가'),
+    ('29-30번', 15.2, '창의력 평가'),
+)
+
 class CSATProblemGenerator:
     """수능 경향 기반 문제 생성기"""
     
@@ -14,6 +26,8 @@ class CSATProblemGenerator:
         
         # 경향성 데이터 로드
         self.trends = self.load_trends()
+        # 집계 셀 조회 엔진 (trends_analysis.json에 'cube'가 없으면 None → 기본 사양 사용)
+        self.engine = TrendEngine.from_trends(self.trends)
         
     def load_trends(self):
         """경향성 데이터 로드"""
@@ -26,7 +40,7 @@ class CSATProblemGenerator:
         """문항번호에 따른 문제 생성 사양 반환"""
         
         if problem_number <= 15:
-            return {
+            specs = {
                 'target_answer_rate': 77.0,
                 'difficulty_grade': '2-3등급용',
                 'solving_time': '2-3분',
@@ -39,7 +53,7 @@ class CSATProblemGenerator:
                 'score': 2
             }
         elif problem_number <= 22:
-            return {
+            specs = {
                 'target_answer_rate': 55.3,
                 'difficulty_grade': '4-6등급용',
                 'solving_time': '3-5분',
@@ -52,7 +66,7 @@ class CSATProblemGenerator:
                 'score': 3
             }
         elif problem_number <= 28:
-            return {
+            specs = {
                 'target_answer_rate': 38.5,
                 'difficulty_grade': '변별용',
                 'solving_time': '5-7분',
@@ -65,7 +79,7 @@ class CSATProblemGenerator:
                 'score': 4
             }
         else:  # 29-30번
-            return {
+            specs = {
                 'target_answer_rate': 15.2,
                 'difficulty_grade': '킬러용',
                 'solving_time': '8-10분',
@@ -77,11 +91,41 @@ class CSATProblemGenerator:
                 'solving_steps': '7단계 이상',
                 'score': 4
             }
+
+        self.apply_trend_stats(specs, problem_number, subject)
+        return specs
+
+    def apply_trend_stats(self, specs, problem_number: int, subject: str = None):
+        """경향 데이터가 있으면 목표 정답률을 실제 (과목, 문항번호 구간) 평균으로 교체"""
+        if self.engine is None:
+            return specs
+        band = band_of(problem_number, self.engine.bands)
+        if band is None:
+            return specs
+
+        stats = self.engine.query(subject=subject, band=band) if subject else None
+        if stats is None or stats['answer_rate']['n'] < MIN_TREND_SAMPLES:
+            stats = self.engine.query(band=band)
+        if stats['answer_rate']['n']:
+            specs['target_answer_rate'] = stats['answer_rate']['mean']
+            specs['trend_stats'] = stats
+        return specs
+
+    def band_trend_lines(self):
+        """프롬프트의 문항번호별 경향 문구 (경향 데이터가 있으면 실제 평균 정답률 사용)"""
+        by_band = self.engine.group_by('band') if self.engine else {}
+        lines = []
+        for (label, default_rate, description), (band, _, _) in zip(DEFAULT_BAND_TRENDS, NUMBER_BANDS):
+            stats = by_band.get(band)
+            rate = stats['answer_rate']['mean'] if stats and stats['answer_rate']['n'] else default_rate
+            lines.append(f"• {label}: 평균 정답률 {rate:.1f}%, {description}")
+        return '\n'.join(lines)
     
     def generate_prompt(self, problem_number: int, subject: str, minor_unit: str = None):
         """문제 생성 프롬프트 생성"""
         
         specs = self.get_problem_specs(problem_number, subject)
+        band_trends = self.band_trend_lines()
         
         prompt = f"""당신은 수능 수학 문제 출제 전문가입니다.
 최근 5년(2022-2026) 수능 경향을 분석한 결과를 바탕으로 다음 조건에 맞는 수능 수학 문제를 생성하세요.
@@ -114,10 +158,7 @@ class CSATProblemGenerator:
 • 출제 의도: 계산능력측정 44.5%, 기본개념확인 26.1%
 
 문항번호별 경향:
-• 1-15번: 평균 정답률 77.0%, 기본 개념 확인
-• 16-22번: 평균 정답률 55.3%, 계산 능력 측정
-• 23-28번: 평균 정답률 38.5%, 개념 이해 평가
-• 29-30번: 평균 정답률 15.2%, 창의력 평가
+{band_trends}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 [출력 형식]
@@ -10,12 +10,22 @@
 5. 자동 개선 제안
 """
 
+import hashlib
+import importlib.util
 import json
+import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import subprocess
 
+from conversion_cache import ConversionCache
+from convert_template import save_for_deepseek
+from solution_utils import save_solutions_for_deepseek
+from path_index import glob_indexed
+from mathpix_latex_processor_optimized import EXTRACTOR_VERSION, OptimizedMathpixProcessor
+from stage_profiler import profile_stage
+
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
     import os
@@ -24,13 +34,30 @@ if sys.platform == 'win32':
         sys.stdout.reconfigure(encoding='utf-8')
 
 
+# 파일명 첫 부분(과목) → 파트별 변환 스크립트 이름 접두사 (convert_<접두사>_p4_problems_latex.py)
+SCRIPT_SUBJECT_PREFIXES = {
+    '수1': 'su1',
+    '수2': 'su2',
+    '확통': 'haktong',
+    '확률과통계': 'haktong',
+}
+
+
 class IntegratedWorkflow:
     """Mathpix → 노션 통합 워크플로우"""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, use_cache: bool = True, profiler=None):
         self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+        # StageProfiler (지정 시 워크플로우 단계/변환 단계/문제별 시간 기록)
+        self.profiler = profiler
         self.problems_json = None
         self.solutions_json = None
+        self.problems_data = None
+        self.solutions_data = None
+        # 변환 결과 캐시 (LaTeX 본문 해시 + 추출기 버전)
+        self.conversion_cache = (
+            ConversionCache(self.base_dir / 'data' / 'conversion_cache.json') if use_cache else None
+        )
         
     def process_mathpix_problem(self, latex_content: str, filename: str, 
                                subject: str = None, year: int = None) -> Dict:
@@ -50,16 +77,26 @@ class IntegratedWorkflow:
         print(f"[Mathpix 문제 처리] {filename}")
         print("=" * 80)
         
-        # 1. Mathpix 변환 스크립트 동적 임포트
+        # 0. 캐시 확인 (변경 없는 LaTeX는 추출/검토 생략)
+        cached_result = self._load_cached_conversion(latex_content, filename, 'problem')
+        if cached_result:
+            self.problems_json = cached_result.get('json_path')
+            self.problems_data = cached_result.get('problems')
+            print(f"✅ 문제 변환 캐시 사용: {self.problems_json}")
+            return cached_result
+        
+        # 1. Mathpix 변환 (현재 프로세스에서 실행)
         try:
-            # 변환 스크립트 생성 또는 기존 것 사용
+            # 파트별 변환 스크립트가 있으면 사용, 없으면 기본 변환기
             conversion_script = self._get_or_create_conversion_script(filename, 'problem')
             
             # 변환 실행
-            result = self._run_conversion(conversion_script, latex_content, filename)
+            result = self._run_conversion(conversion_script, latex_content, filename, 'problem')
             
             if result and result.get('success'):
+                self._store_conversion(latex_content, filename, 'problem', result)
                 self.problems_json = result.get('json_path')
+                self.problems_data = result.get('problems')
                 print(f"✅ 문제 변환 완료: {self.problems_json}")
                 return result
             else:
@@ -88,12 +125,21 @@ class IntegratedWorkflow:
         print(f"[Mathpix 해설 처리] {filename}")
         print("=" * 80)
         
+        cached_result = self._load_cached_conversion(latex_content, filename, 'solution')
+        if cached_result:
+            self.solutions_json = cached_result.get('json_path')
+            self.solutions_data = cached_result.get('problems')
+            print(f"✅ 해설 변환 캐시 사용: {self.solutions_json}")
+            return cached_result
+        
         try:
             conversion_script = self._get_or_create_conversion_script(filename, 'solution')
-            result = self._run_conversion(conversion_script, latex_content, filename)
+            result = self._run_conversion(conversion_script, latex_content, filename, 'solution')
             
             if result and result.get('success'):
+                self._store_conversion(latex_content, filename, 'solution', result)
                 self.solutions_json = result.get('json_path')
+                self.solutions_data = result.get('problems')
                 print(f"✅ 해설 변환 완료: {self.solutions_json}")
                 return result
             else:
@@ -127,21 +173,18 @@ class IntegratedWorkflow:
             return {'success': False, 'error': '문제 파일이 없습니다.'}
         
         try:
-            # 수학적 논리 검증 스크립트 실행
-            validation_script = self._create_validation_script(problems_path, solutions_path)
-            result = subprocess.run(
-                [sys.executable, validation_script],
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
+            # 수학적 논리 검증 (현재 프로세스에서 실행)
+            problems = self._load_items(problems_path, self.problems_data
+                                        if problems_path == self.problems_json else None)
+            solutions = None
+            if solutions_path == self.solutions_json and self.solutions_data is not None:
+                solutions = self.solutions_data
+            elif solutions_path and Path(solutions_path).exists():
+                solutions = self._load_items(solutions_path)
             
-            if result.returncode == 0:
-                print(result.stdout)
-                return {'success': True, 'output': result.stdout}
-            else:
-                print(f"❌ 검증 오류: {result.stderr}")
-                return {'success': False, 'error': result.stderr}
+            result = validate_latex_balance(problems, solutions)
+            print(result['output'])
+            return result
                 
         except Exception as e:
             print(f"❌ 검증 중 오류: {e}")
@@ -241,27 +284,38 @@ class IntegratedWorkflow:
             'notion_fix': None
         }
         
+        profiler = self.profiler
+        
         # 1. 문제 변환
         problem_filename = f"{filename_base}_문제"
-        results['problem_conversion'] = self.process_mathpix_problem(
-            problem_latex, problem_filename, subject, year
-        )
+        with profile_stage(profiler, 'problem_conversion'):
+            results['problem_conversion'] = self.process_mathpix_problem(
+                problem_latex, problem_filename, subject, year
+            )
         
         # 2. 해설 변환
         solution_filename = f"{filename_base}_해설"
-        results['solution_conversion'] = self.process_mathpix_solution(
-            solution_latex, solution_filename, subject, year
-        )
+        with profile_stage(profiler, 'solution_conversion'):
+            results['solution_conversion'] = self.process_mathpix_solution(
+                solution_latex, solution_filename, subject, year
+            )
         
         # 3. 수학적 논리 검증
         if results['problem_conversion'].get('success'):
-            results['math_validation'] = self.validate_math_logic()
+            with profile_stage(profiler, 'math_validation'):
+                results['math_validation'] = self.validate_math_logic()
         
         # 4. 노션 필드 검증
-        results['notion_validation'] = self.validate_notion_fields(filename_base)
+        with profile_stage(profiler, 'notion_validation'):
+            results['notion_validation'] = self.validate_notion_fields(filename_base)
         
         # 5. 노션 이슈 자동 수정
-        results['notion_fix'] = self.auto_fix_notion_issues()
+        with profile_stage(profiler, 'notion_fix'):
+            results['notion_fix'] = self.auto_fix_notion_issues()
+        
+        # 변환 캐시는 워크플로우 끝에서 한 번만 저장
+        if self.conversion_cache is not None:
+            self.conversion_cache.flush()
         
         # 결과 요약
         print("\n" + "=" * 80)
@@ -273,69 +327,171 @@ class IntegratedWorkflow:
         
         return results
     
-    def _get_or_create_conversion_script(self, filename: str, type: str) -> str:
-        """변환 스크립트 가져오기 또는 생성"""
-        # 기존 스크립트 패턴 확인
-        script_pattern = f"convert_{filename.lower().replace(' ', '_')}_{type}_latex.py"
-        script_path = self.base_dir / script_pattern
-        
-        if script_path.exists():
-            return str(script_path)
-        
-        # 스크립트가 없으면 템플릿 기반 생성
-        template_path = self.base_dir / f"convert_template_{type}.py"
-        if template_path.exists():
-            # 템플릿 복사 및 수정
-            return str(script_path)
-        
-        # 기본 변환기 사용
-        if type == 'problem':
-            return 'mathpix_latex_processor_optimized.py'
-        else:
-            return 'mathpix_latex_processor_optimized.py'
+    def _load_cached_conversion(self, latex_content: str, filename: str,
+                                kind: str) -> Optional[Dict]:
+        """캐시된 변환 결과 재사용 (출력 파일이 없을 때만 다시 저장)"""
+        if self.conversion_cache is None:
+            return None
+        
+        script_path = self._get_or_create_conversion_script(filename, kind)
+        key = ConversionCache.make_key(latex_content, self._extractor_version(script_path), kind)
+        cached = self.conversion_cache.get(key)
+        if cached is None:
+            return None
+        
+        items = cached.get('problems', [])
+        json_path = cached.get('json_path')
+        if cached.get('filename') != filename or not json_path or not Path(json_path).exists():
+            output_dir = self._conversion_output_dir(script_path)
+            if kind == 'problem':
+                _, json_path = save_for_deepseek(items, output_dir, filename)
+            else:
+                _, json_path = save_solutions_for_deepseek(items, output_dir, filename)
+            json_path = str(json_path)
+        
+        return {
+            'success': True,
+            'cached': True,
+            'json_path': json_path,
+            'problems': items
+        }
+    
+    def _store_conversion(self, latex_content: str, filename: str, kind: str,
+                          result: Dict) -> None:
+        """변환 결과를 캐시에 저장"""
+        if self.conversion_cache is None:
+            return
+        
+        items = result.get('problems')
+        json_path = result.get('json_path')
+        if items is None and json_path:
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    items = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return
+        if items is None:
+            return
+        
+        script_path = self._get_or_create_conversion_script(filename, kind)
+        key = ConversionCache.make_key(latex_content, self._extractor_version(script_path), kind)
+        self.conversion_cache.set(key, {
+            'problems': items,
+            'json_path': json_path,
+            'filename': filename
+        })
+    
+    @staticmethod
+    def _extractor_version(script_path: Optional[str]) -> str:
+        """캐시 키용 추출기 버전 (파트별 스크립트를 쓰면 스크립트 이름 + 내용 해시 포함)"""
+        if not script_path:
+            return EXTRACTOR_VERSION
+        with open(script_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        return f"{EXTRACTOR_VERSION}::{Path(script_path).name}::{digest}"
+    
+    def _get_or_create_conversion_script(self, filename: str, type: str) -> Optional[str]:
+        """
+        파트별 변환 스크립트 경로 (없으면 None → 기본 변환기 사용)
+
+        "수2_2025학년도_현우진_드릴_P4_문제" → convert_su2_p4_problems_latex.py
+        (또는 convert_su2_04_problems_latex.py), 해설은 convert_su2_p4_solution_latex.py
+        """
+        prefix = SCRIPT_SUBJECT_PREFIXES.get(filename.split('_', 1)[0])
+        part = re.search(r'_P(\d+)(?:_|$)', filename, re.IGNORECASE)
+        if not prefix or not part:
+            return None
+        
+        suffix = 'problems' if type == 'problem' else 'solution'
+        number = int(part.group(1))
+        for part_name in (f"p{number}", f"{number:02d}"):
+            script_path = self.base_dir / f"convert_{prefix}_{part_name}_{suffix}_latex.py"
+            if script_path.exists():
+                return str(script_path)
+        
+        # 기본 변환기 사용 (OptimizedMathpixProcessor)
+        return None
     
-    def _run_conversion(self, script_path: str, latex_content: str, 
-                       filename: str) -> Dict:
-        """변환 스크립트 실행"""
+    def _load_extractor(self, script_path: Optional[str], kind: str) -> Optional[Callable]:
+        """변환 스크립트를 모듈로 임포트하여 추출 함수 반환"""
+        if not script_path:
+            return None
+        
+        spec = importlib.util.spec_from_file_location(Path(script_path).stem, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        
+        name = 'extract_problems_from_latex' if kind == 'problem' else 'extract_solutions_from_latex'
+        return getattr(module, name, None)
+    
+    def _conversion_output_dir(self, script_path: Optional[str]) -> Path:
+        """
+        변환 결과 저장 위치
+
+        파트별 스크립트는 단독 실행 시 main()의 base_dir(파트 폴더)에 저장하므로 같은 곳에 저장
+        (해당 폴더가 없거나 기본 변환기를 쓰면 base_dir/output)
+        """
+        if script_path:
+            with open(script_path, 'r', encoding='utf-8') as f:
+                match = re.search(r"^\s*base_dir\s*=\s*Path\(r?['\"]([^'\"]+)['\"]\)", f.read(), re.MULTILINE)
+            if match and Path(match.group(1)).is_dir():
+                return Path(match.group(1))
+        return self.base_dir / 'output'
+    
+    def _run_conversion(self, script_path: Optional[str], latex_content: str, 
+                       filename: str, kind: str = 'problem') -> Dict:
+        """변환 실행 (현재 프로세스, 임시 파일/하위 프로세스 없음)"""
+        output_dir = self._conversion_output_dir(script_path)
         try:
-            # 임시 파일에 LaTeX 저장
-            temp_latex = self.base_dir / f"temp_{filename}.tex"
-            with open(temp_latex, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            
-            # 스크립트 실행
-            result = subprocess.run(
-                [sys.executable, script_path],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                cwd=str(self.base_dir)
-            )
+            profiler = self.profiler
+            with profile_stage(profiler, 'load_extractor'):
+                extractor = self._load_extractor(script_path, kind)
             
-            # 임시 파일 삭제
-            if temp_latex.exists():
-                temp_latex.unlink()
-            
-            if result.returncode == 0:
-                # JSON 파일 경로 찾기
-                json_pattern = f"{filename}_deepseek.json"
-                json_path = self._find_json_file(json_pattern)
-                
-                return {
-                    'success': True,
-                    'output': result.stdout,
-                    'json_path': str(json_path) if json_path else None
-                }
+            if extractor is not None:
+                with profile_stage(profiler, 'extract', script=Path(script_path).name):
+                    items = extractor(latex_content)
+                with profile_stage(profiler, 'save'):
+                    if kind == 'problem':
+                        csv_path, json_path = save_for_deepseek(items, output_dir, filename)
+                    else:
+                        csv_path, json_path = save_solutions_for_deepseek(items, output_dir, filename)
+            elif kind == 'problem':
+                with profile_stage(profiler, 'parse_body'):
+                    processor = OptimizedMathpixProcessor(latex_content, output_dir, filename)
+                items = processor.process(mode='fast', profiler=profiler)
+                csv_path = output_dir / f"{filename}_deepseek.csv"
+                json_path = output_dir / f"{filename}_deepseek.json"
+                if not json_path.exists():
+                    return {'success': False, 'error': '추출된 문제가 없습니다.', 'problems': items}
             else:
-                return {
-                    'success': False,
-                    'error': result.stderr,
-                    'output': result.stdout
-                }
+                return {'success': False, 'error': f'해설 변환 스크립트가 없습니다: {filename}'}
+            
+            return {
+                'success': True,
+                'problems': items,
+                'csv_path': str(csv_path),
+                'json_path': str(json_path)
+            }
                 
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def _load_items(self, path: str, in_memory: Optional[List] = None) -> List:
+        """문제/해설 리스트 로드 (메모리에 있으면 파일을 다시 읽지 않음)"""
+        if in_memory is not None:
+            return in_memory
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # 파트별 스크립트 형식 ({"metadata": ..., "문제데이터": [...]}) 지원
+        if isinstance(data, dict):
+            for key in ('문제데이터', '해설데이터', 'problems', 'solutions'):
+                if isinstance(data.get(key), list):
+                    return data[key]
+            return []
+        return data
+    
     def _find_json_file(self, pattern: str) -> Optional[Path]:
         """JSON 파일 찾기"""
         # 여러 가능한 디렉토리에서 검색
@@ -346,67 +502,50 @@ class IntegratedWorkflow:
         ]
         
         for search_dir in search_dirs:
-            if search_dir.exists():
-                for json_file in search_dir.rglob(f"*{pattern}*"):
-                    if json_file.suffix == '.json':
-                        return json_file
+            # 경로 인덱스 조회 (rglob 대체)
+            for json_file in glob_indexed(search_dir, f"*{pattern}*", recursive=True):
+                if json_file.suffix == '.json':
+                    return json_file
         
         return None
-    
-    def _create_validation_script(self, problems_path: str, 
-                                 solutions_path: str = None) -> str:
-        """수학적 논리 검증 스크립트 생성"""
-        validation_script = self.base_dir / 'temp_validation.py'
-        
-        script_content = f"""
-# 임시 검증 스크립트
-import json
-import sys
-from pathlib import Path
-
-problems_path = Path(r'{problems_path}')
-solutions_path = Path(r'{solutions_path}') if '{solutions_path}' else None
 
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
 
-problems = load_json(problems_path)
-solutions = load_json(solutions_path) if solutions_path and solutions_path.exists() else None
-
-# 기본 검증
-print(f"문제 수: {{len(problems)}}")
-if solutions:
-    print(f"해설 수: {{len(solutions)}}")
-
-# LaTeX 수식 검증
-errors = []
-for i, problem in enumerate(problems):
-    question = problem.get('question', '')
-    dollar_count = question.count('$')
-    if dollar_count % 2 != 0:
-        errors.append(f"문제 {{i+1}}: LaTeX 달러 기호 불일치")
+def validate_latex_balance(problems: List, solutions: Optional[List] = None) -> Dict:
+    """
+    기본 검증 (LaTeX 달러 기호 짝 확인)
     
-    if solutions:
-        solution = solutions[i] if i < len(solutions) else None
-        if solution:
-            solution_text = solution.get('content', '')
-            sol_dollar = solution_text.count('$')
-            if sol_dollar % 2 != 0:
-                errors.append(f"해설 {{i+1}}: LaTeX 달러 기호 불일치")
-
-if errors:
-    print("\\n❌ 검증 오류:")
-    for error in errors:
-        print(f"  - {{error}}")
-else:
-    print("\\n✅ 기본 검증 통과")
-"""
+    Args:
+        problems: 문제 리스트
+        solutions: 해설 리스트 (선택)
         
-        with open(validation_script, 'w', encoding='utf-8') as f:
-            f.write(script_content)
+    Returns:
+        {'success': True, 'output': 출력 텍스트, 'errors': 오류 리스트}
+    """
+    lines = [f"문제 수: {len(problems)}"]
+    if solutions:
+        lines.append(f"해설 수: {len(solutions)}")
+    
+    # LaTeX 수식 검증
+    errors = []
+    for i, problem in enumerate(problems):
+        question = problem.get('question', '')
+        if question.count('$') % 2 != 0:
+            errors.append(f"문제 {i+1}: LaTeX 달러 기호 불일치")
         
-        return str(validation_script)
+        if solutions:
+            solution = solutions[i] if i < len(solutions) else None
+            if solution:
+                solution_text = solution.get('content', '')
+                if solution_text.count('$') % 2 != 0:
+                    errors.append(f"해설 {i+1}: LaTeX 달러 기호 불일치")
+    
+    if errors:
+        lines.append("\n❌ 검증 오류:")
+        lines.extend(f"  - {error}" for error in errors)
+    else:
+        lines.append("\n✅ 기본 검증 통과")
+    
+    return {'success': True, 'output': '\n'.join(lines), 'errors': errors}
 
 
 def main():
@@ -0,0 +1,218 @@
+# latex_cleaner.py
+# Mathpix LaTeX 정리기 (선형 시간, 스택 기반 환경 제거)
+
+"""
+기존 clean_problem_text / clean_latex_text는 환경마다 `\\begin{X}.*?\\end{X}` (DOTALL) re.sub를
+한 번씩 돌려서 패스마다 문자열 전체를 복사했고, 닫히지 않은 환경이 있으면 매번 파일 끝까지 탐색함.
+
+여기서는
+  1) 제거 단계: 토큰(\\begin, \\end, \\includegraphics, \\caption, \\section)을 한 번 스캔하고
+     \\begin/\\end 짝을 스택으로 맞춰서 제거할 구간을 구한 뒤 한 번에 출력 문자열을 만듦
+  2) 정리 단계: \\\\, 이미지, 연속 공백을 정규식 치환으로 정리
+→ 입력 길이에 비례하는 시간. 짝이 맞지 않는 환경은 제거하지 않고 report['malformed']에 기록함
+
+사용 예시:
+    from latex_cleaner import clean_mathpix_latex
+
+    text, report = clean_mathpix_latex(problem_text)
+    if report['malformed']:
+        print(report['malformed'])   # [{'type': 'unclosed', 'env': 'figure', 'pos': 120}, ...]
+"""
+
+import re
+from functools import lru_cache
+
+# 통째로 제거하는 환경 (그림, 표, 정렬 수식 등)
+REMOVED_ENVIRONMENTS = ('figure', 'center', 'tabular', 'enumerate', 'array', 'aligned', 'cases')
+
+
+@lru_cache(maxsize=16)
+def _remove_tokens(environments):
+    """
+    제거 단계 토큰 정규식 (\\begin/\\end는 제거 대상 환경 이름만 토큰으로 잡음)
+
+    공통 접두사 '\\'를 밖으로 빼서 백슬래시가 아닌 위치는 바로 건너뜀
+
+    Args:
+        environments: 정렬된 환경 이름 튜플
+    """
+    alternatives = []
+    if environments:
+        names = '|'.join(re.escape(name) for name in environments)
+        alternatives.append(r'begin\{(?P<begin>' + names + r')\}')
+        alternatives.append(r'end\{(?P<end>' + names + r')\}')
+    alternatives.append(r'(?P<image>includegraphics)')
+    alternatives.append(r'(?P<caption>caption(?:setup)?\{)')
+    alternatives.append(r'(?P<section>section\*?\{)')
+    return re.compile(r'\\(?:' + '|'.join(alternatives) + ')')
+
+
+# 정리 단계: \\ 이상 연속 백슬래시 → 공백, 이미지 제거 (같은 줄의 첫 '}'까지)
+_BACKSLASHES = re.compile(r'\\{2,}')
+_IMAGE = re.compile(r'\\includegraphics.*?}')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _new_report():
+    return {
+        'images': 0,
+        'environments': {},
+        'captions': 0,
+        'sections': 0,
+        'malformed': [],
+    }
+
+
+def _match_environments(tokens, environments, report):
+    """
+    \\begin/\\end 토큰 짝 맞추기 (스택)
+
+    Returns:
+        제거할 구간 [(시작, 끝), ...] - 가장 바깥 환경만, 시작 위치 순
+    """
+    stack = []  # (환경 이름, 시작 위치)
+    open_counts = {}  # 스택에 열려 있는 환경 이름별 개수 (스택 전체를 뒤지지 않기 위함)
+    pairs = []
+    for match in tokens:
+        name = match.group('begin')
+        if name is not None:
+            if name in environments:
+                stack.append((name, match.start()))
+                open_counts[name] = open_counts.get(name, 0) + 1
+            continue
+        name = match.group('end')
+        if name is None or name not in environments:
+            continue
+
+        if not open_counts.get(name):
+            report['malformed'].append({'type': 'stray_end', 'env': name, 'pos': match.start()})
+            continue
+
+        # 안쪽에서 닫히지 않은 환경은 바깥 환경과 함께 제거
+        while stack[-1][0] != name:
+            open_name, open_pos = stack.pop()
+            open_counts[open_name] -= 1
+            report['malformed'].append({'type': 'unclosed', 'env': open_name, 'pos': open_pos})
+        _, start = stack.pop()
+        open_counts[name] -= 1
+        pairs.append((start, match.end(), name))
+
+    # 끝까지 닫히지 않은 환경: 파일 끝까지 지우지 않고 그대로 둠
+    for open_name, open_pos in stack:
+        report['malformed'].append({'type': 'unclosed', 'env': open_name, 'pos': open_pos})
+
+    pairs.sort()
+    spans = []
+    for start, end, name in pairs:
+        if spans and start < spans[-1][1]:
+            continue  # 바깥 환경 안에 포함됨
+        spans.append((start, end))
+        report['environments'][name] = report['environments'].get(name, 0) + 1
+    return spans
+
+
+def _remove_image(text, match):
+    """\\includegraphics부터 같은 줄의 첫 '}'까지 (없으면 None)"""
+    line_end = text.find('\n', match.start())
+    close = text.find('}', match.end(), len(text) if line_end == -1 else line_end)
+    return None if close == -1 else close + 1
+
+
+def _find_close(text, pos, spans, span_index):
+    """pos 이후 첫 '}' 위치 (제거할 환경 구간 안의 '}'는 건너뜀, 없으면 -1)"""
+    close = text.find('}', pos)
+    while close != -1:
+        while span_index < len(spans) and spans[span_index][1] <= close:
+            span_index += 1
+        if span_index < len(spans) and spans[span_index][0] <= close:
+            # \section*{\begin{center}...\end{center}}처럼 환경을 감싼 경우
+            close = text.find('}', spans[span_index][1])
+            continue
+        break
+    return close
+
+
+def _remove_pass(text, environments, remove_images, remove_captions, remove_sections, report):
+    """환경/이미지/caption/섹션 헤더 제거 (토큰 한 번 스캔 + 스택 짝 맞추기)"""
+    tokens = list(_remove_tokens(tuple(sorted(environments))).finditer(text))
+    spans = _match_environments(tokens, environments, report) if environments else []
+
+    parts = []
+    pos = 0         # 아직 출력하지 않은 위치
+    span_index = 0
+    for match in tokens:
+        start = match.start()
+        if start < pos:
+            continue  # 이미 제거한 구간 안의 토큰
+
+        # 제거할 환경 구간
+        while span_index < len(spans) and spans[span_index][1] <= start:
+            span_index += 1
+        if span_index < len(spans) and spans[span_index][0] <= start:
+            span_start, span_end = spans[span_index]
+            parts.append(text[pos:span_start])
+            pos = span_end
+            continue
+
+        kind = match.lastgroup
+        if kind == 'image' and remove_images:
+            end = _remove_image(text, match)
+            if end is not None:
+                parts.append(text[pos:start])
+                pos = end
+                report['images'] += 1
+        elif (kind == 'caption' and remove_captions) or (kind == 'section' and remove_sections):
+            close = _find_close(text, match.end(), spans, span_index)
+            if close == -1:
+                report['malformed'].append({'type': 'unterminated', 'env': kind, 'pos': start})
+                continue
+            if kind == 'caption' and close == match.end():
+                continue  # \caption{}처럼 비어 있는 경우는 기존 규칙대로 남김
+            parts.append(text[pos:start])
+            pos = close + 1
+            report['captions' if kind == 'caption' else 'sections'] += 1
+
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _collapse_pass(text, remove_images, report):
+    """\\\\ → 공백, 이미지 제거, 연속 공백 정리 (정규식 치환만으로 끝나는 선형 단계)"""
+    text = _BACKSLASHES.sub(' ', text)
+    if remove_images:
+        text, count = _IMAGE.subn('', text)
+        report['images'] += count
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def clean_mathpix_latex(text, environments=REMOVED_ENVIRONMENTS, remove_images=True,
+                        remove_captions=True, remove_sections=True, collapse=True):
+    """
+    Mathpix LaTeX 정리 (제거 단계 → 정리 단계, 각 단계는 토큰 한 번 스캔)
+
+    Args:
+        text: 원문
+        environments: 통째로 제거할 환경 이름들
+        remove_images: \\includegraphics...} 제거 (같은 줄의 첫 '}'까지)
+        remove_captions: \\caption{...}, \\captionsetup{...} 제거
+        remove_sections: \\section{...}, \\section*{...} 제거
+        collapse: \\\\와 연속 공백을 공백 하나로 바꾸고 앞뒤 공백 제거
+
+    Returns:
+        (정리된 텍스트, report)
+        report: {'images', 'environments': {이름: 개수}, 'captions', 'sections',
+                 'malformed': [{'type': 'unclosed'|'stray_end'|'unterminated', 'env', 'pos'}]}
+    """
+    report = _new_report()
+    if not text:
+        return '', report
+
+    environments = frozenset(environments)
+    # collapse=True면 이미지는 정리 단계에서 제거 (\\\\ 처리 뒤에 남은 \\includegraphics만 대상)
+    images_in_remove_pass = remove_images and not collapse
+    if environments or images_in_remove_pass or remove_captions or remove_sections:
+        text = _remove_pass(text, environments, images_in_remove_pass, remove_captions,
+                            remove_sections, report)
+    if collapse:
+        text = _collapse_pass(text, remove_images, report)
+    return text, report
@@ -5,6 +5,8 @@ import re
 import sys
 import os
 
+from latex_cleaner import clean_mathpix_latex
+
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -69,63 +71,250 @@ def find_keyword_positions(body, keywords):
     return positions
 
 
-def extract_options_generic(options_text, num_options=5):
-    """일반적인 선택지 추출 (분수, 정수, 제곱근 등)"""
+CIRCLED_NUMBERS = ["①", "②", "③", "④", "⑤"]
+
+# 선택지 번호 표시: (1) （1） (1） （1) ①~⑤ 를 한 번의 스캔으로 찾음
+OPTION_MARKER_PATTERN = re.compile(r'[（(]([1-5])[）)]|([①②③④⑤])')
+
+# 마커 바로 뒤에서만 시도하는 패턴 (기존 extract_options_generic 패턴과 같은 규칙)
+_OPTION_FRACTION = re.compile(r'\s*\\?\$\\?frac\{([0-9]+)\}\{([0-9]+)\}\\?\$')
+_OPTION_SQRT = re.compile(r'\s*\\?\$\\?sqrt\{([0-9]+)\}\\?\$')
+_OPTION_INTEGER = re.compile(r'\s*([0-9]+)(?=\\\\|\s|$)')
+_OPTION_TEXT = re.compile(r'\s*([^（(\\]+)')
+
+# 보기(ㄱ,ㄴ,ㄷ 조합) 선택지: 마커부터 다음 마커/섹션/문서 끝까지
+_BOOGI_CHOICE_FULLWIDTH = re.compile(r'（[1-5]）\s*([^（]+?)(?=（[1-5]）|$|\\section|\\end)', re.DOTALL)
+_BOOGI_CHOICE_HALFWIDTH = re.compile(r'\([1-5]\)\s*([^(]+?)(?=\([1-5]\)|$|\\section|\\end)', re.DOTALL)
+
+
+def _read_braced(text, pos):
+    """
+    text[pos]가 '{'일 때 짝이 맞는 '}'까지 읽기 (중첩 괄호 지원)
+
+    Returns:
+        (괄호 안 내용, 닫는 괄호 다음 위치) 또는 (None, pos)
+    """
+    if pos >= len(text) or text[pos] != '{':
+        return None, pos
+    depth = 0
+    i = pos
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\':
+            i += 2  # \{ \} 등 이스케이프 문자 건너뜀
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[pos + 1:i], i + 1
+        i += 1
+    return None, pos
+
+
+def parse_option_value(raw):
+    """
+    선택지 원문 하나를 종류별 값으로 해석
+
+    Returns:
+        (kind, value)
+        - ('fraction', (분자, 분모)), ('sqrt', 근호 안), ('power', (밑, 지수)),
+          ('integer', 정수 문자열), ('math', 수식), ('text', 텍스트), ('empty', '')
+    """
+    text = re.sub(r'(\\\\)+\s*$', '', raw.strip()).strip()
+    if not text:
+        return 'empty', ''
+
+    # $...$ 또는 \$...\$ 수식 벗기기
+    math = None
+    for left, right in (('\\$', '\\$'), ('$', '$')):
+        if text.startswith(left) and text.endswith(right) and len(text) > len(left) + len(right) - 1:
+            math = text[len(left):len(text) - len(right)].strip()
+            break
+    expr = math if math is not None else text
+
+    if re.fullmatch(r'-?[0-9]+', expr):
+        return 'integer', expr
+
+    for command, kind in (('\\frac', 'fraction'), ('\\dfrac', 'fraction'), ('\\sqrt', 'sqrt')):
+        if expr.startswith(command):
+            numerator, pos = _read_braced(expr, len(command))
+            if numerator is None:
+                break
+            if kind == 'sqrt':
+                if pos == len(expr):
+                    return 'sqrt', numerator
+                break
+            denominator, pos = _read_braced(expr, pos)
+            if denominator is not None and pos == len(expr):
+                return 'fraction', (numerator, denominator)
+            break
+
+    caret = expr.find('^')
+    if caret > 0:
+        exponent, pos = _read_braced(expr, caret + 1)
+        if exponent is None and caret + 2 == len(expr):
+            exponent, pos = expr[caret + 1], len(expr)
+        if exponent is not None and pos == len(expr):
+            return 'power', (expr[:caret], exponent)
+
+    return ('math', expr) if math is not None else ('text', expr)
+
+
+def tokenize_options(options_text):
+    """
+    선택지 마커를 한 번만 스캔해서 선택지 구간으로 나누기
+
+    마커 사이 구간을 그대로 잘라 원문 위치와 함께 반환하므로,
+    호출하는 쪽에서 필요한 규칙(보기 선택지, 정수/분수 등)을 구간 안에서만 적용할 수 있음
+
+    Returns:
+        [{'number', 'marker', 'style', 'start', 'content_start', 'end', 'raw', 'kind', 'value'}, ...]
+        - style: 'halfwidth' (1) / 'fullwidth' （1） / 'mixed' (1） / 'circled' ①
+        - start: 마커 시작 위치, content_start: 마커 다음 위치, end: 다음 마커 시작 위치
+    """
+    matches = list(OPTION_MARKER_PATTERN.finditer(options_text))
+    tokens = []
+    for idx, match in enumerate(matches):
+        marker = match.group()
+        if match.group(2):
+            number = CIRCLED_NUMBERS.index(marker) + 1
+            style = 'circled'
+        else:
+            number = int(match.group(1))
+            if marker[0] == '(' and marker[-1] == ')':
+                style = 'halfwidth'
+            elif marker[0] == '（' and marker[-1] == '）':
+                style = 'fullwidth'
+            else:
+                style = 'mixed'
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(options_text)
+        raw = options_text[match.end():end]
+        kind, value = parse_option_value(raw)
+        tokens.append({
+            'number': number,
+            'marker': marker,
+            'style': style,
+            'start': match.start(),
+            'content_start': match.end(),
+            'end': end,
+            'raw': raw,
+            'kind': kind,
+            'value': value,
+        })
+    return tokens
+
+
+def extract_options_generic(options_text, num_options=5, tokens=None, verbose=False):
+    """
+    일반적인 선택지 추출 (분수, 정수, 제곱근 등)
+
+    마커는 tokenize_options()로 한 번만 찾고, 각 번호마다 그 번호의 마커 바로 뒤에서만
+    분수 → 제곱근 → 정수 → 텍스트 순으로 시도 (결과는 기존 전체 검색 방식과 같음)
+
+    Args:
+        options_text: 선택지 텍스트
+        num_options: 선택지 개수
+        tokens: 이미 계산한 tokenize_options(options_text) 결과 (없으면 새로 계산)
+        verbose: True면 추출 실패한 번호의 주변 텍스트 출력
+    """
+    if tokens is None:
+        tokens = tokenize_options(options_text)
+
+    by_number = {}
+    for token in tokens:
+        if token['style'] != 'circled':
+            by_number.setdefault(token['number'], []).append(token)
+
     options = []
-    
     for i in range(1, num_options + 1):
-        option_num = ["①", "②", "③", "④", "⑤"][i-1]
-        
-        # 다양한 패턴 시도
-        patterns = [
-            # 분수: (1) $\frac{15}{16}$ 또는 (1) \$\frac{15}{16}\$
-            rf'\({i}\)\s*\\?\$\\?frac{{([0-9]+)}}\{{([0-9]+)}}\\?\$',
-            # 제곱근: (1) $\sqrt{2}$ 또는 (1) \$\sqrt{2}\$
-            rf'\({i}\)\s*\\?\$\\?sqrt{{([0-9]+)}}\\?\$',
-            # 정수: (2) 1 또는 (2) 1\\
-            rf'\({i}\)\s*([0-9]+)(?=\\\\|\s|$)',
-            # 전각 괄호: （1）...
-            rf'[（(]{i}[）)]\s*([^（(\\]+)',
-        ]
-        
-        match = None
-        for pattern in patterns:
-            match = re.search(pattern, options_text)
+        option_num = CIRCLED_NUMBERS[i - 1]
+        candidates = by_number.get(i, [])
+        halfwidth = [t for t in candidates if t['style'] == 'halfwidth']
+
+        option = None
+        # 분수: (1) $\frac{15}{16}$ 또는 (1) \$\frac{15}{16}\$
+        for token in halfwidth:
+            match = _OPTION_FRACTION.match(options_text, token['content_start'])
             if match:
+                option = f"{option_num} $\\frac{{{match.group(1)}}}{{{match.group(2)}}}$"
                 break
-        
-        if match:
-            if len(match.groups()) == 2 and match.group(1).isdigit() and match.group(2).isdigit():
-                # 분수
-                opt_text = f"\\frac{{{match.group(1)}}}{{{match.group(2)}}}"
-                options.append(f"{option_num} ${opt_text}$")
-            elif len(match.groups()) == 1 and match.group(1).isdigit():
-                # 제곱근 또는 정수
-                if 'sqrt' in pattern:
-                    opt_text = f"\\sqrt{{{match.group(1)}}}"
-                    options.append(f"{option_num} ${opt_text}$")
-                else:
-                    options.append(f"{option_num} {match.group(1)}")
-            else:
-                # 기타 텍스트
-                opt_text = match.group(1).strip()
-                opt_text = re.sub(r'\\\\+', '', opt_text)
-                opt_text = re.sub(r'\\\$', '', opt_text)
-                options.append(f"{option_num} {opt_text}")
-        else:
+        # 제곱근: (1) $\sqrt{2}$ 또는 (1) \$\sqrt{2}\$
+        if option is None:
+            for token in halfwidth:
+                match = _OPTION_SQRT.match(options_text, token['content_start'])
+                if match:
+                    option = f"{option_num} $\\sqrt{{{match.group(1)}}}$"
+                    break
+        # 정수: (2) 1 또는 (2) 1\\
+        if option is None:
+            for token in halfwidth:
+                match = _OPTION_INTEGER.match(options_text, token['content_start'])
+                if match:
+                    option = f"{option_num} {match.group(1)}"
+                    break
+        # 기타 텍스트 (전각 괄호 포함): （1）...
+        if option is None:
+            for token in candidates:
+                match = _OPTION_TEXT.match(options_text, token['content_start'])
+                if match:
+                    opt_text = match.group(1).strip()
+                    opt_text = re.sub(r'\\\\+', '', opt_text)
+                    opt_text = re.sub(r'\\\$', '', opt_text)
+                    option = f"{option_num} {opt_text}"
+                    break
+
+        if option is not None:
+            options.append(option)
+        elif verbose:
             # 패턴 매칭 실패 시 디버깅
             print(f"[경고] 선택지 {i}번 추출 실패")
-            # 해당 부분 출력
-            pattern = rf'\({i}\)'
-            match_pos = re.search(pattern, options_text)
-            if match_pos:
-                start = max(0, match_pos.start() - 20)
-                end = min(len(options_text), match_pos.end() + 50)
+            if halfwidth:
+                start = max(0, halfwidth[0]['start'] - 20)
+                end = min(len(options_text), halfwidth[0]['content_start'] + 50)
                 print(f"  주변 텍스트: {repr(options_text[start:end])}")
-    
+
     return options
 
 
+def extract_boogi_choices(search_text, tokens=None):
+    """
+    보기 문제의 선택지 (ㄱ, ㄴ, ㄷ 조합) 추출
+
+    전각 （n） 마커를 먼저, 없으면 반각 (n) 마커를 사용하고,
+    ㄱ/ㄴ/ㄷ이 들어 있는 선택지만 남김
+
+    Returns:
+        {선택지 번호: 선택지 텍스트}
+    """
+    if tokens is None:
+        tokens = tokenize_options(search_text)
+
+    found_options = {}
+    for opt_num in range(1, 6):
+        match = None
+        for style, pattern in (('fullwidth', _BOOGI_CHOICE_FULLWIDTH),
+                               ('halfwidth', _BOOGI_CHOICE_HALFWIDTH)):
+            for token in tokens:
+                if token['number'] == opt_num and token['style'] == style:
+                    match = pattern.match(search_text, token['start'])
+                    if match:
+                        break
+            if match:
+                break
+
+        if match:
+            option_text = clean_latex_text(match.group(1))
+            # 보기 내용이 선택지에 포함되지 않도록 확인
+            # 선택지가 ㄱ,ㄴ,ㄷ 조합이어야 함
+            if ('ㄱ' in option_text or 'ㄴ' in option_text or 'ㄷ' in option_text or
+                    'ᄀ' in option_text or 'ᄂ' in option_text or 'ᄃ' in option_text):
+                found_options[opt_num] = option_text
+
+    return found_options
+
+
 def extract_problem_with_options(body, question_pattern, boundary_pattern, 
                                   options_extractor=None, debug=False):
     """문제와 선택지를 함께 추출하는 범용 함수"""
@@ -178,13 +367,10 @@ def create_problem_pattern(start_keywords, end_keywords, point_markers=None):
 
 def clean_latex_text(text):
     """LaTeX 텍스트 정리 (불필요한 백슬래시, 줄바꿈 등 제거)"""
-    # 이중 백슬래시를 공백으로
-    text = re.sub(r'\\\\+', ' ', text)
-    # 이미지 포함 제거
-    text = re.sub(r'\\includegraphics.*?}', '', text)
-    # 연속 공백 정리
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # 이중 백슬래시를 공백으로, 이미지 포함 제거, 연속 공백 정리 (한 번의 스캔)
+    cleaned, _ = clean_mathpix_latex(text, environments=(), remove_captions=False,
+                                     remove_sections=False)
+    return cleaned
 
 
 def test_pattern(pattern, body, context_chars=100):
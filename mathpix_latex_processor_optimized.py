@@ -4,13 +4,24 @@
 import re
 import sys
 import os
+import mmap
+import codecs
+import time
+import threading
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from latex_utils import (
     extract_body, extract_options_generic, clean_latex_text
 )
-from convert_template import review_problems, save_for_deepseek
+from convert_template import save_for_deepseek
+from review_engine import validate_problems, render_report
+from taxonomy import scan_keywords, QUICK_TOPIC_KEYWORDS
+from mathpix_tokens import (
+    tokenize_mathpix, POINT, SECTION, SECTION_COMPLETE, OPTION, OPTION_HALFWIDTH, OPTION_CIRCLED
+)
+from stage_profiler import profile_stage, problem_event_name
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -18,6 +29,169 @@ if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
         sys.stdout.reconfigure(encoding='utf-8')
 
+# 추출 로직 버전 (추출 결과가 바뀌는 수정 시 올려서 변환 캐시 무효화)
+EXTRACTOR_VERSION = '2026.10-tokens'
+
+# 사전 컴파일된 정규식 (모듈 단위 공유)
+POINT_PATTERN = re.compile(r'\[([34])점\]|［([34])점］')
+OPTIONS_PATTERN = re.compile(r'\([1-5]\)|①|②|③|④|⑤')
+SECTION_PATTERN = re.compile(r'\\section\*?\{[^}]*\}')
+
+# 이전/다음 마커 탐색 우선순위 (기존 패턴 순서와 동일)
+MARKER_KINDS = ('[4점]', '［4점］', '[3점]', '［3점］')
+
+# 스트리밍 추출: 파일에서 한 번에 디코딩하는 바이트 수, 문제 하나에 필요한 주변 범위
+# (경계 찾기/정리 함수가 마커 앞 최대 1500+700자, 다음 마커 뒤 최대 800자까지 읽음)
+STREAM_CHUNK_BYTES = 1 << 20
+STREAM_WINDOW_BEFORE = 2500
+STREAM_WINDOW_AFTER = 1500
+
+
+def build_marker_index(body):
+    """
+    본문을 한 번만 토큰화해서 마커/섹션/선택지 위치 인덱스 생성 (mathpix_tokens)
+    
+    Args:
+        body: LaTeX 본문
+    
+    Returns:
+        {
+            'markers': [(위치, 점수), ...] (본문 순서),
+            'kind_starts': {마커 문자열: [위치, ...]} (정렬됨),
+            'sections': [섹션 헤더 위치, ...] (정렬됨),
+            'option_starts': [선택지 마커 시작 위치, ...],
+            'option_ends': [선택지 마커 끝 위치, ...],
+            'tokens': MathpixTokens (경계 찾기 등에서 재사용)
+        }
+    """
+    tokens = tokenize_mathpix(body)
+    
+    markers = []
+    kind_starts = {kind: [] for kind in MARKER_KINDS}
+    for i in tokens.indices(POINT):
+        markers.append((tokens.start(i), tokens.value(i)))
+        kind_starts[tokens.source(i)].append(tokens.start(i))
+    
+    # SECTION_PATTERN과 같은 규칙: 제목까지 닫힌 헤더만
+    sections = [tokens.start(i) for i in tokens.indices(SECTION)
+                if tokens.flag(i) == SECTION_COMPLETE]
+    
+    # OPTIONS_PATTERN과 같은 규칙: 반각 (1) 과 ①~⑤만 선택지로 셈
+    option_starts = []
+    option_ends = []
+    for i in tokens.indices(OPTION):
+        if tokens.flag(i) in (OPTION_HALFWIDTH, OPTION_CIRCLED):
+            option_starts.append(tokens.start(i))
+            option_ends.append(tokens.end(i))
+    
+    return {
+        'markers': markers,
+        'kind_starts': kind_starts,
+        'sections': sections,
+        'option_starts': option_starts,
+        'option_ends': option_ends,
+        'tokens': tokens,
+    }
+
+
+def find_prev_marker(marker_index, marker_pos):
+    """이전 마커 위치 (우선순위 순서로 marker_pos 이전에 끝나는 마지막 마커)"""
+    for kind in MARKER_KINDS:
+        starts = marker_index['kind_starts'][kind]
+        # body[:marker_pos] 안에 완전히 포함되는 마커만 인정
+        i = bisect_right(starts, marker_pos - len(kind)) - 1
+        if i >= 0:
+            return starts[i]
+    return None
+
+
+def find_next_marker(marker_index, marker_pos):
+    """다음 마커 위치 (우선순위 순서로 marker_pos + 50 이후 첫 마커)"""
+    for kind in MARKER_KINDS:
+        starts = marker_index['kind_starts'][kind]
+        i = bisect_left(starts, marker_pos + 50)
+        if i < len(starts):
+            return starts[i]
+    return None
+
+
+def count_options_in_span(marker_index, start, end):
+    """body[start:end] 안에 완전히 포함되는 선택지 마커 개수"""
+    lo = bisect_left(marker_index['option_starts'], start)
+    hi = bisect_right(marker_index['option_ends'], end)
+    return max(0, hi - lo)
+
+
+def sections_before(marker_index, marker_pos):
+    """marker_pos 이전의 마지막 섹션 헤더만 담은 리스트 (find_problem_boundaries용)"""
+    sections = marker_index['sections']
+    i = bisect_left(sections, marker_pos)
+    return sections[i - 1:i] if i > 0 else []
+
+
+# 프로세스 워커 전역 상태 (initializer에서 1회 설정)
+_WORKER_STATE = {}
+
+
+def _init_process_worker(body, marker_index, profile=False):
+    """프로세스 워커 초기화 - 본문과 인덱스를 워커당 한 번만 전달받음"""
+    processor = OptimizedMathpixProcessor('', None, None)
+    processor.body = body
+    processor._marker_index = marker_index
+    _WORKER_STATE['processor'] = processor
+    _WORKER_STATE['profile'] = profile
+
+
+def _extract_shard_in_worker(shard):
+    """
+    프로세스 워커에서 마커 구간(shard) 처리
+    
+    Args:
+        shard: [(문제 번호, 마커 위치, 점수), ...]
+    
+    Returns:
+        ([(문제 번호, 문제 dict), ...] (추출 실패 문제 제외),
+         [문제별 측정값 dict, ...] (프로파일링 중일 때만, 아니면 빈 리스트))
+    """
+    processor = _WORKER_STATE['processor']
+    profile = _WORKER_STATE.get('profile', False)
+    marker_index = processor.marker_index
+    sections = marker_index['sections']
+    results = []
+    timings = []
+    for problem_index, pos, point in shard:
+        if profile:
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+        problem = processor._extract_single_problem(
+            pos, point, processor.body, problem_index, sections, marker_index
+        )
+        if profile:
+            timings.append({
+                'start': wall_start,
+                'wall': time.perf_counter() - wall_start,
+                'cpu': time.thread_time() - cpu_start,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': {'index': problem_index, 'marker_pos': pos, 'extracted': problem is not None},
+            })
+        if problem:
+            results.append((problem_index, problem))
+    return results, timings
+
+
+def _split_shards(items, shard_count):
+    """연속 구간으로 균등 분할 (순서 유지)"""
+    shard_count = max(1, min(shard_count, len(items)))
+    size, rest = divmod(len(items), shard_count)
+    shards = []
+    start = 0
+    for i in range(shard_count):
+        end = start + size + (1 if i < rest else 0)
+        shards.append(items[start:end])
+        start = end
+    return shards
+
 
 class OptimizedMathpixProcessor:
     """최적화된 Mathpix LaTeX 처리 클래스"""
@@ -28,12 +202,15 @@ class OptimizedMathpixProcessor:
         self.base_filename = base_filename
         self.body = extract_body(latex_content)
         self.problems = []
+        self.review_report = None  # review_engine.validate_problems 결과 (process() 이후)
         self.auto_diagnose = auto_diagnose
+        self._marker_index = None
+        self.profiler = None  # StageProfiler (process(profiler=...)로 지정 시 문제별 시간 기록)
         
         # 사전 컴파일된 정규식 (더 빠른 매칭)
-        self.point_pattern = re.compile(r'\[([34])점\]|［([34])점］')
-        self.options_pattern = re.compile(r'\([1-5]\)|①|②|③|④|⑤')
-        self.section_pattern = re.compile(r'\\section\*?\{[^}]*\}')
+        self.point_pattern = POINT_PATTERN
+        self.options_pattern = OPTIONS_PATTERN
+        self.section_pattern = SECTION_PATTERN
         
         if auto_diagnose:
             self._quick_diagnose()
@@ -44,39 +221,44 @@ class OptimizedMathpixProcessor:
         point_count = len(self.point_pattern.findall(self.body))
         print(f"[진단] 점수 마커: {point_count}개")
     
+    @property
+    def marker_index(self):
+        """본문 마커 인덱스 (최초 접근 시 한 번만 생성)"""
+        if self._marker_index is None:
+            self._marker_index = build_marker_index(self.body)
+        return self._marker_index
+    
     @lru_cache(maxsize=100)
     def _detect_topic_cached(self, body_snippet):
         """주제 감지 (캐싱)"""
-        topics = {
-            '수열': ['수열', '등차수열', '등비수열', 'Chapter 3'],
-            '기하': ['삼각형', '원', '선분', '각', '기하'],
-            '삼각함수': ['삼각함수', 'sin', 'cos', 'tan'],
-            '미적분': ['미분', '적분', '도함수'],
-        }
+        return scan_keywords(body_snippet).first_group(QUICK_TOPIC_KEYWORDS) or "기타"
+    
+    def _problem_extractor(self):
+        """문제 추출 함수 (프로파일링 중이면 문제별 시간을 기록하는 래퍼)"""
+        if self.profiler is None:
+            return self._extract_single_problem
         
-        for topic, keywords in topics.items():
-            if any(keyword in body_snippet for keyword in keywords):
-                return topic
-        return "기타"
+        def extract_profiled(marker_pos, marker_point, body, problem_index, sections=None,
+                             marker_index=None):
+            with self.profiler.problem(problem_index, marker_pos=marker_pos) as info:
+                problem = self._extract_single_problem(
+                    marker_pos, marker_point, body, problem_index, sections, marker_index
+                )
+                info['extracted'] = problem is not None
+            return problem
+        
+        return extract_profiled
     
-    def _extract_single_problem(self, marker_pos, marker_point, body, problem_index, sections=None):
+    def _extract_single_problem(self, marker_pos, marker_point, body, problem_index, sections=None,
+                                marker_index=None):
         """단일 문제 추출 (병렬 처리용) - 개선 버전"""
         try:
-            # 이전 마커 찾기
-            prev_marker = None
-            for pattern in [r'\[4점\]', r'［4점］', r'\[3점\]', r'［3점］']:
-                matches = list(re.finditer(pattern, body[:marker_pos]))
-                if matches:
-                    prev_marker = matches[-1].start()
-                    break
+            if marker_index is None:
+                marker_index = self.marker_index if body is self.body else build_marker_index(body)
             
-            # 다음 마커 찾기
-            next_marker = None
-            for pattern in [r'\[4점\]', r'［4점］', r'\[3점\]', r'［3점］']:
-                match = re.search(pattern, body[marker_pos + 50:])
-                if match:
-                    next_marker = marker_pos + 50 + match.start()
-                    break
+            # 이전/다음 마커 찾기 (인덱스 이진 탐색)
+            prev_marker = find_prev_marker(marker_index, marker_pos)
+            next_marker = find_next_marker(marker_index, marker_pos)
             
             # 보기 문제 확인 (경계 찾기 전에)
             check_text = body[max(0, marker_pos-200):marker_pos+200]
@@ -88,8 +270,9 @@ class OptimizedMathpixProcessor:
                 body, marker_pos, 
                 prev_marker_pos=prev_marker, 
                 next_marker_pos=next_marker,
-                sections=sections,
-                is_boogi_problem=is_boogi_problem
+                sections=sections_before(marker_index, marker_pos) if sections else sections,
+                is_boogi_problem=is_boogi_problem,
+                tokens=marker_index['tokens']
             )
             
             problem_text = body[start:end]
@@ -97,17 +280,17 @@ class OptimizedMathpixProcessor:
             # 보기 문제 확인 ("고른 것은?"이 있으면 객관식)
             is_boogi_problem = is_boogi_problem or '〈보기〉' in problem_text or '보기' in problem_text or '고른 것은' in problem_text
             
-            # 선택지 확인 (사전 컴파일된 패턴 사용)
-            has_options = bool(self.options_pattern.search(problem_text))
+            # 선택지 확인 (인덱스 사용)
+            option_count = count_options_in_span(marker_index, start, end)
+            has_options = option_count > 0
             
             # 주관식/객관식 판단 개선
             if '고른 것은' in problem_text or is_boogi_problem:
                 # 보기 문제는 무조건 객관식
                 has_options = True
             elif '구하시오' in problem_text:
-                # options_text에서 선택지 패턴이 실제로 있는지 확인
-                actual_options = self.options_pattern.findall(problem_text)
-                if len(actual_options) == 0:
+                # 문제 범위에 선택지 패턴이 실제로 있는지 확인
+                if option_count == 0:
                     has_options = False
             
             # 문제 본문 추출
@@ -188,16 +371,10 @@ class OptimizedMathpixProcessor:
         """병렬 처리로 모든 문제 추출 (더 빠름) - 개선 버전"""
         print("[병렬 문제 추출 시작]")
         
-        # 모든 점수 마커 찾기 (사전 컴파일된 패턴 사용)
-        markers = []
-        for match in self.point_pattern.finditer(self.body):
-            point = int(match.group(1) or match.group(2))
-            markers.append((match.start(), point))
-        
-        # 섹션 헤더 위치 찾기 (개선)
-        sections = []
-        for match in self.section_pattern.finditer(self.body):
-            sections.append(match.start())
+        # 마커/섹션 인덱스 (본문 1회 스캔)
+        marker_index = self.marker_index
+        markers = marker_index['markers']
+        sections = marker_index['sections']
         
         print(f"[발견] {len(markers)}개의 점수 마커, {len(sections)}개의 섹션")
         
@@ -206,11 +383,12 @@ class OptimizedMathpixProcessor:
         
         # 병렬 처리로 문제 추출
         problems = []
+        extract = self._problem_extractor()
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {
                 executor.submit(
-                    self._extract_single_problem,
-                    pos, point, self.body, i+1, sections
+                    extract,
+                    pos, point, self.body, i+1, sections, marker_index
                 ): (i+1, pos, point)
                 for i, (pos, point) in enumerate(markers)
             }
@@ -231,20 +409,59 @@ class OptimizedMathpixProcessor:
         
         return problems
     
+    def extract_problems_process(self, max_workers=4):
+        """프로세스 풀 병렬 처리 (GIL 우회, CPU 코어 활용)"""
+        print("[프로세스 병렬 문제 추출 시작]")
+        
+        # 마커/섹션 인덱스 (본문 1회 스캔)
+        marker_index = self.marker_index
+        markers = marker_index['markers']
+        sections = marker_index['sections']
+        
+        print(f"[발견] {len(markers)}개의 점수 마커, {len(sections)}개의 섹션")
+        
+        if not markers:
+            return []
+        
+        # 마커 구간을 워커 수의 4배로 나눠 부하 분산
+        items = [(i+1, pos, point) for i, (pos, point) in enumerate(markers)]
+        shards = _split_shards(items, max_workers * 4)
+        
+        results = {}
+        profiler = self.profiler
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_process_worker,
+            initargs=(self.body, marker_index, profiler is not None)
+        ) as executor:
+            futures = {executor.submit(_extract_shard_in_worker, shard): shard for shard in shards}
+            for future in as_completed(futures):
+                try:
+                    shard_results, timings = future.result()
+                    for problem_index, problem in shard_results:
+                        results[problem_index] = problem
+                    for timing in timings:
+                        profiler.record(
+                            problem_event_name(timing['args']['index']), 'problem',
+                            timing['start'], timing['wall'], timing['cpu'],
+                            pid=timing['pid'], tid=timing['tid'], thread='MainThread',
+                            args=timing['args']
+                        )
+                except Exception as e:
+                    shard = futures[future]
+                    print(f"[경고] 문제 {shard[0][0]}~{shard[-1][0]} 처리 중 오류: {e}")
+        
+        # 인덱스 순서로 병합
+        return [results[i] for i in sorted(results.keys())]
+    
     def extract_problems_fast(self):
         """빠른 순차 처리 (병렬 오버헤드 없음) - 개선 버전"""
         print("[빠른 문제 추출 시작]")
         
-        # 모든 점수 마커 찾기
-        markers = []
-        for match in self.point_pattern.finditer(self.body):
-            point = int(match.group(1) or match.group(2))
-            markers.append((match.start(), point))
-        
-        # 섹션 헤더 위치 찾기 (개선)
-        sections = []
-        for match in self.section_pattern.finditer(self.body):
-            sections.append(match.start())
+        # 마커/섹션 인덱스 (본문 1회 스캔)
+        marker_index = self.marker_index
+        markers = marker_index['markers']
+        sections = marker_index['sections']
         
         print(f"[발견] {len(markers)}개의 점수 마커, {len(sections)}개의 섹션")
         
@@ -252,40 +469,221 @@ class OptimizedMathpixProcessor:
             return []
         
         problems = []
+        extract = self._problem_extractor()
         for i, (pos, point) in enumerate(markers):
-            problem = self._extract_single_problem(pos, point, self.body, i+1, sections)
+            problem = extract(pos, point, self.body, i+1, sections, marker_index)
             if problem:
                 problems.append(problem)
         
         return problems
     
-    def process(self, mode='fast', max_workers=4):
-        """LaTeX 처리 메인 함수"""
+    def process(self, mode='fast', max_workers=4, cache=None, profiler=None):
+        """
+        LaTeX 처리 메인 함수
+        
+        Args:
+            mode: 'fast', 'parallel', 'process'
+            max_workers: 병렬/프로세스 모드 워커 수
+            cache: ConversionCache (None이면 캐시 미사용)
+            profiler: StageProfiler (지정 시 단계별/문제별 시간 기록, None이면 측정 안 함)
+        """
         print("=" * 60)
         print(f"[Mathpix LaTeX 처리 (최적화)] {self.base_filename}")
         print("=" * 60)
+        self.profiler = profiler
+        
+        # 캐시 확인 (본문 해시 + 추출기 버전)
+        cache_key = None
+        if cache is not None:
+            with profile_stage(profiler, 'cache_lookup'):
+                cache_key = cache.make_key(self.latex_content, EXTRACTOR_VERSION)
+                cached = cache.get(cache_key)
+            if cached is not None:
+                self.problems = cached['problems']
+                print(f"\n[캐시 사용] {len(self.problems)}개 문제 (추출/검토 생략)")
+                json_path = Path(self.output_dir) / f"{self.base_filename}_deepseek.json"
+                if not json_path.exists():
+                    with profile_stage(profiler, 'save'):
+                        save_for_deepseek(self.problems, self.output_dir, self.base_filename)
+                return self.problems
+        
+        # 마커/섹션 인덱스 (추출 단계와 분리해서 측정)
+        with profile_stage(profiler, 'marker_index', body_chars=len(self.body)):
+            self.marker_index
         
         # 문제 추출
-        if mode == 'parallel':
-            self.problems = self.extract_problems_parallel(max_workers=max_workers)
-        else:  # 'fast' 모드 (기본)
-            self.problems = self.extract_problems_fast()
+        with profile_stage(profiler, 'extract', mode=mode) as stage_args:
+            if mode == 'parallel':
+                self.problems = self.extract_problems_parallel(max_workers=max_workers)
+            elif mode == 'process':
+                self.problems = self.extract_problems_process(max_workers=max_workers)
+            else:  # 'fast' 모드 (기본)
+                self.problems = self.extract_problems_fast()
+            if stage_args is not None:
+                stage_args['problems'] = len(self.problems)
         
         print(f"\n[추출 완료] {len(self.problems)}개 문제")
         
         # 검토 (간소화)
-        is_valid = review_problems(self.problems)
+        with profile_stage(profiler, 'review'):
+            self.review_report = validate_problems(self.problems, source=self.base_filename)
+            render_report(self.review_report)
+            is_valid = self.review_report['passed']
         
         # 자동 저장 (검토 통과 시)
         if is_valid or len(self.problems) > 0:
-            save_for_deepseek(self.problems, self.output_dir, self.base_filename)
+            with profile_stage(profiler, 'save'):
+                save_for_deepseek(self.problems, self.output_dir, self.base_filename)
             print(f"\n[완료] 저장 위치: {self.output_dir}")
         
+        if cache_key is not None:
+            with profile_stage(profiler, 'cache_store'):
+                cache.set(cache_key, {'problems': self.problems, 'base_filename': self.base_filename})
+        
         return self.problems
 
 
+def _locate_body(mm):
+    """
+    mmap에서 본문 바이트 범위 찾기 (extract_body와 같은 규칙, 복사 없음)
+
+    Returns:
+        (시작 바이트, 끝 바이트)
+    """
+    begin = mm.find(b'\\begin{document}')
+    end = mm.find(b'\\end{document}')
+    if begin != -1 and end != -1:
+        begin += len(b'\\begin{document}')
+        return begin, max(begin, end)
+    return 0, len(mm)
+
+
+def _iter_body_text(mm, begin, end, chunk_bytes):
+    """
+    본문 바이트를 조각 단위로 UTF-8 디코딩 (open(..., encoding='utf-8')처럼 줄바꿈 통일)
+
+    Yields:
+        str 조각 (이어 붙이면 extract_body 결과와 같음)
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''  # 조각 끝의 '\r' (다음 조각의 '\n'과 합쳐질 수 있음)
+    pos = begin
+    while pos < end:
+        chunk_end = min(end, pos + chunk_bytes)
+        text = carry + decoder.decode(mm[pos:chunk_end], final=chunk_end == end)
+        pos = chunk_end
+        carry = ''
+        if text.endswith('\r') and pos < end:
+            text, carry = text[:-1], '\r'
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if text:
+            yield text
+    if carry:
+        yield '\n'
+
+
+def stream_problems(tex_path, chunk_bytes=STREAM_CHUNK_BYTES):
+    """
+    .tex 파일을 메모리 맵으로 열어 문제를 하나씩 추출 (generator)
+
+    본문 전체를 str로 올리지 않고 조각 단위로 디코딩하면서, 다음 [4점] 마커와 주변 범위가
+    들어오는 대로 그 문제를 바로 yield함. 필요 없는 앞부분은 버리므로 파일이 커져도 메모리는 거의 일정함.
+    결과는 extract_problems_fast()와 같음 (문제 하나를 처리할 때 보는 범위가 모두 버퍼 안에 남도록 잡음)
+
+    Args:
+        tex_path: .tex 파일 경로
+        chunk_bytes: 한 번에 디코딩할 바이트 수
+
+    Yields:
+        문제 dict (extract_problems_fast와 같은 형식, 본문 순서)
+    """
+    processor = OptimizedMathpixProcessor('', None, None)
+    kind_starts = {kind: [] for kind in MARKER_KINDS}  # 지금까지 찾은 마커 (전역 위치)
+    markers = []         # [(위치, 점수), ...]
+    next_problem = 0     # 다음에 yield할 마커 번호
+    buffer = ''          # 본문 [buffer_start, scanned) 구간
+    buffer_start = 0
+    scanned = 0          # 지금까지 디코딩한 글자 수
+    
+    def window_start(marker_pos, prev_marker):
+        if prev_marker is None:
+            return max(0, marker_pos - STREAM_WINDOW_BEFORE)
+        return max(0, min(prev_marker - 1000, marker_pos - STREAM_WINDOW_BEFORE))
+    
+    def extract(problem_index, marker_pos, point, buffer_index):
+        # 버퍼 전체를 본문처럼 사용 (문제가 보는 범위는 모두 버퍼 안에 있음)
+        return processor._extract_single_problem(
+            marker_pos - buffer_start, point, buffer, problem_index,
+            buffer_index['sections'], buffer_index
+        )
+    
+    with open(tex_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            begin, end = _locate_body(mm)
+            for piece in _iter_body_text(mm, begin, end, chunk_bytes):
+                # 새 조각에서 마커 찾기 (조각 경계에 걸친 마커를 위해 3글자 겹침)
+                scan_from = max(buffer_start, scanned - 3)
+                buffer += piece
+                scanned += len(piece)
+                last_marker = markers[-1][0] if markers else -1
+                for match in POINT_PATTERN.finditer(buffer, scan_from - buffer_start):
+                    pos = buffer_start + match.start()
+                    if pos <= last_marker:
+                        continue
+                    markers.append((pos, int(match.group(1) or match.group(2))))
+                    kind_starts[match.group(0)].append(pos)
+                
+                # 다음 [4점] 마커와 그 뒤 범위까지 들어온 문제는 바로 처리
+                # (버퍼 인덱스는 처리할 문제가 생겼을 때 조각마다 한 번만 생성)
+                first_kind = kind_starts[MARKER_KINDS[0]]
+                buffer_index = None
+                while next_problem < len(markers):
+                    marker_pos, point = markers[next_problem]
+                    i = bisect_left(first_kind, marker_pos + 50)
+                    if i == len(first_kind):
+                        break  # 다음 마커가 아직 정해지지 않음
+                    if max(first_kind[i], marker_pos) + STREAM_WINDOW_AFTER > scanned:
+                        break
+                    if buffer_index is None:
+                        buffer_index = build_marker_index(buffer)
+                    next_problem += 1
+                    problem = extract(next_problem, marker_pos, point, buffer_index)
+                    if problem:
+                        yield problem
+                
+                # 남은 문제(와 아직 찾지 못한 문제)가 볼 수 없는 앞부분 버리기
+                keep_from = max(0, scanned - 3 - STREAM_WINDOW_BEFORE)
+                if next_problem < len(markers):
+                    marker_pos = markers[next_problem][0]
+                    keep_from = min(keep_from, window_start(
+                        marker_pos, find_prev_marker({'kind_starts': kind_starts}, marker_pos)))
+                # 아직 찾지 못한 마커의 이전 마커는 지금까지 찾은 우선순위 마커보다 앞일 수 없음
+                for kind in MARKER_KINDS:
+                    if kind_starts[kind]:
+                        keep_from = min(keep_from, kind_starts[kind][-1] - 1000)
+                        break
+                keep_from = max(keep_from, buffer_start)
+                if keep_from > buffer_start:
+                    buffer = buffer[keep_from - buffer_start:]
+                    buffer_start = keep_from
+    
+    # 파일 끝: 남은 문제는 본문 끝까지 남은 버퍼로 처리
+    if next_problem < len(markers):
+        buffer_index = build_marker_index(buffer)
+        while next_problem < len(markers):
+            marker_pos, point = markers[next_problem]
+            next_problem += 1
+            problem = extract(next_problem, marker_pos, point, buffer_index)
+            if problem:
+                yield problem
+
+
 def quick_process_mathpix_latex_optimized(latex_content, output_dir, base_filename, 
-                                         mode='fast', max_workers=4, debug=False):
+                                         mode='fast', max_workers=4, debug=False, cache=None,
+                                         profiler=None):
     """
     Mathpix LaTeX 빠른 처리 함수 (최적화 버전)
     
@@ -293,9 +691,12 @@ def quick_process_mathpix_latex_optimized(latex_content, output_dir, base_filena
         latex_content: Mathpix에서 온 LaTeX 내용
         output_dir: 출력 디렉토리
         base_filename: 기본 파일명
-        mode: 'fast' (순차, 빠름) 또는 'parallel' (병렬, 더 빠름)
-        max_workers: 병렬 모드일 때 워커 수 (기본 4)
+        mode: 'fast' (순차, 빠름), 'parallel' (스레드 병렬) 또는
+              'process' (프로세스 병렬, 대용량 LaTeX에서 CPU 코어 활용)
+        max_workers: 병렬/프로세스 모드일 때 워커 수 (기본 4)
         debug: 진단 모드 활성화 여부
+        cache: ConversionCache (같은 본문 재처리 시 추출/검토 생략)
+        profiler: StageProfiler (단계별/문제별 시간 측정, 기본 None)
     
     Returns:
         추출된 문제 리스트
@@ -305,7 +706,7 @@ def quick_process_mathpix_latex_optimized(latex_content, output_dir, base_filena
         auto_diagnose=debug
     )
     
-    return processor.process(mode=mode, max_workers=max_workers)
+    return processor.process(mode=mode, max_workers=max_workers, cache=cache, profiler=profiler)
 
 
 if __name__ == '__main__':
@@ -314,3 +715,5 @@ if __name__ == '__main__':
     print("\n모드:")
     print("  - 'fast': 순차 처리 (빠름, 기본)")
     print("  - 'parallel': 병렬 처리 (더 빠름, CPU 사용량 증가)")
+    print("  - 'process': 프로세스 병렬 처리 (대용량, 멀티코어 활용)")
+    print("\n대용량 .tex 파일: stream_problems(tex_path)로 문제를 하나씩 받기 (메모리 맵, 메모리 일정)")
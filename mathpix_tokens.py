@@ -0,0 +1,364 @@
+# mathpix_tokens.py
+# Mathpix LaTeX 본문 토크나이저 (한 번 스캔 → 토큰 배열 + 위치 인덱스)
+
+"""
+경계 찾기/선택지 파싱/정리 함수들이 본문을 각자 정규식으로 다시 훑는 대신,
+본문을 한 번만 스캔해서 만든 토큰 배열을 공유함
+
+토큰 종류:
+    SECTION       \\section{...}, \\section*{...} (닫는 '}'까지)
+                  제목이 없거나 닫히지 않은 \\section은 flag=SECTION_PARTIAL, 명령어까지만
+    MATH_INLINE   $...$, \\(...\\)
+    MATH_DISPLAY  $$...$$, \\[...\\]
+    POINT         [3점] [4점] ［3점］ ［4점］ (value: 점수)
+    OPTION        (1) （1） (1） （1) ①~⑤ (value: 번호, flag: 괄호 모양)
+    CONDITION     (가) （나） ... (value: 0=가, 1=나, ...)
+    BOOGI         〈보기〉부터 다음 （n）/\\section 전까지 (extract_boogi_options와 같은 범위)
+    IMAGE         \\includegraphics[...]{...}
+    TEXT          위 토큰 사이의 나머지 구간
+
+SECTION/MATH/BOOGI는 구간 토큰이라 안쪽의 마커 토큰(POINT, OPTION 등)과 겹칠 수 있음
+(예: $f(1)$ 안의 (1)도 OPTION 토큰). 기존 정규식 검색과 같은 위치를 돌려주기 위함이며,
+수식 안 마커만 빼고 싶으면 in_math()로 거르면 됨
+
+사용 예시:
+    from mathpix_tokens import tokenize_mathpix, POINT, OPTION
+
+    tokens = tokenize_mathpix(body)
+    for i in tokens.indices(POINT):
+        print(tokens.start(i), tokens.value(i))          # 마커 위치, 점수
+    last = tokens.last_option(start, end, styles=(OPTION_HALFWIDTH, OPTION_FULLWIDTH))
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+# 토큰 종류
+TEXT = 0
+SECTION = 1
+MATH_INLINE = 2
+MATH_DISPLAY = 3
+POINT = 4
+OPTION = 5
+CONDITION = 6
+BOOGI = 7
+IMAGE = 8
+
+KIND_NAMES = ('text', 'section', 'math_inline', 'math_display', 'point',
+              'option', 'condition', 'boogi', 'image')
+
+# OPTION 토큰 flag (괄호 모양)
+OPTION_HALFWIDTH = 0   # (1)
+OPTION_FULLWIDTH = 1   # （1）
+OPTION_MIXED = 2       # (1） 또는 （1)
+OPTION_CIRCLED = 3     # ①
+
+# SECTION 토큰 flag
+SECTION_COMPLETE = 0   # \section*{제목}
+SECTION_PARTIAL = 1    # 제목 없음/닫히지 않음/앞 헤더 제목 안에 있음
+
+CIRCLED_NUMBERS = '①②③④⑤'
+CONDITION_LABELS = '가나다라마바사아자차카타파하'
+
+# 종류별 스캔 정규식 - 모두 고정 접두사/문자 집합으로 시작해서 C 레벨에서 빠르게 건너뜀
+# (하나의 alternation + lookbehind로 합치면 위치마다 분기를 시도해서 10배 가까이 느림)
+_SECTION_PATTERN = re.compile(r'\\section\*?\{?')
+_IMAGE_PATTERN = re.compile(r'\\includegraphics(?:\[[^\]\n]*\])?\{[^}\n]*\}')
+_POINT_PATTERN = re.compile(r'[\[［]([34])점[\]］]')
+_MARKER_PATTERN = re.compile(r'[（(](?:[1-5]|[' + CONDITION_LABELS + r'])[）)]|[①②③④⑤]')
+_DOLLAR_PATTERN = re.compile(r'\$\$?')
+_MATH_BRACKET_PATTERN = re.compile(r'\\[()\[\]]')
+
+# 수식 여는 구분자 → (닫는 구분자, 종류)
+_MATH_DELIMITERS = {
+    '$': ('$', MATH_INLINE),
+    '$$': ('$$', MATH_DISPLAY),
+    '\\(': ('\\)', MATH_INLINE),
+    '\\[': ('\\]', MATH_DISPLAY),
+}
+
+BOOGI_MARKER = '〈보기〉'
+
+
+class MathpixTokens:
+    """
+    토큰 배열 (시작 위치 순, 같은 위치면 바깥 구간 토큰이 먼저)
+
+    kinds/starts/ends/values/flags는 array라 토큰 수가 많아도 메모리를 적게 쓰고,
+    종류별 위치 인덱스는 처음 요청할 때 한 번만 만듦
+    """
+
+    __slots__ = ('text', 'kinds', 'starts', 'ends', 'values', 'flags', '_by_kind')
+
+    def __init__(self, text, kinds, starts, ends, values, flags):
+        self.text = text
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.values = values
+        self.flags = flags
+        self._by_kind = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getstate__(self):
+        # 프로세스 워커로 보낼 때 종류별 인덱스는 다시 만들도록 제외
+        return (self.text, self.kinds, self.starts, self.ends, self.values, self.flags)
+
+    def __setstate__(self, state):
+        self.text, self.kinds, self.starts, self.ends, self.values, self.flags = state
+        self._by_kind = {}
+
+    def kind(self, i):
+        return self.kinds[i]
+
+    def kind_name(self, i):
+        return KIND_NAMES[self.kinds[i]]
+
+    def start(self, i):
+        return self.starts[i]
+
+    def end(self, i):
+        return self.ends[i]
+
+    def value(self, i):
+        return self.values[i]
+
+    def flag(self, i):
+        return self.flags[i]
+
+    def source(self, i):
+        """토큰 원문"""
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def section_title(self, i):
+        """SECTION 토큰의 제목 ({ } 안)"""
+        return self.text[self.text.index('{', self.starts[i]) + 1:self.ends[i] - 1]
+
+    def _kind_index(self, kind):
+        """종류별 (토큰 번호, 시작 위치, 끝 위치) 리스트 (시작 위치 순)"""
+        entry = self._by_kind.get(kind)
+        if entry is None:
+            kinds = self.kinds
+            indices = [i for i in range(len(kinds)) if kinds[i] == kind]
+            entry = (indices, [self.starts[i] for i in indices], [self.ends[i] for i in indices])
+            self._by_kind[kind] = entry
+        return entry
+
+    def indices(self, kind):
+        """해당 종류 토큰 번호 리스트"""
+        return self._kind_index(kind)[0]
+
+    def positions(self, kind):
+        """해당 종류 토큰 시작 위치 리스트 (정렬됨)"""
+        return self._kind_index(kind)[1]
+
+    def next_index(self, kind, pos):
+        """pos 이후(포함)에 시작하는 첫 토큰 번호 (없으면 None)"""
+        indices, starts, _ = self._kind_index(kind)
+        k = bisect_left(starts, pos)
+        return indices[k] if k < len(indices) else None
+
+    def prev_index(self, kind, pos):
+        """pos 이전(포함)에 끝나는 마지막 토큰 번호 (없으면 None)"""
+        indices, starts, ends = self._kind_index(kind)
+        k = bisect_left(starts, pos) - 1
+        while k >= 0 and ends[k] > pos:
+            k -= 1
+        return indices[k] if k >= 0 else None
+
+    def in_span(self, kind, start, end):
+        """text[start:end] 안에 완전히 들어가는 토큰 번호 리스트"""
+        indices, starts, ends = self._kind_index(kind)
+        lo = bisect_left(starts, start)
+        hi = bisect_left(starts, end)
+        return [indices[k] for k in range(lo, hi) if ends[k] <= end]
+
+    def in_math(self, i):
+        """토큰 i가 수식 구간 안에 있는지"""
+        pos = self.starts[i]
+        for kind in (MATH_INLINE, MATH_DISPLAY):
+            indices, starts, ends = self._kind_index(kind)
+            k = bisect_right(starts, pos) - 1
+            if k >= 0 and indices[k] != i and ends[k] > pos:
+                return True
+        return False
+
+    def last_option(self, start, end, styles=None):
+        """
+        text[start:end] 안에서 번호가 가장 큰 선택지 마커 (같은 번호면 먼저 나온 것)
+
+        Args:
+            styles: 허용할 OPTION flag 집합 (None이면 전부)
+
+        Returns:
+            토큰 번호 또는 None
+        """
+        best = None
+        for i in self.in_span(OPTION, start, end):
+            if styles is not None and self.flags[i] not in styles:
+                continue
+            if best is None or self.values[i] > self.values[best]:
+                best = i
+        return best
+
+
+def _option_flag(marker):
+    if marker in CIRCLED_NUMBERS:
+        return OPTION_CIRCLED
+    if marker[0] == '(' and marker[-1] == ')':
+        return OPTION_HALFWIDTH
+    if marker[0] == '（' and marker[-1] == '）':
+        return OPTION_FULLWIDTH
+    return OPTION_MIXED
+
+
+def _math_delimiters(text):
+    """
+    수식 구분자 [(위치, 구분자), ...] (위치 순)
+
+    \\$처럼 앞에 \\가 붙은 것은 제외. \\[4점], \\(1)처럼 점수/선택지 마커 앞의 \\[, \\(도 제외
+    """
+    delimiters = []
+    for match in _DOLLAR_PATTERN.finditer(text):
+        start = match.start()
+        delimiter = match.group()
+        if start and text[start - 1] == '\\':
+            if len(delimiter) == 1:
+                continue
+            start, delimiter = start + 1, '$'  # \$$ → 이스케이프된 $ 다음의 $
+        delimiters.append((start, delimiter))
+
+    for match in _MATH_BRACKET_PATTERN.finditer(text):
+        start = match.start()
+        if start and text[start - 1] == '\\':
+            continue
+        delimiter = match.group()
+        if delimiter == '\\[' and text.startswith(('3점]', '4점]'), start + 2):
+            continue
+        if delimiter == '\\(' and text[start + 2:start + 3] in ('1', '2', '3', '4', '5') \
+                and text[start + 3:start + 4] == ')':
+            continue
+        delimiters.append((start, delimiter))
+
+    delimiters.sort()
+    return delimiters
+
+
+def _math_spans(text, raw):
+    """구분자를 순서대로 짝지어 수식 구간 토큰 추가 (여는 것과 같은 모양의 닫는 구분자로만 닫음)"""
+    math_open = None  # (여는 구분자, 시작 위치)
+    for start, delimiter in _math_delimiters(text):
+        if math_open is None:
+            if delimiter in _MATH_DELIMITERS:
+                math_open = (delimiter, start)
+            continue
+        open_delimiter, open_start = math_open
+        closer, kind = _MATH_DELIMITERS[open_delimiter]
+        if delimiter == closer:
+            raw.append((open_start, -(start + len(delimiter)), kind, 0, 0))
+            math_open = None
+        elif open_delimiter == '$' and delimiter == '$$':
+            # $a$$b$: 앞의 $로 닫고 뒤의 $로 새로 엶
+            raw.append((open_start, -(start + 1), kind, 0, 0))
+            math_open = ('$', start + 1)
+    # 닫히지 않은 수식은 수식으로 보지 않음
+
+
+def tokenize_mathpix(text):
+    """
+    Mathpix 본문을 토큰 배열로 변환 (본문당 한 번)
+
+    종류별로 고정 접두사 정규식을 한 번씩 돌려 얻은 토큰을 위치 순으로 합치고,
+    구간 토큰 사이의 빈 곳을 TEXT 토큰으로 채움
+
+    Args:
+        text: LaTeX 본문 (extract_body 결과)
+
+    Returns:
+        MathpixTokens
+    """
+    raw = []  # (시작, -끝, 종류, 값, flag) - 정렬 키 겸용 (같은 시작이면 긴 구간이 먼저)
+
+    # 섹션 헤더: 제목 안의 \section, 닫히지 않은 헤더는 PARTIAL
+    section_end = 0
+    section_starts = []
+    for match in _SECTION_PATTERN.finditer(text):
+        start = match.start()
+        section_starts.append(start)
+        close = text.find('}', match.end()) if match.group().endswith('{') else -1
+        if close == -1 or start < section_end:
+            raw.append((start, -match.end(), SECTION, 0, SECTION_PARTIAL))
+            continue
+        section_end = close + 1
+        raw.append((start, -section_end, SECTION, 0, SECTION_COMPLETE))
+
+    for match in _IMAGE_PATTERN.finditer(text):
+        raw.append((match.start(), -match.end(), IMAGE, 0, 0))
+
+    for match in _POINT_PATTERN.finditer(text):
+        marker = match.group()
+        # [4점] / ［4점］처럼 괄호 모양이 같은 것만
+        if (marker[0] == '[') == (marker[-1] == ']'):
+            raw.append((match.start(), -match.end(), POINT, int(match.group(1)), 0))
+
+    fullwidth_starts = []  # 〈보기〉 끝 판단용 （n） 위치
+    for match in _MARKER_PATTERN.finditer(text):
+        marker = match.group()
+        start = match.start()
+        if marker in CIRCLED_NUMBERS:
+            raw.append((start, -match.end(), OPTION, CIRCLED_NUMBERS.index(marker) + 1, OPTION_CIRCLED))
+        elif marker[1] in CONDITION_LABELS:
+            raw.append((start, -match.end(), CONDITION, CONDITION_LABELS.index(marker[1]), 0))
+        else:
+            flag = _option_flag(marker)
+            if flag == OPTION_FULLWIDTH:
+                fullwidth_starts.append(start)
+            raw.append((start, -match.end(), OPTION, int(marker[1]), flag))
+
+    # 〈보기〉: 다음 （n）/\section 전까지, 없으면 본문 끝 (정규식 $처럼 마지막 줄바꿈 앞)
+    stops = sorted(fullwidth_starts + section_starts)
+    text_end = len(text) - 1 if text.endswith('\n') else len(text)
+    start = text.find(BOOGI_MARKER)
+    while start != -1:
+        content_start = start + len(BOOGI_MARKER)
+        k = bisect_left(stops, content_start)
+        end = stops[k] if k < len(stops) else max(text_end, content_start)
+        raw.append((start, -end, BOOGI, 0, 0))
+        start = text.find(BOOGI_MARKER, content_start)
+
+    _math_spans(text, raw)
+    raw.sort()
+
+    # 구간 토큰 사이의 빈 곳을 TEXT 토큰으로 채움
+    kinds = array('B')
+    starts = array('q')
+    ends = array('q')
+    values = array('h')
+    flags = array('B')
+    covered = 0
+    for start, neg_end, kind, value, flag in raw:
+        end = -neg_end
+        if start > covered:
+            kinds.append(TEXT)
+            starts.append(covered)
+            ends.append(start)
+            values.append(0)
+            flags.append(0)
+        kinds.append(kind)
+        starts.append(start)
+        ends.append(end)
+        values.append(value)
+        flags.append(flag)
+        if end > covered:
+            covered = end
+    if covered < len(text):
+        kinds.append(TEXT)
+        starts.append(covered)
+        ends.append(len(text))
+        values.append(0)
+        flags.append(0)
+
+    return MathpixTokens(text, kinds, starts, ends, values, flags)
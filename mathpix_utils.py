@@ -3,7 +3,12 @@
 
 import re
 from pathlib import Path
-from latex_utils import extract_body, clean_latex_text, extract_options_generic
+from latex_utils import (
+    extract_body, clean_latex_text, extract_options_generic, extract_boogi_choices, CIRCLED_NUMBERS
+)
+from latex_cleaner import clean_mathpix_latex
+from taxonomy import scan_keywords, TOPIC_KEYWORDS, TOPIC_PRIORITY
+from mathpix_tokens import tokenize_mathpix, SECTION, OPTION_HALFWIDTH, OPTION_FULLWIDTH
 
 
 def detect_problem_type(body_snippet):
@@ -17,43 +22,9 @@ def detect_problem_type(body_snippet):
 
 def detect_topic_from_content(body_snippet):
     """본문 내용으로 주제 자동 감지 (개선 버전 - 확통 포함)"""
-    topics = {
-        '경우의 수': [
-            '경우의 수', '순열', '조합', '원순열', '중복순열', '중복조합',
-            '이웃', '이웃하지', '부정방정식', '음이 아닌 정수',
-            '함수의 개수', '치역', '정의역'
-        ],
-        '확률': [
-            '확률', '사건', '독립', '종속', '조건부확률', '여사건',
-            '독립시행', '이항분포', 'P(', '확률변수'
-        ],
-        '통계': [
-            '통계', '확률변수', '확률질량함수', '확률밀도함수',
-            '평균', '분산', '표준편차', 'E(', 'V(',
-            '정규분포', '표준정규분포', 'N('
-        ],
-        '함수의 극한과 연속': ['극한', '연속', '불연속', '\\lim', 'Chapter 1'],
-        '미분': ['미분', '도함수', 'f\'', 'f^{\\prime}', 'Chapter 2'],
-        '적분': ['적분', '\\int', '정적분', '부정적분', 'Chapter 3'],
-        '수열': ['수열', '등차수열', '등비수열', 'Chapter 3', '점화식'],
-        '기하': ['삼각형', '원', '선분', '각', '기하'],
-        '삼각함수': ['삼각함수', 'sin', 'cos', 'tan'],
-    }
-    
-    # 우선순위: 확통 > 미분 > 적분 > 극한과 연속
-    priority_order = [
-        '경우의 수', '확률', '통계',  # 확통 우선
-        '미분', '적분', '함수의 극한과 연속', 
-        '수열', '삼각함수', '기하'
-    ]
-    
-    for topic in priority_order:
-        if topic in topics:
-            keywords = topics[topic]
-            if any(keyword in body_snippet for keyword in keywords):
-                return topic
-    
-    return "기타"
+    # 우선순위: 확통 > 미분 > 적분 > 극한과 연속 (taxonomy.TOPIC_PRIORITY)
+    hits = scan_keywords(body_snippet)
+    return hits.first_group(TOPIC_KEYWORDS, TOPIC_PRIORITY) or "기타"
 
 
 def extract_point_value(text):
@@ -64,20 +35,38 @@ def extract_point_value(text):
     return 4  # 기본값
 
 
-def find_problem_boundaries(body, marker_pos, prev_marker_pos=None, next_marker_pos=None, sections=None, is_boogi_problem=False):
-    """문제 경계 찾기 (개선 버전 - 섹션 헤더 활용, 보기 문제 지원)"""
+# 마지막으로 토큰화한 본문과 토큰 (tokens 없이 같은 본문으로 여러 번 호출해도 토큰화는 한 번)
+_last_body_tokens = (None, None)
+
+
+def _body_tokens(body):
+    """본문의 MathpixTokens (직전 호출과 같은 본문 객체면 재사용)"""
+    global _last_body_tokens
+    cached_body, tokens = _last_body_tokens
+    if cached_body is not body:
+        tokens = tokenize_mathpix(body)
+        _last_body_tokens = (body, tokens)
+    return tokens
+
+
+def find_problem_boundaries(body, marker_pos, prev_marker_pos=None, next_marker_pos=None, sections=None, is_boogi_problem=False,
+                            tokens=None):
+    """
+    문제 경계 찾기 (개선 버전 - 섹션 헤더 활용, 보기 문제 지원)
+    
+    tokens: 본문의 MathpixTokens (없으면 본문별로 한 번 토큰화해 재사용)
+    """
+    if tokens is None:
+        tokens = _body_tokens(body)
+    
     # 시작 위치
     if prev_marker_pos is not None:
         start = prev_marker_pos + 100
-        # 이전 문제의 선택지 끝 찾기
-        search_area = body[max(0, prev_marker_pos - 300):prev_marker_pos + 200]
-        last_option_match = None
-        for opt_num in range(5, 0, -1):
-            pattern = rf'（{opt_num}）|\({opt_num}\)'
-            match = re.search(pattern, search_area)
-            if match:
-                last_option_match = max(0, prev_marker_pos - 300) + match.end()
-                break
+        # 이전 문제의 선택지 끝 찾기 (번호가 가장 큰 （n）/(n) 마커)
+        search_start = max(0, prev_marker_pos - 300)
+        last_option = tokens.last_option(search_start, prev_marker_pos + 200,
+                                         styles=(OPTION_HALFWIDTH, OPTION_FULLWIDTH))
+        last_option_match = tokens.end(last_option) if last_option is not None else None
         if last_option_match:
             start = last_option_match + 50
     else:
@@ -154,31 +143,32 @@ def find_problem_boundaries(body, marker_pos, prev_marker_pos=None, next_marker_
         end = min(len(body), marker_pos + 800)
         if is_boogi_problem:
             end = min(len(body), marker_pos + 1200)  # 보기 문제는 더 넓게
-        next_section = body.find('\\section', marker_pos + 100)
-        if next_section != -1:
-            end = min(end, next_section)
+        next_section = tokens.next_index(SECTION, marker_pos + 100)
+        if next_section is not None:
+            end = min(end, tokens.start(next_section))
     
     return start, end
 
 
-def clean_problem_text(text, body_context=None, problem_start=None):
-    """문제 텍스트 정리 (이미지, 불필요한 LaTeX 제거) - 개선 버전"""
-    # 이미지 제거
-    text = re.sub(r'\\includegraphics.*?}', '', text)
-    text = re.sub(r'\\begin\{figure\}.*?\\end\{figure\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{center\}.*?\\end\{center\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{tabular\}.*?\\end\{tabular\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{enumerate\}.*?\\end\{enumerate\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{array\}.*?\\end\{array\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{aligned\}.*?\\end\{aligned\}', '', text, flags=re.DOTALL)
-    text = re.sub(r'\\begin\{cases\}.*?\\end\{cases\}', '', text, flags=re.DOTALL)
-    
-    # caption 제거
-    text = re.sub(r'\\caption\{[^}]+\}', '', text)
-    text = re.sub(r'\\captionsetup\{[^}]+\}', '', text)
+def clean_problem_text(text, body_context=None, problem_start=None, malformed=None):
+    """
+    문제 텍스트 정리 (이미지, 불필요한 LaTeX 제거) - 개선 버전
+
+    malformed: 리스트를 넘기면 짝이 맞지 않는 환경 목록(latex_cleaner report['malformed'])을 추가,
+               넘기지 않으면 있을 때 경고 한 줄 출력
+    """
+    # 이미지, 그림/표/정렬 환경, caption, 섹션 헤더 제거 (스택 기반 한 번의 스캔)
+    # 짝이 맞지 않는 환경은 제거하지 않고 그대로 둠 (latex_cleaner 참고)
+    text, report = clean_mathpix_latex(text, collapse=False)
+    if report['malformed']:
+        if malformed is not None:
+            malformed.extend(report['malformed'])
+        else:
+            issues = ', '.join(f"{item['type']}:{item['env']}@{item['pos']}" for item in report['malformed'])
+            position = f" (본문 위치 {problem_start})" if problem_start is not None else ""
+            print(f"[경고] 짝이 맞지 않는 LaTeX 환경{position}: {issues}")
     
-    # 섹션 헤더 제거 (개선)
-    text = re.sub(r'\\section\*?\{[^}]*\}', '', text)
+    # Chapter 헤더 제거 (개선)
     text = re.sub(r'Chapter \d+[^가-힣]*미분', '', text)
     text = re.sub(r'Chapter \d+[^가-힣]*적분', '', text)
     text = re.sub(r'Chapter \d+[^가-힣]*', '', text)
@@ -241,28 +231,13 @@ def extract_boogi_options(options_text, extended_search_text=None):
             boogi_content = clean_latex_text(boogi_match.group(1))
             break
     
-    # 선택지 (1)~(5) 추출 (전각/반각 괄호 모두 처리)
+    # 선택지 (1)~(5) 추출 (전각/반각 괄호 모두 처리, 마커는 한 번만 스캔)
     # 확장 검색 텍스트 사용 (다음 섹션까지 포함)
-    found_options = {}
-    for opt_num in range(1, 6):
-        # 전각 괄호: （1）~（5）
-        pattern1 = rf'（{opt_num}）\s*([^（]+?)(?=（[1-5]）|$|\\section|\\end)'
-        # 반각 괄호: (1)~(5)
-        pattern2 = rf'\({opt_num}\)\s*([^(]+?)(?=\([1-5]\)|$|\\section|\\end)'
-        
-        # 확장 검색 텍스트에서도 검색
-        match = re.search(pattern1, search_text, re.DOTALL) or re.search(pattern2, search_text, re.DOTALL)
-        if match:
-            option_text = clean_latex_text(match.group(1))
-            # 보기 내용이 선택지에 포함되지 않도록 확인
-            # 선택지가 ㄱ,ㄴ,ㄷ 조합이어야 함
-            if ('ㄱ' in option_text or 'ㄴ' in option_text or 'ㄷ' in option_text or 
-                'ᄀ' in option_text or 'ᄂ' in option_text or 'ᄃ' in option_text):
-                found_options[opt_num] = option_text
+    found_options = extract_boogi_choices(search_text)
     
     # 순서대로 정렬
     for opt_num in sorted(found_options.keys()):
-        options.append(f"{['①', '②', '③', '④', '⑤'][opt_num-1]} {found_options[opt_num]}")
+        options.append(f"{CIRCLED_NUMBERS[opt_num-1]} {found_options[opt_num]}")
     
     return options, boogi_content
 
@@ -0,0 +1,232 @@
+# ocr_preprocess.py
+# OCR 전처리 (NumPy 벡터화: 그레이스케일 → 적응형 이진화 → 기울기 보정 → 잡티 제거 → 단 나누기)
+
+"""
+600 DPI 원본 대신 300 DPI + 전처리로 같은 OCR 정확도를 얻기 위한 단계입니다.
+(픽셀 수 1/4 → 렌더링/Tesseract 시간도 약 1/4, benchmark_ocr.py로 확인)
+
+사용 예시:
+    from ocr_preprocess import preprocess_for_ocr, preprocess_two_column
+    from pdf_ocr_cache import ocr_page_texts
+
+    texts = ocr_page_texts(pdf_path, range(10), dpi=300, preprocess=preprocess_for_ocr)
+    texts = ocr_page_texts(pdf_path, range(10), dpi=300, preprocess=preprocess_two_column)  # 2단 편집
+
+    image = preprocess_for_ocr(Image.open('page.png'))   # PIL 'L' 이미지 (검은 글자/흰 배경)
+
+단계 (모두 전체 배열 연산, 픽셀 단위 파이썬 루프 없음):
+  1. to_grayscale: RGB → 휘도 (ITU-R 601 가중치)
+  2. adaptive_binarize: 적분 영상으로 주변 창 평균을 구해 평균보다 충분히 어두우면 글자 (Bradley)
+  3. estimate_skew/deskew: 글자 픽셀을 각도별로 투영한 행 히스토그램이 가장 뾰족한 각도로 회전
+  4. despeckle: 8방향 이웃 글자 수가 적은 고립 픽셀 제거
+  5. find_column_split: 가운데 부근의 세로 공백(단 사이 여백)을 찾아 왼쪽/오른쪽 단을 위아래로 이어 붙임
+
+NumPy가 없으면 pdf_ocr_cache.enhance_for_ocr(대비/선명도 향상)로 대신합니다.
+"""
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 기본 설정 (300 DPI 기준)
+BINARIZE_WINDOW_RATIO = 1 / 40   # 이진화 창 크기 = 짧은 변 × 이 비율 (300 DPI A4 → 약 61px)
+BINARIZE_SENSITIVITY = 0.15      # 창 평균보다 15% 이상 어두우면 글자
+MAX_SKEW_ANGLE = 5.0             # 기울기 탐색 범위 (±도)
+SKEW_STEP = 0.2                  # 기울기 탐색 간격 (도)
+MIN_SKEW_ANGLE = 0.1             # 이보다 작으면 회전하지 않음
+SKEW_SAMPLE_POINTS = 100000      # 기울기 추정에 쓰는 글자 픽셀 최대 수
+DESPECKLE_MIN_NEIGHBORS = 2      # 이웃 글자 픽셀이 이보다 적으면 잡티
+COLUMN_SEARCH = (0.3, 0.7)       # 단 사이 여백을 찾는 가로 범위 (폭 비율)
+COLUMN_MIN_GAP_RATIO = 0.02      # 단 사이 여백 최소 폭 (폭 비율)
+COLUMN_GAP_INK_RATIO = 0.005     # 여백 열의 글자 픽셀 비율 상한 (높이 대비)
+COLUMN_SEPARATOR = 40            # 단을 이어 붙일 때 사이 흰 줄 높이 (px)
+
+
+def to_grayscale(image):
+    """PIL 이미지 → float32 휘도 배열 (0=검정, 255=흰색)"""
+    if image.mode == 'L':
+        return np.asarray(image, dtype=np.float32)
+    rgb = np.asarray(image.convert('RGB'), dtype=np.float32)
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _box_sum(values, half, axis):
+    """
+    axis 방향으로 [i-half, i+half] 구간 합 (가장자리는 잘린 구간)
+
+    누적합 한 번 + 슬라이스 뺄셈만 사용 (인덱스 배열로 전체 복사본을 만들지 않음)
+    """
+    n = values.shape[axis]
+    shape = list(values.shape)
+    shape[axis] = n + 1
+    cumulative = np.zeros(shape, dtype=np.float32)
+    np.cumsum(values, axis=axis, dtype=np.float32, out=cumulative[(slice(None),) * axis + (slice(1, None),)])
+
+    def part(start, stop):
+        return (slice(None),) * axis + (slice(start, stop),)
+
+    high = min(half + 1, n)
+    sums = np.empty(values.shape, dtype=np.float32)
+    # 구간 끝: min(i + half + 1, n)
+    sums[part(0, n - high + 1)] = cumulative[part(high, n + 1)]
+    sums[part(n - high + 1, n)] = cumulative[part(n, n + 1)]
+    # 구간 시작: max(i - half, 0) (i <= half이면 0이므로 뺄 것 없음)
+    if n > half:
+        sums[part(half + 1, n)] -= cumulative[part(1, n - half)]
+    return sums
+
+
+def _window_counts(n, half):
+    """각 위치의 잘린 구간 길이"""
+    positions = np.arange(n)
+    return (np.minimum(positions + half + 1, n) - np.maximum(positions - half, 0)).astype(np.float32)
+
+
+def adaptive_binarize(gray, window=None, sensitivity=BINARIZE_SENSITIVITY):
+    """
+    적응형 이진화 (Bradley: 주변 window×window 평균 대비 어두운 픽셀 = 글자)
+
+    조명/스캔 농도가 페이지 안에서 달라도 같은 기준을 쓰기 위해 전역 임계값 대신 사용
+    창 평균은 세로/가로 누적합으로 나눠 float32로 계산 (300 DPI A4 한 장에 페이지 크기 배열 3~4개)
+
+    Returns:
+        bool 배열 (True = 글자)
+    """
+    gray = np.asarray(gray, dtype=np.float32)
+    height, width = gray.shape
+    if window is None:
+        window = max(15, int(min(height, width) * BINARIZE_WINDOW_RATIO) | 1)
+    half = window // 2
+
+    mean = _box_sum(_box_sum(gray, half, axis=0), half, axis=1)
+    mean /= _window_counts(height, half)[:, None]
+    mean /= _window_counts(width, half)[None, :]
+    mean *= 1.0 - sensitivity
+    return gray <= mean
+
+
+def estimate_skew(ink, max_angle=MAX_SKEW_ANGLE, step=SKEW_STEP, sample=SKEW_SAMPLE_POINTS):
+    """
+    기울기 보정 각도 추정 (도, deskew/PIL rotate에 그대로 넘기는 값, 양수 = 반시계 방향)
+
+    글자 픽셀을 각도별로 회전했을 때의 행 히스토그램 제곱합이 최대인 각도
+    (글줄이 수평이면 행마다 글자가 몰려 히스토그램이 뾰족해짐)
+    """
+    ys, xs = np.nonzero(ink)
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > sample:
+        pick = np.random.default_rng(0).choice(len(ys), sample, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    radians = np.deg2rad(angles)
+    # (각도 수 × 점 수) 회전 후 행 좌표
+    rotated = np.rint(np.outer(np.cos(radians), ys) - np.outer(np.sin(radians), xs)).astype(np.int64)
+    rotated -= rotated.min()
+    bins = int(rotated.max()) + 1
+    offsets = (np.arange(len(angles)) * bins)[:, None]
+    histograms = np.bincount((rotated + offsets).ravel(), minlength=len(angles) * bins)
+    scores = (histograms.reshape(len(angles), bins).astype(np.float64) ** 2).sum(axis=1)
+    return round(float(angles[int(np.argmax(scores))]), 3)
+
+
+def deskew(ink, angle):
+    """글자 배열을 angle도 회전 (PIL 회전, 빈 영역은 배경)"""
+    from PIL import Image
+    mask = Image.fromarray(np.where(ink, 255, 0).astype(np.uint8))
+    rotated = mask.rotate(angle, resample=Image.NEAREST, fillcolor=0)
+    return np.asarray(rotated) > 127
+
+
+def despeckle(ink, min_neighbors=DESPECKLE_MIN_NEIGHBORS):
+    """8방향 이웃 글자 수가 min_neighbors보다 적은 글자 픽셀 제거"""
+    padded = np.pad(ink, 1).astype(np.uint8)
+    height, width = ink.shape
+    neighbors = np.zeros(ink.shape, dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            neighbors += padded[dy:dy + height, dx:dx + width]
+    return ink & (neighbors >= min_neighbors)
+
+
+def find_column_split(ink, search=COLUMN_SEARCH, min_gap_ratio=COLUMN_MIN_GAP_RATIO,
+                      gap_ink_ratio=COLUMN_GAP_INK_RATIO):
+    """
+    2단 편집 페이지의 단 사이 여백 위치 (열 번호, 없으면 None)
+
+    가운데 범위에서 글자가 거의 없는 열이 가장 길게 이어진 구간의 중앙
+    (양쪽 단 모두 전체 글자의 10% 이상일 때만)
+    """
+    height, width = ink.shape
+    profile = ink.sum(axis=0)
+    start, end = int(width * search[0]), int(width * search[1])
+    empty = profile[start:end] <= height * gap_ink_ratio
+    if not empty.any():
+        return None
+
+    # 빈 열 연속 구간 (시작, 끝) 중 가장 긴 것
+    edges = np.diff(np.concatenate(([0], empty.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    longest = int(np.argmax(run_ends - run_starts))
+    if run_ends[longest] - run_starts[longest] < width * min_gap_ratio:
+        return None
+
+    split = start + (run_starts[longest] + run_ends[longest]) // 2
+    total = profile.sum()
+    left = profile[:split].sum()
+    if total == 0 or min(left, total - left) < total * 0.1:
+        return None
+    return int(split)
+
+
+def _crop_ink_rows(ink):
+    """위아래 빈 행 잘라내기"""
+    rows = np.flatnonzero(ink.any(axis=1))
+    return ink[rows[0]:rows[-1] + 1] if len(rows) else ink
+
+
+def stack_columns(ink, split):
+    """왼쪽 단 아래에 오른쪽 단을 이어 붙인 배열 (Tesseract가 단 순서대로 읽도록)"""
+    left, right = _crop_ink_rows(ink[:, :split]), _crop_ink_rows(ink[:, split:])
+    width = max(left.shape[1], right.shape[1])
+    separator = np.zeros((COLUMN_SEPARATOR, width), dtype=bool)
+    pad = lambda part: np.pad(part, ((0, 0), (0, width - part.shape[1])))
+    return np.vstack([pad(left), separator, pad(right)])
+
+
+def preprocess_for_ocr(image, deskew_page=True, despeckle_page=True, split_columns=False):
+    """
+    PIL 이미지 → OCR용 흑백 'L' 이미지 (검은 글자, 흰 배경)
+
+    pdf_ocr_cache.ocr_pages(preprocess=...)에 그대로 넘길 수 있음
+    """
+    if not NUMPY_AVAILABLE:
+        from pdf_ocr_cache import enhance_for_ocr
+        return enhance_for_ocr(image)
+
+    from PIL import Image
+    ink = adaptive_binarize(to_grayscale(image))
+    if despeckle_page:
+        ink = despeckle(ink)
+    if deskew_page:
+        angle = estimate_skew(ink)
+        if abs(angle) >= MIN_SKEW_ANGLE:
+            ink = deskew(ink, angle)
+    if split_columns:
+        split = find_column_split(ink)
+        if split is not None:
+            ink = stack_columns(ink, split)
+    return Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+
+
+def preprocess_two_column(image):
+    """2단 편집 페이지용 전처리 (단 나누기 포함)"""
+    return preprocess_for_ocr(image, split_columns=True)
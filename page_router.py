@@ -0,0 +1,264 @@
+# page_router.py
+# 페이지별 텍스트 레이어 / OCR 경로 선택 (텍스트 레이어 품질 점수 → 품질이 낮은 페이지만 OCR)
+
+"""
+교재 PDF에는 스캔 페이지와 텍스트 레이어가 있는 페이지가 섞여 있고, OCR은 텍스트 추출보다
+약 100배 느립니다. 페이지마다 텍스트 레이어 품질을 점수화해서 품질이 낮은 페이지만
+pdf_ocr_cache로 보내고, 판정 결과를 저장해 다음 실행에서는 점수 계산도 건너뜁니다.
+
+사용 예시:
+    from page_router import get_page_router
+
+    router = get_page_router()
+    texts = router.page_texts(pdf_path)                 # {페이지: 텍스트} (텍스트 레이어 또는 OCR)
+    decisions = router.route_pages(pdf_path)            # {페이지: {'route': 'text'|'ocr', 'reason', ...}}
+
+    python page_router.py 교재.pdf                       # 페이지별 판정 표
+    python page_router.py 교재.pdf --ocr --output out.txt
+
+판정 저장: data/pdf_text_cache/<sha256>.routes.json
+    {"hash", "policy", "pages": {"0": {"route", "reason", "chars", "hangul_ratio",
+                                        "garbage_ratio", "math_density"}}}
+판정 기준(ROUTING_POLICY)이 바뀌면 저장된 판정은 무시하고 다시 계산합니다.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from pdf_text_cache import CACHE_DIR, get_pdf_text_cache
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+ROUTE_TEXT = 'text'
+ROUTE_OCR = 'ocr'
+
+# 판정 기준 (하나라도 걸리면 OCR)
+ROUTING_POLICY = {
+    'min_chars': 40,             # 공백 제외 글자 수가 이보다 적으면 스캔 페이지로 판단
+    'max_garbage_ratio': 0.05,   # 깨진 글자 비율 상한
+    'min_hangul_ratio': 0.05,    # 한글 비율이 이보다 낮고
+    'min_math_density': 0.10,    # 숫자/수식 기호 비율도 이보다 낮으면 인코딩이 깨진 페이지로 판단
+}
+
+MATH_SYMBOLS = set('=+-×÷<>≤≥≠()[]{}^/√∫∑πθαβ∞′·')
+_CID_GLYPH = re.compile(r'\(cid:\d+\)')   # 폰트 매핑이 없는 글리프 (pdfplumber 출력)
+
+
+def score_page_text(text):
+    """
+    텍스트 레이어 품질 지표
+
+    Returns:
+        {'chars': 공백 제외 글자 수, 'hangul_ratio', 'garbage_ratio', 'math_density'}
+    """
+    text = text or ''
+    cid_count = len(_CID_GLYPH.findall(text))
+    if cid_count:
+        text = _CID_GLYPH.sub('\ufffd', text)
+    stripped = [ch for ch in text if not ch.isspace()]
+    if not stripped:
+        return {'chars': 0, 'hangul_ratio': 0.0, 'garbage_ratio': 0.0, 'math_density': 0.0}
+
+    hangul = garbage = math = 0
+    for ch in stripped:
+        if '가' <= ch <= '힣' or 'ㄱ' <= ch <= 'ㆎ':
+            hangul += 1
+        elif ch.isdigit() or ch in MATH_SYMBOLS:
+            math += 1
+        elif (ch == '\ufffd' or ord(ch) < 32 or '\ue000' <= ch <= '\uf8ff'
+              or '\u00c0' <= ch <= '\u00ff'):
+            # 대체 문자, 제어 문자, 사용자 정의 영역, 한글 폰트가 Latin-1로 깨진 글자(À-ÿ)
+            garbage += 1
+    total = len(stripped)
+    return {
+        'chars': total,
+        'hangul_ratio': hangul / total,
+        'garbage_ratio': garbage / total,
+        'math_density': math / total,
+    }
+
+
+def route_page(metrics, policy=ROUTING_POLICY):
+    """품질 지표 → (경로, 이유)"""
+    if metrics['chars'] < policy['min_chars']:
+        return ROUTE_OCR, 'too_few_chars'
+    if metrics['garbage_ratio'] > policy['max_garbage_ratio']:
+        return ROUTE_OCR, 'garbage_glyphs'
+    if (metrics['hangul_ratio'] < policy['min_hangul_ratio']
+            and metrics['math_density'] < policy['min_math_density']):
+        return ROUTE_OCR, 'no_hangul_or_math'
+    return ROUTE_TEXT, 'text_layer_ok'
+
+
+def _policy_key(policy):
+    return hashlib.sha256(json.dumps(policy, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+class PageRouter:
+    """페이지별 텍스트 레이어 / OCR 경로 선택 + 판정 저장"""
+
+    def __init__(self, cache_dir=CACHE_DIR, policy=ROUTING_POLICY):
+        self.cache_dir = Path(cache_dir)
+        self.policy = dict(policy)
+        self._policy_key = _policy_key(self.policy)
+        self._entries = {}  # PDF 해시 -> 판정 항목
+
+    # ---- 판정 저장 ----
+
+    def _entry_path(self, file_hash):
+        return self.cache_dir / f"{file_hash}.routes.json"
+
+    def _load_entry(self, file_hash):
+        entry = self._entries.get(file_hash)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._entry_path(file_hash), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+        if not entry or entry.get('policy') != self._policy_key:
+            entry = {'hash': file_hash, 'policy': self._policy_key, 'pages': {}}
+        self._entries[file_hash] = entry
+        return entry
+
+    def _save_entry(self, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(entry['hash'])
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    # ---- 공개 API ----
+
+    def route_pages(self, pdf_path, page_nums=None, max_workers=1):
+        """
+        페이지별 판정 (저장된 판정이 없는 페이지만 텍스트 레이어를 읽어 점수 계산)
+
+        Args:
+            pdf_path: PDF 경로
+            page_nums: 페이지 번호 목록 (0부터, None이면 전체)
+            max_workers: 텍스트 레이어 추출 프로세스 수 (pdf_text_cache와 같음)
+
+        Returns:
+            {페이지: {'route', 'reason', 'chars', 'hangul_ratio', 'garbage_ratio', 'math_density'}}
+            (PDF 라이브러리가 없으면 None)
+        """
+        text_cache = get_pdf_text_cache()
+        page_count = text_cache.page_count(pdf_path)
+        if page_count is None:
+            return None
+        page_nums = range(page_count) if page_nums is None else [p for p in page_nums if p < page_count]
+
+        entry = self._load_entry(text_cache.file_hash(pdf_path))
+        decisions = entry['pages']
+        missing = [page_num for page_num in page_nums if str(page_num) not in decisions]
+        if missing:
+            start, end = min(missing), max(missing) + 1
+            texts = text_cache.get_pages(pdf_path, start, end, max_workers=max_workers)
+            if texts is None:
+                return None
+            for page_num in missing:
+                metrics = score_page_text(texts[page_num - start])
+                route, reason = route_page(metrics, self.policy)
+                decisions[str(page_num)] = dict(metrics, route=route, reason=reason)
+            self._save_entry(entry)
+
+        return {page_num: decisions[str(page_num)] for page_num in page_nums}
+
+    def page_texts(self, pdf_path, page_nums=None, max_workers=1, **ocr_options):
+        """
+        페이지별 텍스트 (텍스트 레이어 품질이 낮은 페이지만 OCR)
+
+        Args:
+            ocr_options: pdf_ocr_cache.ocr_page_texts 옵션 (dpi, lang, config, ...)
+
+        Returns:
+            {페이지: 텍스트} (OCR이 불가능하면 해당 페이지는 텍스트 레이어 그대로)
+        """
+        decisions = self.route_pages(pdf_path, page_nums, max_workers)
+        if decisions is None:
+            return None
+
+        text_cache = get_pdf_text_cache()
+        texts = {}
+        for page_num in decisions:
+            texts[page_num] = text_cache.get_pages(pdf_path, page_num, page_num + 1)[0]
+
+        ocr_pages = [p for p, decision in decisions.items() if decision['route'] == ROUTE_OCR]
+        if ocr_pages:
+            from pdf_ocr_cache import ocr_page_texts
+            ocr_options.setdefault('max_workers', max_workers if max_workers > 1 else None)
+            ocr_texts = ocr_page_texts(pdf_path, ocr_pages, **ocr_options) or {}
+            texts.update(ocr_texts)
+        return texts
+
+
+_page_router = None
+
+
+def get_page_router():
+    """프로세스 공용 라우터 인스턴스"""
+    global _page_router
+    if _page_router is None:
+        _page_router = PageRouter()
+    return _page_router
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF 페이지별 텍스트 레이어/OCR 판정')
+    parser.add_argument('pdf', type=str, help='PDF 파일')
+    parser.add_argument('--pages', type=str, help='페이지 범위 (1부터, 예: 1-10)')
+    parser.add_argument('--ocr', action='store_true', help='판정대로 텍스트 추출 (OCR 포함)')
+    parser.add_argument('--workers', type=int, default=1, help='추출/OCR 프로세스 수')
+    parser.add_argument('--output', type=str, help='추출 텍스트 저장 경로 (--ocr와 함께)')
+
+    args = parser.parse_args()
+
+    page_nums = None
+    if args.pages:
+        first, _, last = args.pages.partition('-')
+        page_nums = range(int(first) - 1, int(last or first))
+
+    router = get_page_router()
+    decisions = router.route_pages(args.pdf, page_nums, args.workers)
+    if decisions is None:
+        print('❌ PDF를 읽을 수 없습니다.')
+        return False
+
+    print(f"{'페이지':>6} {'경로':<5} {'글자':>6} {'한글':>6} {'깨짐':>6} {'수식':>6}  이유")
+    for page_num, decision in decisions.items():
+        print(f"{page_num + 1:>6} {decision['route']:<5} {decision['chars']:>6} "
+              f"{decision['hangul_ratio']:>6.2f} {decision['garbage_ratio']:>6.2f} "
+              f"{decision['math_density']:>6.2f}  {decision['reason']}")
+    ocr_count = sum(1 for decision in decisions.values() if decision['route'] == ROUTE_OCR)
+    print(f"\nOCR 대상: {ocr_count}/{len(decisions)} 페이지")
+
+    if args.ocr:
+        texts = router.page_texts(args.pdf, page_nums, args.workers)
+        if texts is None:
+            return False
+        joined = ''.join(texts[page_num] + "\n" for page_num in sorted(texts))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(joined)
+            print(f"[저장] {args.output}")
+        else:
+            print(joined)
+
+    return True
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
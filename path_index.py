@@ -0,0 +1,229 @@
+# path_index.py
+# MathPDF organized 폴더 경로 인덱스 (rglob 대체, 디렉토리 mtime 기반 증분 갱신)
+
+"""
+사용 예시:
+    from path_index import glob_indexed, find_newest
+
+    # 기존 glob/rglob 대체 (확장자와 관계없이 모든 파일을 인덱스)
+    pdfs = glob_indexed(organized_dir, '*드릴*P1*문제*.pdf')
+    newest = find_newest(base_dir, '*.pdf')
+"""
+
+import fnmatch
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+INDEX_FILE = Path(__file__).resolve().parent / 'data' / 'path_index.json'
+INDEX_VERSION = 2   # 형식이 바뀌면 올림 (이전 인덱스는 버리고 다시 읽음)
+
+# 인덱스에서 제외할 폴더
+SKIP_DIRS = {'node_modules', '.git', '__pycache__', '.venv', 'venv'}
+
+# 파일명 규칙: 수1_2025학년도_현우진_드릴_P1_문제(_deepseek).pdf
+NAME_PATTERN = re.compile(
+    r'^(?P<subject>수1|수2|미적분|확통|기하)_(?P<year>\d{4})학년도_(?P<book>.+?)_'
+    r'(?P<part>P\d+|\d{2})_(?P<kind>문제|해설)'
+)
+
+
+def parse_name(filename):
+    """
+    파일명에서 (과목, 학년도, 책, 파트, 종류) 추출
+
+    Returns:
+        {'subject', 'year', 'book', 'part', 'kind'} 또는 None (규칙과 다른 이름)
+    """
+    match = NAME_PATTERN.match(filename)
+    if not match:
+        return None
+    info = match.groupdict()
+    info['year'] = int(info['year'])
+    return info
+
+
+class PathIndex:
+    """
+    디렉토리 트리 경로 인덱스
+
+    - 디렉토리별 mtime을 저장하고, mtime이 바뀐 디렉토리만 다시 읽음
+      (파일 추가/삭제/이름 변경은 부모 디렉토리 mtime을 바꾸므로 감지됨)
+    - 파일 자체의 수정 시간은 해당 디렉토리를 다시 읽을 때 갱신됨
+      (제자리에서 다시 쓴 파일은 디렉토리 mtime이 그대로이므로 find_newest는 후보 파일을 직접 stat)
+    """
+
+    def __init__(self, index_file=INDEX_FILE, max_age=5.0):
+        self.index_file = Path(index_file)
+        self.max_age = max_age  # 같은 루트를 이 시간(초) 안에 다시 갱신하지 않음
+        self.dirs = {}  # 디렉토리 경로 -> {'mtime', 'subdirs': [...], 'files': {이름: [mtime, size]}}
+        self.dirty = False
+        self._refreshed_at = {}  # 루트 -> (갱신 시각, 하위 디렉토리까지 갱신했는지)
+        self.load()
+
+    def load(self):
+        """인덱스 파일 로드"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.dirs = data.get('dirs', {})
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"[경고] 경로 인덱스 로드 실패: {e}")
+            self.dirs = {}
+
+    def save(self):
+        """인덱스 파일 저장 (변경이 있을 때만)"""
+        if not self.dirty:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'dirs': self.dirs}, f, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+        self.dirty = False
+
+    def refresh(self, root, force=False, recursive=True):
+        """
+        root 이하 인덱스 증분 갱신
+
+        Args:
+            root: 기준 디렉토리
+            force: True면 max_age와 관계없이 갱신
+            recursive: False면 root 디렉토리만 확인 (하위 트리는 걷지 않음)
+        """
+        root = os.path.abspath(str(root))
+        now = time.monotonic()
+        refreshed_at, refreshed_recursive = self._refreshed_at.get(root, (float('-inf'), False))
+        if (not force and now - refreshed_at < self.max_age
+                and (refreshed_recursive or not recursive)):
+            return
+
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                self._purge(directory)
+                continue
+
+            record = self.dirs.get(directory)
+            if record is None or record['mtime'] != mtime:
+                record = self._scan_dir(directory, mtime, record)
+
+            if recursive:
+                stack.extend(os.path.join(directory, name) for name in record['subdirs'])
+
+        self._refreshed_at[root] = (now, recursive)
+        self.save()
+
+    def _scan_dir(self, directory, mtime, old_record):
+        """디렉토리 한 단계만 다시 읽기"""
+        subdirs = []
+        files = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                subdirs.append(entry.name)
+                        else:
+                            stat = entry.stat()
+                            files[entry.name] = [stat.st_mtime, stat.st_size]
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        # 사라진 하위 디렉토리 제거
+        if old_record:
+            for name in set(old_record['subdirs']) - set(subdirs):
+                self._purge(os.path.join(directory, name))
+
+        record = {'mtime': mtime, 'subdirs': sorted(subdirs), 'files': files}
+        self.dirs[directory] = record
+        self.dirty = True
+        return record
+
+    def _purge(self, directory):
+        """디렉토리와 하위 항목을 인덱스에서 제거"""
+        record = self.dirs.pop(directory, None)
+        if record is None:
+            return
+        self.dirty = True
+        for name in record['subdirs']:
+            self._purge(os.path.join(directory, name))
+
+    def iter_files(self, root, recursive=True):
+        """
+        root 이하 인덱스된 파일 순회
+
+        Yields:
+            (Path, mtime, size)
+        """
+        root = os.path.abspath(str(root))
+        self.refresh(root, recursive=recursive)
+
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            record = self.dirs.get(directory)
+            if record is None:
+                continue
+            for name in sorted(record['files']):
+                mtime, size = record['files'][name]
+                yield Path(directory) / name, mtime, size
+            if recursive:
+                stack.extend(os.path.join(directory, name) for name in reversed(record['subdirs']))
+
+    def glob(self, root, pattern, recursive=False):
+        """Path.glob / Path.rglob 대체 (파일명 패턴만 지원)"""
+        return [path for path, _, _ in self.iter_files(root, recursive)
+                if fnmatch.fnmatch(path.name, pattern)]
+
+
+_path_index = None
+
+
+def get_path_index():
+    """프로세스 공용 인덱스 (최초 호출 시 한 번만 로드)"""
+    global _path_index
+    if _path_index is None:
+        _path_index = PathIndex()
+    return _path_index
+
+
+def glob_indexed(directory, pattern, recursive=False):
+    """인덱스 기반 glob (directory가 없으면 빈 리스트)"""
+    if not Path(directory).exists():
+        return []
+    return get_path_index().glob(directory, pattern, recursive)
+
+
+def find_newest(directory, pattern):
+    """
+    directory 이하에서 패턴에 맞는 가장 최근 수정 파일
+
+    후보 목록은 인덱스에서, 수정 시간은 후보 파일만 직접 stat
+    (제자리에서 다시 쓴 파일은 디렉토리 mtime이 바뀌지 않아 인덱스 mtime이 오래됐을 수 있음)
+    """
+    if not Path(directory).exists():
+        return None
+    newest = None
+    newest_mtime = None
+    for path, _, _ in get_path_index().iter_files(directory):
+        if not fnmatch.fnmatch(path.name, pattern):
+            continue
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if newest_mtime is None or mtime > newest_mtime:
+            newest, newest_mtime = path, mtime
+    return newest
@@ -5,38 +5,56 @@
 import re
 import json
 import os
+from bisect import bisect_right
 from pathlib import Path
 from typing import List, Dict, Tuple
-from dataclasses import dataclass, asdict
 from datetime import datetime
 
-try:
-    import PyPDF2
-    PDF_LIBRARY = 'PyPDF2'
-except ImportError:
-    try:
-        import pdfplumber
-        PDF_LIBRARY = 'pdfplumber'
-    except ImportError:
-        try:
-            import fitz  # PyMuPDF
-            PDF_LIBRARY = 'pymupdf'
-        except ImportError:
-            PDF_LIBRARY = None
+from pdf_text_cache import available_backends, get_page_texts
+from pdf_segmenter import join_pages, missing_numbers, segment_pdf, segment_text
+from problem_store import ProblemStore, EXTRACTED_PROBLEM_SCHEMA
+
+# 설치된 PDF 라이브러리 (pdf_text_cache 우선순위, 없으면 None)
+PDF_LIBRARY = next(iter(available_backends()), None)
 
 
-@dataclass
 class Problem:
-    """수학 문제 데이터 구조"""
-    unit: str  # 단원 이름
-    number: int  # 문제 번호
-    content: str  # 문제 내용
-    page: int  # 페이지 번호
-    sub_problems: List[str] = None  # 하위 문제들 (가), 나), 다) 등)
+    """수학 문제 데이터 구조 (__slots__: 인스턴스마다 dict를 만들지 않음)"""
+
+    __slots__ = ('unit', 'number', 'content', 'page', 'sub_problems')
+
+    def __init__(self, unit: str, number: int, content: str, page: int,
+                 sub_problems: List[str] = None):
+        self.unit = unit  # 단원 이름
+        self.number = number  # 문제 번호
+        self.content = content  # 문제 내용
+        self.page = page  # 페이지 번호
+        self.sub_problems = sub_problems if sub_problems is not None else []  # 하위 문제들 (가), 나), 다) 등)
 
-    def __post_init__(self):
-        if self.sub_problems is None:
-            self.sub_problems = []
+    def __repr__(self):
+        return (f"Problem(unit={self.unit!r}, number={self.number!r}, content={self.content!r}, "
+                f"page={self.page!r}, sub_problems={self.sub_problems!r})")
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+def problems_to_store(units_problems: Dict[str, List[Problem]]) -> ProblemStore:
+    """단원별 문제를 컬럼 저장소로 변환 (단원은 범주형, 본문은 텍스트 컬럼)"""
+    records = (
+        {
+            'unit': p.unit,
+            'number': p.number,
+            'page': p.page,
+            'content': p.content,
+            'sub_problems': p.sub_problems,
+        }
+        for problems in units_problems.values()
+        for p in problems
+    )
+    return ProblemStore.from_records(records, EXTRACTED_PROBLEM_SCHEMA)
 
 
 class PDFMathExtractor:
@@ -63,29 +81,9 @@ class PDFMathExtractor:
     
     def extract_text(self) -> List[Tuple[int, str]]:
         """PDF에서 텍스트 추출 (페이지 번호와 함께)"""
-        pages_text = []
-        
-        if PDF_LIBRARY == 'PyPDF2':
-            with open(self.pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages, start=1):
-                    text = page.extract_text()
-                    pages_text.append((page_num, text))
-        
-        elif PDF_LIBRARY == 'pdfplumber':
-            import pdfplumber
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text() or ''
-                    pages_text.append((page_num, text))
-        
-        elif PDF_LIBRARY == 'pymupdf':
-            import fitz
-            doc = fitz.open(self.pdf_path)
-            for page_num, page in enumerate(doc, start=1):
-                text = page.get_text()
-                pages_text.append((page_num, text))
-            doc.close()
+        # 페이지 텍스트 캐시 사용 (같은 PDF/페이지는 한 번만 파싱)
+        pages = get_page_texts(self.pdf_path) or []
+        pages_text = [(page_num, text) for page_num, text in enumerate(pages, start=1)]
         
         return pages_text
     
@@ -182,13 +180,53 @@ class PDFMathExtractor:
         
         return problems
     
+    def extract_by_spans(self, unit_patterns: List[Tuple[str, int]],
+                         spans: List[Dict]) -> Dict[str, List[Problem]]:
+        """
+        단어 좌표 분할 결과(pdf_segmenter)로 단원별 문제 구성
+
+        문제 구간의 시작 위치가 속한 단원(그 앞에서 가장 가까운 단원 제목)에 배정
+        """
+        ordered = sorted(unit_patterns, key=lambda unit: unit[1])
+        positions = [pos for _, pos in ordered]
+        units_problems: Dict[str, List[Problem]] = {name: [] for name, _ in unit_patterns}
+
+        for span in spans:
+            index = bisect_right(positions, span['offset']) - 1
+            unit_name = ordered[max(index, 0)][0]
+            content = span['text']
+            sub_problems = re.findall(r'([가-힣])\)\s*([^\n]+)', content)
+            units_problems[unit_name].append(Problem(
+                unit=unit_name,
+                number=span['number'],
+                content=content,
+                page=span['page'],
+                sub_problems=[f"{sub[0]}) {sub[1]}" for sub in sub_problems]
+            ))
+
+        return units_problems
+
     def process(self) -> Dict[str, List[Problem]]:
         """PDF 처리 메인 함수"""
         print(f"📄 PDF 파일 읽는 중: {self.pdf_path.name}")
-        pages_text = self.extract_text()
-        
-        # 전체 텍스트 합치기
-        all_text = '\n'.join([text for _, text in pages_text])
+
+        # 단어 좌표 기반 분할 우선 (2단 편집도 단 순서대로 읽고, 문제마다 실제 페이지 기록)
+        segmented = segment_pdf(self.pdf_path)
+        spans = segmented['problems'] if segmented else []
+        all_text = segmented['text'] if spans else ''
+        if spans and missing_numbers(spans):
+            # 번호가 빠졌으면 페이지 텍스트로 나눈 결과와 비교 (문제를 더 많이 찾은 쪽)
+            text, page_starts = join_pages(get_page_texts(self.pdf_path) or [])
+            text_spans = segment_text(text, page_starts)
+            if len(text_spans) > len(spans):
+                spans, all_text = text_spans, text
+        if spans:
+            pages_text = None
+        else:
+            pages_text = self.extract_text()
+
+            # 전체 텍스트 합치기
+            all_text = '\n'.join([text for _, text in pages_text])
         
         print("🔍 단원 패턴 검색 중...")
         unit_patterns = self.detect_unit_patterns(all_text)
@@ -202,7 +240,10 @@ class PDFMathExtractor:
             print(f"   - {unit_name}")
         
         print("\n📝 문제 추출 중...")
-        units_problems = self.extract_by_units(unit_patterns, all_text, pages_text)
+        if spans:
+            units_problems = self.extract_by_spans(unit_patterns, spans)
+        else:
+            units_problems = self.extract_by_units(unit_patterns, all_text, pages_text)
         
         total_problems = sum(len(probs) for probs in units_problems.values())
         print(f"✅ 총 {total_problems}개의 문제를 추출했습니다.\n")
@@ -273,6 +314,17 @@ class PDFMathExtractor:
             print(f"💾 저장: {file_path}")
         
         return str(output_path)
+    
+    def save_to_store(self, output_path: str = None):
+        """결과를 컬럼 저장소(.pstore, 메모리 맵으로 로드 가능)로 저장"""
+        if output_path is None:
+            output_path = self.pdf_path.stem + '_extracted.pstore'
+        
+        store = problems_to_store(self.process())
+        store.save(output_path)
+        
+        print(f"💾 결과를 저장했습니다: {output_path} ({len(store)}개 문제)")
+        return output_path
 
 
 def main():
@@ -281,7 +333,7 @@ def main():
     
     if len(sys.argv) < 2:
         print("사용법: python pdf_math_extractor.py <PDF파일경로> [출력형식]")
-        print("출력형식: json (기본값) 또는 text")
+        print("출력형식: json (기본값), text 또는 store (.pstore 컬럼 저장소)")
         sys.exit(1)
     
     pdf_path = sys.argv[1]
@@ -292,6 +344,8 @@ def main():
         
         if output_format.lower() == 'text':
             extractor.save_to_text_files()
+        elif output_format.lower() == 'store':
+            extractor.save_to_store()
         else:
             extractor.save_to_json()
         
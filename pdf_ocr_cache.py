@@ -0,0 +1,438 @@
+# pdf_ocr_cache.py
+# 스캔본 PDF 일괄 OCR (페이지 구간당 렌더링 1회 + 프로세스 병렬 Tesseract + 이미지/텍스트 캐시)
+
+"""
+extract_direct_poppler / extract_problem_solution_ocr / extract_with_pdfplumber가
+페이지마다 렌더러를 새로 띄우고 OCR을 순차로 돌리던 부분을 모은 모듈입니다.
+
+- 렌더링: 캐시에 없는 페이지를 연속 구간으로 묶어 구간마다 렌더러를 한 번만 실행
+  (pdftocairo/pdftoppm -f/-l, pdf2image first_page/last_page, PyMuPDF는 문서를 한 번만 열기)
+- OCR: 렌더링된 PNG 경로를 프로세스 풀에 나눠서 pytesseract 실행
+- 캐시: (PDF 해시, 페이지, DPI) → PNG, (PDF 해시, 페이지, DPI, 언어, 설정) → 텍스트
+  → 같은 스캔본은 설정마다 한 번만 OCR
+
+사용 예시:
+    from pdf_ocr_cache import ocr_page_texts
+
+    texts = ocr_page_texts(pdf_path, range(0, 20), max_workers=4)     # {페이지: 텍스트}
+    texts = ocr_page_texts(pdf_path, [0], dpi=600, lang=('kor+eng', 'kor', 'eng'),
+                           config='--oem 3 --psm 6', min_chars=50,
+                           renderers=('pdftocairo', 'pdftoppm'))
+
+저장 위치: data/pdf_ocr_cache/<sha256>/
+    p0001_300dpi.png                                  렌더링 이미지 (페이지 번호는 1부터)
+    ocr_300dpi_<언어>_<설정 해시>.json.gz             {"hash", "dpi", "lang", "config", "pages": {"0": "..."}}
+PDF 해시는 pdf_text_cache와 같은 해시 색인(경로+mtime+크기)을 재사용합니다.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pdf_text_cache import get_pdf_text_cache
+
+try:
+    import pytesseract
+    # Tesseract 경로 설정 (Windows 일반 설치 경로)
+    possible_paths = [
+        r'C:\Program Files\Tesseract-OCR\tesseract.exe',
+        r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
+        r'C:\Users\{}\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            pytesseract.pytesseract.tesseract_cmd = path
+            break
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+CACHE_DIR = Path(__file__).resolve().parent / 'data' / 'pdf_ocr_cache'
+
+DEFAULT_DPI = 300
+DEFAULT_LANG = 'kor+eng'
+
+# 렌더러 우선순위 (설치/발견된 것 중 앞에서부터)
+RENDERERS = ('pymupdf', 'pdftocairo', 'pdftoppm', 'pdf2image')
+
+# Poppler 실행 파일 후보 경로 (없으면 PATH에서 찾음)
+POPPLER_DIRS = [
+    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0\Library\bin',
+    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0\bin',
+    r'C:\Users\a\Downloads\Release-25.12.0-0\bin',
+    r'C:\Users\a\Downloads\Release-25.12.0-0\poppler-25.12.0',
+]
+
+RENDER_TIMEOUT_PER_PAGE = 30   # 초 (Poppler 실행 1회 제한 = 페이지 수 × 이 값)
+
+# 병렬 OCR: OCR할 페이지가 이 수 이상일 때만 프로세스 풀 사용
+PARALLEL_MIN_PAGES = 2
+
+_POPPLER_PAGE = re.compile(r'-(\d+)\.png$')
+
+
+# ========== 렌더러 ==========
+
+def find_poppler(exe_name):
+    """Poppler 실행 파일 경로 (pdftocairo/pdftoppm, 없으면 None)"""
+    suffix = '.exe' if sys.platform == 'win32' else ''
+    for poppler_dir in POPPLER_DIRS:
+        candidate = os.path.join(poppler_dir, exe_name + suffix)
+        if os.path.exists(candidate):
+            return candidate
+    return shutil.which(exe_name)
+
+
+def available_renderers(order=RENDERERS):
+    """사용 가능한 렌더러 (order 순서)"""
+    renderers = []
+    for renderer in order:
+        if renderer == 'pymupdf':
+            try:
+                import fitz  # noqa: F401
+            except ImportError:
+                continue
+        elif renderer == 'pdf2image':
+            try:
+                import pdf2image  # noqa: F401
+            except ImportError:
+                continue
+            if not find_poppler('pdftoppm'):
+                continue
+        elif not find_poppler(renderer):
+            continue
+        renderers.append(renderer)
+    return renderers
+
+
+def contiguous_runs(page_nums):
+    """[0, 1, 2, 5, 6] → [(0, 2), (5, 6)] (양끝 포함)"""
+    runs = []
+    for page_num in sorted(set(page_nums)):
+        if runs and page_num == runs[-1][1] + 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return [tuple(run) for run in runs]
+
+
+def _render_pymupdf(pdf_path, runs, dpi, target):
+    """PyMuPDF: 문서를 한 번 열고 모든 구간 렌더링"""
+    import fitz
+    rendered = {}
+    doc = fitz.open(pdf_path)
+    try:
+        matrix = fitz.Matrix(dpi / 72, dpi / 72)
+        for first, last in runs:
+            for page_num in range(first, min(last, len(doc) - 1) + 1):
+                path = target(page_num)
+                doc[page_num].get_pixmap(matrix=matrix).save(str(path))
+                rendered[page_num] = path
+    finally:
+        doc.close()
+    return rendered
+
+
+def _render_poppler(exe_name, pdf_path, runs, dpi, target, work_dir):
+    """pdftocairo/pdftoppm: 구간마다 한 번 실행 (-f/-l), 출력 PNG를 캐시 위치로 이동"""
+    exe = find_poppler(exe_name)
+    poppler_bin = os.path.dirname(exe)
+    env = os.environ.copy()
+    if poppler_bin not in env.get('PATH', ''):
+        env['PATH'] = poppler_bin + os.pathsep + env.get('PATH', '')   # DLL 찾기용
+
+    rendered = {}
+    for first, last in runs:
+        with tempfile.TemporaryDirectory(dir=work_dir) as temp_dir:
+            cmd = [exe, '-png', '-r', str(dpi), '-f', str(first + 1), '-l', str(last + 1),
+                   str(pdf_path), os.path.join(temp_dir, 'page')]
+            timeout = RENDER_TIMEOUT_PER_PAGE * (last - first + 1)
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, env=env,
+                                        cwd=poppler_bin, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                print(f'[오류] {exe_name} 실행 시간 초과 (페이지 {first + 1}-{last + 1})')
+                continue
+            if result.returncode != 0:
+                print(f'[오류] {exe_name} 실행 실패 (코드: {result.returncode}): {result.stderr.strip()}')
+                continue
+            # 출력 파일명: page-1.png / page-01.png (전체 페이지 수 자릿수만큼 0 채움)
+            for image_file in Path(temp_dir).glob('page-*.png'):
+                match = _POPPLER_PAGE.search(image_file.name)
+                if match:
+                    page_num = int(match.group(1)) - 1
+                    os.replace(image_file, target(page_num))
+                    rendered[page_num] = target(page_num)
+    return rendered
+
+
+def _render_pdf2image(pdf_path, runs, dpi, target):
+    """pdf2image: 구간마다 convert_from_path 한 번"""
+    from pdf2image import convert_from_path
+    poppler_path = os.path.dirname(find_poppler('pdftoppm'))
+    rendered = {}
+    for first, last in runs:
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=first + 1, last_page=last + 1,
+                                   poppler_path=poppler_path)
+        for page_num, image in zip(range(first, last + 1), images):
+            image.save(target(page_num))
+            rendered[page_num] = target(page_num)
+    return rendered
+
+
+# ========== OCR 워커 ==========
+
+def enhance_for_ocr(image):
+    """전처리: 그레이스케일 → 대비 2배 → 선명도 1.5배 (extract_direct_poppler 기존 설정)"""
+    from PIL import ImageEnhance
+    if image.mode != 'L':
+        image = image.convert('L')
+    image = ImageEnhance.Contrast(image).enhance(2.0)
+    return ImageEnhance.Sharpness(image).enhance(1.5)
+
+
+def ocr_image(image, langs, config='', min_chars=0):
+    """
+    PIL 이미지 한 장 OCR
+
+    langs를 앞에서부터 시도하고 결과가 min_chars 이하이면 다음 언어로 재시도
+    (모두 짧으면 마지막으로 얻은 결과)
+    """
+    langs = (langs,) if isinstance(langs, str) else tuple(langs)
+    text = None
+    for lang in langs:
+        try:
+            text = pytesseract.image_to_string(image, lang=lang, config=config)
+        except Exception as e:
+            print(f'[경고] 언어 {lang} 실패: {e}')
+            continue
+        if text and len(text.strip()) > min_chars:
+            break
+    return text
+
+
+def _ocr_image(image_path, langs, config, min_chars, preprocess):
+    """프로세스 워커: PNG 한 장 전처리 + OCR"""
+    from PIL import Image
+    with Image.open(image_path) as image:
+        image.load()
+        if preprocess is not None:
+            image = preprocess(image)
+        return ocr_image(image, langs, config, min_chars)
+
+
+# ========== 캐시 ==========
+
+class PDFOCRCache:
+    """(PDF 해시, 페이지, DPI[, 언어, 설정]) 단위 렌더링 이미지/OCR 텍스트 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR, keep_images=True):
+        """
+        Args:
+            cache_dir: 캐시 폴더
+            keep_images: False면 렌더링 PNG를 OCR 후 삭제 (텍스트만 캐시)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.keep_images = keep_images
+        self._entries = {}  # 텍스트 항목 파일 경로 -> 항목 (프로세스 내 메모리)
+
+    def file_hash(self, pdf_path):
+        return get_pdf_text_cache().file_hash(pdf_path)
+
+    def image_path(self, file_hash, page_num, dpi):
+        return self.cache_dir / file_hash / f"p{page_num + 1:04d}_{dpi}dpi.png"
+
+    # ---- 텍스트 항목 ----
+
+    def _entry_path(self, file_hash, dpi, langs, config, preprocess):
+        setting = json.dumps([config, getattr(preprocess, '__name__', None)])
+        setting_hash = hashlib.sha256(setting.encode('utf-8')).hexdigest()[:12]
+        lang_key = re.sub(r'[^0-9A-Za-z_+-]', '_', '|'.join(langs))
+        return self.cache_dir / file_hash / f"ocr_{dpi}dpi_{lang_key}_{setting_hash}.json.gz"
+
+    def _load_entry(self, path, **fields):
+        entry = self._entries.get(path)
+        if entry is not None:
+            return entry
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, OSError, json.JSONDecodeError):
+            entry = dict(fields, pages={})
+        self._entries[path] = entry
+        return entry
+
+    def _save_entry(self, path, entry):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    # ---- 공개 API ----
+
+    def render_pages(self, pdf_path, page_nums, dpi=DEFAULT_DPI, renderers=None, image_dir=None):
+        """
+        페이지 PNG 경로 (캐시에 없는 페이지만 연속 구간별로 한 번에 렌더링)
+
+        Returns:
+            {페이지: PNG 경로} (렌더링 실패한 페이지는 빠짐)
+        """
+        file_hash = self.file_hash(pdf_path)
+        if image_dir is None:
+            target = lambda page_num: self.image_path(file_hash, page_num, dpi)
+        else:
+            target = lambda page_num: Path(image_dir) / f"p{page_num + 1:04d}_{dpi}dpi.png"
+
+        images = {}
+        missing = []
+        for page_num in page_nums:
+            path = target(page_num)
+            if path.exists():
+                images[page_num] = path
+            else:
+                missing.append(page_num)
+        if not missing:
+            return images
+
+        target(missing[0]).parent.mkdir(parents=True, exist_ok=True)
+        runs = contiguous_runs(missing)
+        for renderer in available_renderers(renderers or RENDERERS):
+            try:
+                if renderer == 'pymupdf':
+                    rendered = _render_pymupdf(pdf_path, runs, dpi, target)
+                elif renderer == 'pdf2image':
+                    rendered = _render_pdf2image(pdf_path, runs, dpi, target)
+                else:
+                    rendered = _render_poppler(renderer, pdf_path, runs, dpi, target,
+                                               target(missing[0]).parent)
+            except Exception as e:
+                print(f'[경고] {renderer} 렌더링 실패: {e}')
+                continue
+            images.update(rendered)
+            runs = contiguous_runs(p for p in missing if p not in images)
+            if not runs:
+                break
+        else:
+            if runs:
+                print(f'[오류] PDF를 이미지로 변환할 수 없습니다. (렌더러: {", ".join(renderers or RENDERERS)})')
+        return images
+
+    def ocr_pages(self, pdf_path, page_nums, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, config='',
+                  max_workers=None, min_chars=0, preprocess=None, renderers=None):
+        """
+        페이지별 OCR 텍스트 (캐시에 없는 페이지만 렌더링/OCR 후 저장)
+
+        Args:
+            pdf_path: PDF 경로
+            page_nums: 페이지 번호 목록 (0부터)
+            dpi: 렌더링 DPI
+            lang: Tesseract 언어 ('kor+eng') 또는 차례로 시도할 언어 튜플
+            config: Tesseract 옵션 (예: '--oem 3 --psm 6')
+            max_workers: OCR 프로세스 수 (None이면 CPU 수, 1이면 순차)
+            min_chars: 결과가 이 길이 이하이면 다음 언어로 재시도
+            preprocess: PIL 이미지 전처리 함수 (프로세스 풀로 넘기므로 모듈 최상위 함수)
+            renderers: 사용할 렌더러 순서 (None이면 RENDERERS)
+
+        Returns:
+            {페이지: 텍스트} (pytesseract가 없으면 None, 실패한 페이지는 빠짐)
+        """
+        if not TESSERACT_AVAILABLE:
+            print('[오류] pytesseract가 설치되지 않았습니다. pip install pytesseract')
+            return None
+
+        langs = (lang,) if isinstance(lang, str) else tuple(lang)
+        page_nums = list(dict.fromkeys(page_nums))
+        file_hash = self.file_hash(pdf_path)
+        entry_path = self._entry_path(file_hash, dpi, langs, config, preprocess)
+        entry = self._load_entry(entry_path, hash=file_hash, dpi=dpi, lang=list(langs), config=config)
+        pages = entry['pages']
+
+        missing = [page_num for page_num in page_nums if str(page_num) not in pages]
+        if missing:
+            image_dir = None if self.keep_images else tempfile.mkdtemp(prefix='ocr_')
+            try:
+                images = self.render_pages(pdf_path, missing, dpi, renderers, image_dir)
+                todo = [page_num for page_num in missing if page_num in images]
+                done = 0
+                try:
+                    for page_num, text in self._ocr_images(images, todo, langs, config, min_chars,
+                                                           preprocess, max_workers):
+                        pages[str(page_num)] = text
+                        done += 1
+                finally:
+                    # 중간에 중단돼도 이미 OCR한 페이지는 저장
+                    if done:
+                        self._save_entry(entry_path, entry)
+            finally:
+                if image_dir is not None:
+                    shutil.rmtree(image_dir, ignore_errors=True)
+
+        return {page_num: pages[str(page_num)] for page_num in page_nums if str(page_num) in pages}
+
+
+    @staticmethod
+    def _ocr_images(images, page_nums, langs, config, min_chars, preprocess, max_workers):
+        """
+        페이지별 OCR (완료되는 대로 (페이지, 텍스트) 반환)
+
+        한 페이지가 실패해도(읽을 수 없는 PNG, 워커 예외 등) 경고만 출력하고 나머지 페이지는 계속 처리
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(page_nums) >= PARALLEL_MIN_PAGES:
+            with ProcessPoolExecutor(max_workers=min(workers, len(page_nums))) as executor:
+                futures = {executor.submit(_ocr_image, str(images[p]), langs, config, min_chars, preprocess): p
+                           for p in page_nums}
+                for future in as_completed(futures):
+                    page_num = futures[future]
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        print(f'[경고] {page_num + 1}페이지 OCR 실패: {e}')
+                        continue
+                    if text is not None:
+                        yield page_num, text
+            return
+
+        for page_num in page_nums:
+            try:
+                text = _ocr_image(str(images[page_num]), langs, config, min_chars, preprocess)
+            except Exception as e:
+                print(f'[경고] {page_num + 1}페이지 OCR 실패: {e}')
+                continue
+            if text is not None:
+                yield page_num, text
+
+
+_pdf_ocr_cache = None
+
+
+def get_pdf_ocr_cache():
+    """프로세스 공용 캐시 인스턴스"""
+    global _pdf_ocr_cache
+    if _pdf_ocr_cache is None:
+        _pdf_ocr_cache = PDFOCRCache()
+    return _pdf_ocr_cache
+
+
+def ocr_page_texts(pdf_path, page_nums=None, **options):
+    """
+    페이지별 OCR 텍스트 (get_pdf_ocr_cache().ocr_pages 단축 함수)
+
+    page_nums가 None이면 전체 페이지 (페이지 수는 pdf_text_cache로 확인)
+    """
+    if page_nums is None:
+        page_count = get_pdf_text_cache().page_count(pdf_path)
+        if page_count is None:
+            print('[오류] 페이지 수를 확인할 수 없습니다. 페이지 번호를 지정하세요.')
+            return None
+        page_nums = range(page_count)
+    return get_pdf_ocr_cache().ocr_pages(pdf_path, page_nums, **options)
@@ -0,0 +1,541 @@
+# pdf_segmenter.py
+# PDF 단어 좌표 기반 문제 분할 (단 나누기 + 문제 번호 앵커 → 페이지/bbox가 있는 문제 구간)
+
+"""
+페이지 텍스트를 이어 붙인 뒤 정규식으로 문제를 나누면, 2단 편집(수능 문제지)에서는 왼쪽/오른쪽
+단의 줄이 섞여 분석기가 추측할 수밖에 없습니다. 여기서는 페이지마다 단어 상자를 한 번만 읽고
+
+  1. 단어 가로 점유 히스토그램으로 단 사이 여백을 찾아 단을 나누고 (NumPy 벡터화, 없으면 같은 결과의 파이썬 경로)
+  2. 단마다 위→아래로 줄을 만들어 읽기 순서 텍스트를 만들고
+  3. 단 왼쪽 여백에 붙어 있고 본문보다 작지 않은 글꼴의 'N.' 줄을 문제 번호 앵커로 잡아
+  4. 앵커에서 다음 앵커 직전까지를 문제 하나로 (단/페이지를 넘어가면 구간 여러 개)
+
+한 번에 모든 문제 구간을 만듭니다 (단을 넘나드는 재검색 없음).
+
+사용 예시:
+    from pdf_segmenter import segment_pdf
+
+    result = segment_pdf(pdf_path)          # 단어 좌표를 읽을 라이브러리가 없으면 None
+                                            # (단어 상자는 data/pdf_text_cache/<sha256>.words.<백엔드>.json.gz에 캐시)
+    result['text']                          # 읽기 순서 텍스트 (단 순서대로)
+    for problem in result['problems']:
+        problem['number'], problem['page'], problem['bbox'], problem['text']
+        problem['parts']                    # [{'page', 'column', 'bbox'}, ...] (단/페이지를 넘는 경우 여러 개)
+        problem['offset'], problem['end']   # result['text'] 안의 위치
+
+페이지 번호는 1부터, bbox는 (x0, top, x1, bottom) PDF 포인트 단위 (위쪽 원점).
+
+단어 좌표가 없을 때(텍스트만 있을 때)는 segment_text로 같은 번호 규칙을 적용합니다:
+
+    text, page_starts = join_pages(get_page_texts(pdf_path))
+    for span in segment_text(text, page_starts):   # finditer 한 번, 문제마다 전체 텍스트 재검색 없음
+        span['number'], span['page'], span['offset'], span['end'], span['line'], span['text']
+    missing_numbers(spans)                         # 번호 사이에 빠진 번호 (예: 이미지만 있는 페이지)
+
+단어 좌표 분할에 빠진 번호가 있으면 분석기는 텍스트 경로로도 나눠 문제를 더 많이 찾은 쪽을 씀
+(같으면 bbox가 있는 단어 좌표 쪽).
+
+번호 규칙 (select_anchor_sequence):
+    'N.' 후보를 모두 모은 뒤, 번호가 증가하는 후보 열 중 (고른 앵커 수 - 번호가 건너뛴 곳 감점)이 가장 큰
+    것을 문제 번호로 씀 (가장 긴 증가 부분 수열의 변형). 본문 속 번호 목록('1. … 2. …')이나 빠진 번호가
+    있어도 뒤쪽 문제를 잃지 않음. 번호 1로 다시 시작하는 것은 페이지가 바뀐 뒤 첫 후보일 때만 허용.
+"""
+
+import gzip
+import json
+import os
+import re
+import statistics
+from bisect import bisect_right
+from pathlib import Path
+
+from pdf_text_cache import CACHE_DIR, available_backends, get_pdf_text_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 단어 좌표를 읽을 라이브러리 우선순위
+WORD_BACKENDS = ('pymupdf', 'pdfplumber')
+WORDS_FORMAT = 1               # 단어 상자 캐시 형식 (_span_words 등 읽는 방식이 바뀌면 올림)
+
+# 단 나누기
+GUTTER_SEARCH = (0.3, 0.7)     # 단 사이 여백을 찾는 가로 범위 (페이지 폭 비율)
+GUTTER_MIN_WIDTH = 8.0         # 여백 최소 폭 (pt)
+GUTTER_MAX_COVERAGE = 0.05     # 여백으로 보는 열 점유 상한 (최대 점유 대비, 가운데 정렬 제목 등 허용)
+COLUMN_MIN_WORD_RATIO = 0.1    # 양쪽 단 모두 전체 단어의 이 비율 이상일 때만 2단으로 판단
+
+# 줄/앵커
+LINE_TOLERANCE = 0.5           # 윗변 차이가 글꼴 크기 × 이 값 이하이면 같은 줄
+ANCHOR_PATTERN = re.compile(r'^([1-9]\d{0,2})\.(?!\d)')   # '3.' / '3. 함수' (소수 '1.5', '0.' 제외)
+ANCHOR_MAX_INDENT = 1.5        # 단 왼쪽 여백에서 글꼴 크기 × 이 값 이내에서 시작하는 줄만
+ANCHOR_MIN_SIZE_RATIO = 0.95   # 본문 글꼴 크기 대비 최소 비율 (각주/첨자 번호 제외)
+GAP_PENALTY = 1.5              # 번호 순서 선택: 번호가 건너뛴 곳 하나의 감점 (앵커 하나 = 1점)
+TEXT_ANCHOR_PATTERN = re.compile(r'^[ \t]*([1-9]\d{0,2})\.(?=\s)', re.MULTILINE)   # 텍스트 경로: 줄 머리 'N. '
+
+_WORD = re.compile(r'\S+')
+
+
+# ========== 단어 읽기 ==========
+
+def available_word_backend(order=WORD_BACKENDS):
+    """설치된 단어 좌표 라이브러리 (없으면 None)"""
+    backends = available_backends(order)
+    return backends[0] if backends else None
+
+
+def _span_words(span):
+    """PyMuPDF span → 단어 (span bbox를 글자 위치 비율로 나눔)"""
+    text = span['text']
+    x0, top, x1, bottom = span['bbox']
+    width = (x1 - x0) / max(1, len(text))
+    return [(x0 + width * match.start(), top, x0 + width * match.end(), bottom, span['size'], match.group())
+            for match in _WORD.finditer(text)]
+
+
+def read_page_words(pdf_path, backend=None):
+    """
+    페이지마다 단어 상자 (PDF 해시별 캐시, 없을 때만 PDF를 한 번 읽음)
+
+    Returns:
+        [(페이지 폭, 페이지 높이, [(x0, top, x1, bottom, 글꼴 크기, 텍스트), ...]), ...] (라이브러리가 없으면 None)
+    """
+    return get_page_word_cache().get_pages(pdf_path, backend)
+
+
+def parse_page_words(pdf_path, backend=None):
+    """
+    페이지마다 단어 상자 한 번 읽기 (캐시 없이 PDF 파싱)
+
+    Returns:
+        [(페이지 폭, 페이지 높이, [(x0, top, x1, bottom, 글꼴 크기, 텍스트), ...]), ...] (라이브러리가 없으면 None)
+    """
+    backend = backend or available_word_backend()
+    if backend is None:
+        return None
+
+    pages = []
+    if backend == 'pymupdf':
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                words = []
+                for block in page.get_text('dict')['blocks']:
+                    for line in block.get('lines', ()):
+                        for span in line['spans']:
+                            words.extend(_span_words(span))
+                pages.append((page.rect.width, page.rect.height, words))
+    else:
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages:
+                words = [(w['x0'], w['top'], w['x1'], w['bottom'], w.get('size', 0.0), w['text'])
+                         for w in page.extract_words(extra_attrs=['size'])]
+                pages.append((page.width, page.height, words))
+    return pages
+
+
+class PageWordCache:
+    """PDF별 단어 상자 캐시 (pdf_text_cache와 같은 파일 해시)"""
+
+    def __init__(self, cache_dir=CACHE_DIR, text_cache=None):
+        self.cache_dir = Path(cache_dir)
+        self.text_cache = text_cache   # 파일 해시용 PDFTextCache (None이면 프로세스 공용)
+
+    def _entry_path(self, file_hash, backend):
+        return self.cache_dir / f"{file_hash}.words.{backend}.json.gz"
+
+    def _load_entry(self, file_hash, backend):
+        try:
+            with gzip.open(self._entry_path(file_hash, backend), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, OSError, json.JSONDecodeError):
+            return None
+        if entry.get('format') != WORDS_FORMAT:
+            return None
+        return entry
+
+    def _save_entry(self, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(entry['hash'], entry['backend'])
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def get_pages(self, pdf_path, backend=None):
+        """페이지별 단어 상자 (캐시에 없으면 parse_page_words 후 저장, 라이브러리가 없으면 None)"""
+        backend = backend or available_word_backend()
+        if backend is None:
+            return None
+
+        file_hash = (self.text_cache or get_pdf_text_cache()).file_hash(pdf_path)
+        entry = self._load_entry(file_hash, backend)
+        if entry is None:
+            entry = {'hash': file_hash, 'backend': backend, 'format': WORDS_FORMAT,
+                     'pages': parse_page_words(pdf_path, backend)}
+            self._save_entry(entry)
+        return [(width, height, [tuple(word) for word in words]) for width, height, words in entry['pages']]
+
+
+_page_word_cache = None
+
+
+def get_page_word_cache():
+    """프로세스 공용 단어 상자 캐시 인스턴스"""
+    global _page_word_cache
+    if _page_word_cache is None:
+        _page_word_cache = PageWordCache()
+    return _page_word_cache
+
+
+# ========== 단 나누기 ==========
+
+def _column_coverage(words, bins):
+    """x 좌표(1pt 단위)별로 겹치는 단어 수"""
+    if NUMPY_AVAILABLE:
+        x0 = np.array([w[0] for w in words], dtype=np.float64)
+        x1 = np.array([w[2] for w in words], dtype=np.float64)
+        starts = np.clip(np.floor(x0).astype(np.int64), 0, bins)
+        ends = np.clip(np.ceil(x1).astype(np.int64), 0, bins)
+        delta = np.bincount(starts, minlength=bins + 1) - np.bincount(ends, minlength=bins + 1)
+        return np.cumsum(delta)[:bins].tolist()
+
+    delta = [0] * (bins + 1)
+    for w in words:
+        delta[min(max(int(w[0] // 1), 0), bins)] += 1
+        delta[min(max(-int(-w[2] // 1), 0), bins)] -= 1
+    coverage, running = [], 0
+    for value in delta[:bins]:
+        running += value
+        coverage.append(running)
+    return coverage
+
+
+def find_column_gutter(words, page_width):
+    """
+    단 사이 여백의 x 좌표 (1단이면 None)
+
+    가운데 범위에서 단어 점유가 거의 없는 가장 긴 구간의 중앙
+    """
+    if not words:
+        return None
+    bins = int(page_width) + 1
+    coverage = _column_coverage(words, bins)
+    limit = max(coverage) * GUTTER_MAX_COVERAGE
+
+    start, end = int(page_width * GUTTER_SEARCH[0]), int(page_width * GUTTER_SEARCH[1])
+    best, run_start = None, None
+    for x in range(start, end + 1):
+        empty = x < end and coverage[x] <= limit
+        if empty and run_start is None:
+            run_start = x
+        elif not empty and run_start is not None:
+            if best is None or x - run_start > best[1] - best[0]:
+                best = (run_start, x)
+            run_start = None
+    if best is None or best[1] - best[0] < GUTTER_MIN_WIDTH:
+        return None
+
+    gutter = (best[0] + best[1]) / 2
+    left = sum(1 for w in words if (w[0] + w[2]) / 2 < gutter)
+    if min(left, len(words) - left) < len(words) * COLUMN_MIN_WORD_RATIO:
+        return None
+    return gutter
+
+
+def split_columns(words, page_width):
+    """단어 → 단 목록 (왼쪽부터, 단어 중심 기준)"""
+    gutter = find_column_gutter(words, page_width)
+    if gutter is None:
+        return [words]
+    left = [w for w in words if (w[0] + w[2]) / 2 < gutter]
+    right = [w for w in words if (w[0] + w[2]) / 2 >= gutter]
+    return [left, right]
+
+
+# ========== 줄 / 앵커 ==========
+
+def build_lines(words):
+    """
+    단 안의 단어 → 줄 (위→아래, 줄 안에서는 왼쪽→오른쪽)
+
+    Returns:
+        [{'x0', 'top', 'x1', 'bottom', 'size', 'first_size', 'text'}, ...]
+    """
+    lines = []
+    current = []
+    for word in sorted(words, key=lambda w: (w[1], w[0])):
+        if current and word[1] - current[0][1] > LINE_TOLERANCE * max(word[4], current[0][4], 1.0):
+            lines.append(current)
+            current = []
+        current.append(word)
+    if current:
+        lines.append(current)
+
+    result = []
+    for line in lines:
+        line.sort(key=lambda w: w[0])
+        result.append({
+            'x0': min(w[0] for w in line),
+            'top': min(w[1] for w in line),
+            'x1': max(w[2] for w in line),
+            'bottom': max(w[3] for w in line),
+            'size': max(w[4] for w in line),
+            'first_size': line[0][4],
+            'text': ' '.join(w[5] for w in line),
+        })
+    return result
+
+
+def _anchor_number(line, margin, body_size):
+    """문제 번호 앵커면 번호, 아니면 None"""
+    match = ANCHOR_PATTERN.match(line['text'])
+    if not match:
+        return None
+    if line['x0'] > margin + ANCHOR_MAX_INDENT * max(body_size, 1.0):
+        return None
+    if line['first_size'] < body_size * ANCHOR_MIN_SIZE_RATIO:
+        return None
+    return int(match.group(1))
+
+
+def select_anchor_sequence(candidates):
+    """
+    문제 번호 후보 중 번호 순서가 맞는 앵커 고르기
+
+    점수 = 고른 앵커 수 - GAP_PENALTY × (번호가 건너뛴 곳 수, 1이 아닌 번호로 시작하는 것 포함)
+    번호가 증가하는 후보 열 중 점수가 가장 큰 것 (가장 긴 증가 부분 수열의 변형, O(n log 최대 번호))
+    - 본문 속 번호 목록 '1. 2.'는 뒤 문제 번호로 이어지지 않으므로 제외됨
+    - 빠진 번호(9~15)가 있어도 뒤쪽 문제가 둘 이상이면 뒤쪽(16~)까지 고름
+    - 엉뚱한 번호 하나('100.')는 건너뛴 곳 하나를 만들어 점수가 낮아지므로 제외됨
+    - 다시 시작 가능한 후보(번호 1)는 그 앞 어느 앵커 다음에도 감점 없이 올 수 있음
+    - 점수가 같으면 같은 번호 중 뒤쪽 후보(다음 문제에 가까운 쪽), 전체 끝은 앞쪽 후보
+
+    Args:
+        candidates: [(번호, 다시 시작 가능 여부), ...] (문서 순서)
+
+    Returns:
+        고른 후보 인덱스 리스트 (문서 순서)
+    """
+    if not candidates:
+        return []
+    unset = (float('-inf'), -1)
+    size = max(number for number, _ in candidates)
+    tree = [unset] * (size + 1)   # Fenwick 트리: 번호 n 이하 후보의 (점수, 인덱스) 최댓값
+    exact = {}                    # 번호 → 그 번호 후보의 (점수, 인덱스) 최댓값
+    link = [-1] * len(candidates)
+    overall = unset
+
+    for i, (number, restart) in enumerate(candidates):
+        if number < 1:
+            continue   # 문제 번호가 아님 (Fenwick 트리 인덱스는 1부터)
+        best = (1.0 if number == 1 else 1.0 - GAP_PENALTY, -1)   # 여기서 시작
+        # 바로 앞 번호 다음
+        previous = exact.get(number - 1, unset)
+        best = max(best, (previous[0] + 1, previous[1]))
+        # 번호를 건너뛰고 더 작은 번호 다음
+        k, found = number - 2, unset
+        while k > 0:
+            found = max(found, tree[k])
+            k -= k & -k
+        best = max(best, (found[0] + 1 - GAP_PENALTY, found[1]))
+        # 번호 1로 다시 시작
+        if restart and number == 1:
+            best = max(best, (overall[0] + 1, overall[1]))
+        score, link[i] = best[0], best[1]
+
+        value = (score, i)
+        exact[number] = max(exact.get(number, unset), value)
+        k = number
+        while k <= size:
+            tree[k] = max(tree[k], value)
+            k += k & -k
+        if score > overall[0]:
+            overall = value
+
+    chosen = []
+    i = overall[1]
+    while i >= 0:
+        chosen.append(i)
+        i = link[i]
+    chosen.reverse()
+    return chosen
+
+
+def missing_numbers(problems):
+    """고른 문제 번호 사이에 빠진 번호 (번호 1로 다시 시작하는 곳은 제외)"""
+    missing = []
+    for previous, current in zip(problems, problems[1:]):
+        if current['number'] > previous['number'] + 1:
+            missing.extend(range(previous['number'] + 1, current['number']))
+    return missing
+
+
+def _union(box, line):
+    if box is None:
+        return (line['x0'], line['top'], line['x1'], line['bottom'])
+    return (min(box[0], line['x0']), min(box[1], line['top']),
+            max(box[2], line['x1']), max(box[3], line['bottom']))
+
+
+# ========== 분할 ==========
+
+def segment_pages(pages):
+    """
+    read_page_words 결과 → 읽기 순서 텍스트 + 문제 구간
+
+    앵커 후보 줄을 모두 모은 뒤 select_anchor_sequence로 번호 순서에 맞는 것만 앵커로 씀
+    (고르지 않은 후보 줄은 앞 문제의 일부, 번호 1로 다시 시작은 페이지가 바뀐 뒤 첫 후보만)
+
+    Returns:
+        {'text': 읽기 순서 텍스트, 'columns': [페이지별 단 수],
+         'problems': [{'number', 'page', 'bbox', 'parts', 'offset', 'end', 'text'}, ...]}
+    """
+    chunks = []
+    offset = 0
+    columns_per_page = []
+    records = []      # 읽기 순서 줄: (페이지, 단, 줄, 텍스트 위치)
+    candidates = []   # (번호, 다시 시작 가능 여부)
+    candidate_records = []
+    last_page = None
+
+    for page_index, (page_width, _, words) in enumerate(pages, start=1):
+        sizes = [w[4] for w in words if w[4]]
+        body_size = statistics.median(sizes) if sizes else 0.0
+        columns = split_columns(words, page_width)
+        columns_per_page.append(len(columns))
+
+        for column_index, column_words in enumerate(columns):
+            lines = build_lines(column_words)
+            if not lines:
+                continue
+            # 단 왼쪽 여백 (들여쓴 줄이 섞여도 가장 왼쪽 줄들 기준)
+            margin = sorted(line['x0'] for line in lines)[len(lines) // 20]
+            for line in lines:
+                number = _anchor_number(line, margin, body_size)
+                if number is not None:
+                    candidates.append((number, last_page is not None and page_index != last_page))
+                    candidate_records.append(len(records))
+                    last_page = page_index
+                records.append((page_index, column_index, line, offset))
+                chunks.append(line['text'] + '\n')
+                offset += len(line['text']) + 1
+
+    anchors = {candidate_records[index]: candidates[index][0]
+               for index in select_anchor_sequence(candidates)}
+
+    problems = []
+    current = None
+    part = None
+    part_key = None
+    for index, (page_index, column_index, line, line_offset) in enumerate(records):
+        if (page_index, column_index) != part_key:
+            if part is not None:
+                current['parts'].append(part)
+            part = None
+            part_key = (page_index, column_index)
+        number = anchors.get(index)
+        if number is not None:
+            if current is not None:
+                if part is not None:
+                    current['parts'].append(part)
+                current['end'] = line_offset
+                problems.append(current)
+            part = {'page': page_index, 'column': column_index, 'bbox': None}
+            current = {'number': number, 'page': page_index, 'offset': line_offset, 'parts': []}
+        elif current is not None and part is None:
+            part = {'page': page_index, 'column': column_index, 'bbox': None}
+        if part is not None:
+            part['bbox'] = _union(part['bbox'], line)
+
+    if current is not None:
+        if part is not None:
+            current['parts'].append(part)
+        current['end'] = offset
+        problems.append(current)
+
+    text = ''.join(chunks)
+    for problem in problems:
+        problem['text'] = text[problem['offset']:problem['end']].strip()
+        problem['bbox'] = problem['parts'][0]['bbox'] if problem['parts'] else None
+
+    return {'text': text, 'columns': columns_per_page, 'problems': problems}
+
+
+def join_pages(pages):
+    """
+    페이지 텍스트 → (이어 붙인 텍스트, 페이지별 시작 위치)
+
+    빈 페이지는 건너뛰고 '\n'으로 이어 붙임 (분석기의 기존 텍스트와 같음).
+    빈 페이지의 시작 위치는 다음 페이지와 같음.
+    """
+    chunks = []
+    page_starts = []
+    offset = 0
+    for text in pages:
+        page_starts.append(offset + 1 if chunks else offset)
+        if text:
+            chunks.append(text)
+            offset = page_starts[-1] + len(text)
+    return '\n'.join(chunks), page_starts
+
+
+def segment_text(text, page_starts=None):
+    """
+    텍스트 → 문제 구간 (줄 머리 'N.' 후보를 finditer 한 번으로 찾고 select_anchor_sequence로 번호 순서 선택)
+
+    고르지 않은 후보(보기 안의 '1.', 본문 속 번호 목록 등)는 앵커가 아니라 앞 문제의 일부로 둠
+
+    Args:
+        page_starts: join_pages의 페이지별 시작 위치 (있으면 페이지가 바뀐 뒤 첫 '1.'만 번호 다시 시작으로 허용,
+                     구간마다 페이지 번호 기록)
+
+    Returns:
+        [{'number', 'page': 1부터 (page_starts 없으면 None), 'offset', 'end',
+          'line': 시작 줄 번호(0부터), 'text'}, ...]
+    """
+    page_starts = page_starts or []
+    candidates = []
+    offsets = []
+    last_page = None
+    for match in TEXT_ANCHOR_PATTERN.finditer(text):
+        page = bisect_right(page_starts, match.start()) - 1 if page_starts else None
+        candidates.append((int(match.group(1)), last_page is not None and page != last_page))
+        offsets.append(match.start())
+        last_page = page
+
+    anchors = []
+    line, line_pos = 0, 0
+    for index in select_anchor_sequence(candidates):
+        offset = offsets[index]
+        line += text.count('\n', line_pos, offset)
+        line_pos = offset
+        anchors.append((candidates[index][0], offset, line))
+
+    problems = []
+    for index, (number, offset, line) in enumerate(anchors):
+        end = anchors[index + 1][1] if index + 1 < len(anchors) else len(text)
+        problems.append({
+            'number': number,
+            'page': bisect_right(page_starts, offset) if page_starts else None,
+            'offset': offset,
+            'end': end,
+            'line': line,
+            'text': text[offset:end].strip(),
+        })
+    return problems
+
+
+def segment_pdf(pdf_path, backend=None):
+    """PDF → 읽기 순서 텍스트 + 문제 구간 (단어 좌표를 읽을 수 없으면 None)"""
+    try:
+        pages = read_page_words(pdf_path, backend)
+    except Exception as e:
+        print(f'[경고] 단어 좌표 읽기 실패: {e}')
+        return None
+    if pages is None:
+        return None
+    return segment_pages(pages)
@@ -0,0 +1,359 @@
+# pdf_text_cache.py
+# PDF 페이지 텍스트 캐시 (파일 해시 + 페이지 번호 기준, 페이지당 최대 1회 파싱)
+
+"""
+같은 원본 PDF를 여러 스크립트(pdf_utils, 분석기, compare_*/review_and_save_*)가
+반복해서 파싱하지 않도록 페이지 단위 텍스트를 디스크에 저장합니다.
+
+사용 예시:
+    from pdf_text_cache import get_page_texts, get_page_count
+
+    pages = get_page_texts(pdf_path)          # 전체 페이지 (없는 페이지만 파싱)
+    pages = get_page_texts(pdf_path, 3, 5)    # 3~4 페이지 (0부터 시작, 끝 미포함)
+    pages = get_page_texts(pdf_path, max_workers=4)   # 없는 페이지를 프로세스 병렬 추출
+    pages = get_page_texts(pdf_path, layout=True)     # 레이아웃 보존 텍스트 (pdfplumber 우선)
+
+저장 형식: data/pdf_text_cache/<sha256>.json.gz (레이아웃용은 <sha256>.layout.json.gz)
+    {"hash", "page_count", "backend", "pages": {"0": "...", "1": "..."}}
+
+백엔드 선택 (select_backend):
+    - 일반 텍스트: 설치된 백엔드를 표본 페이지로 측정하여, 품질 점수가 최고치의 90% 이상인
+      백엔드 중 가장 빠른 것 사용 (보통 PyMuPDF)
+    - 레이아웃 민감 페이지(layout=True): pdfplumber 우선
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / 'data' / 'pdf_text_cache'
+HASH_INDEX_FILE = 'hashes.json'
+
+# 백엔드 우선순위 (pdf_utils.extract_text_from_pdf와 동일, 측정 불가 시 기본값)
+BACKENDS = ('pdfplumber', 'pypdf2', 'pymupdf')
+LAYOUT_BACKENDS = ('pdfplumber', 'pymupdf', 'pypdf2')
+BACKEND_MODULES = {'pdfplumber': 'pdfplumber', 'pypdf2': 'PyPDF2', 'pymupdf': 'fitz'}
+
+# 측정 정책: 품질이 최고치의 이 비율 이상인 백엔드 중 가장 빠른 것
+QUALITY_TOLERANCE = 0.9
+SAMPLE_PAGES = 2
+
+# 병렬 추출: 누락 페이지가 이 수 이상일 때만 프로세스 풀 사용
+PARALLEL_MIN_PAGES = 8
+
+
+def available_backends(order=BACKENDS):
+    """설치된 PDF 라이브러리 (order 순서, 임포트하지 않고 모듈이 있는지만 확인)"""
+    return [backend for backend in order if importlib.util.find_spec(BACKEND_MODULES[backend]) is not None]
+
+
+def text_quality(text):
+    """
+    추출 텍스트 품질 점수 (0~1)
+
+    한글/숫자/수식 기호 비율이 높고 깨진 글자(U+FFFD, 제어 문자)가 적을수록 높음
+    """
+    if not text:
+        return 0.0
+    stripped = [ch for ch in text if not ch.isspace()]
+    if not stripped:
+        return 0.0
+    garbage = sum(1 for ch in stripped if ch == '\ufffd' or ord(ch) < 32)
+    useful = sum(1 for ch in stripped
+                 if '\uac00' <= ch <= '\ud7a3' or ch.isalnum() or ch in '=+-×÷<>()[]{}^/√∫∑')
+    return max(0.0, (useful - 2 * garbage) / len(stripped))
+
+
+def measure_backends(pdf_path, sample_pages=SAMPLE_PAGES, backends=None):
+    """
+    설치된 백엔드별 표본 페이지 추출 속도/품질 측정
+
+    Returns:
+        {백엔드: {'sec_per_page', 'quality', 'chars'}}
+    """
+    results = {}
+    for backend in backends or available_backends():
+        try:
+            start = time.perf_counter()
+            with _PDFDocument(pdf_path, backend) as doc:
+                pages = list(range(min(sample_pages, doc.page_count)))
+                texts = [doc.page_text(i) for i in pages]
+            elapsed = time.perf_counter() - start
+        except Exception:
+            continue
+        joined = ''.join(texts)
+        results[backend] = {
+            'sec_per_page': elapsed / max(1, len(texts)),
+            'quality': text_quality(joined),
+            'chars': len(joined),
+        }
+    return results
+
+
+def select_backend(pdf_path, layout=False):
+    """
+    PDF 파일에 사용할 백엔드 선택
+
+    Args:
+        pdf_path: PDF 경로
+        layout: 레이아웃 민감 페이지용이면 True (pdfplumber 우선)
+    """
+    if layout:
+        backends = available_backends(LAYOUT_BACKENDS)
+        return backends[0] if backends else None
+
+    backends = available_backends()
+    if len(backends) <= 1:
+        return backends[0] if backends else None
+
+    measured = measure_backends(pdf_path, backends=backends)
+    if not measured:
+        return backends[0]
+    best_quality = max(m['quality'] for m in measured.values())
+    candidates = [b for b, m in measured.items() if m['quality'] >= best_quality * QUALITY_TOLERANCE]
+    return min(candidates, key=lambda b: measured[b]['sec_per_page'])
+
+
+def _extract_page_chunk(pdf_path, backend, page_nums):
+    """프로세스 워커: 한 번 열어 페이지 묶음 추출"""
+    with _PDFDocument(pdf_path, backend) as doc:
+        return [(page_num, doc.page_text(page_num)) for page_num in page_nums]
+
+
+class _PDFDocument:
+    """백엔드별 PDF 열기/페이지 텍스트 추출 공통 인터페이스"""
+
+    def __init__(self, pdf_path, backend):
+        self.backend = backend
+        self._file = None
+        if backend == 'pdfplumber':
+            import pdfplumber
+            self._doc = pdfplumber.open(pdf_path)
+            self.page_count = len(self._doc.pages)
+        elif backend == 'pypdf2':
+            import PyPDF2
+            self._file = open(pdf_path, 'rb')
+            self._doc = PyPDF2.PdfReader(self._file)
+            self.page_count = len(self._doc.pages)
+        else:
+            import fitz
+            self._doc = fitz.open(pdf_path)
+            self.page_count = len(self._doc)
+
+    def page_text(self, page_num):
+        if self.backend == 'pdfplumber':
+            return self._doc.pages[page_num].extract_text() or ''
+        if self.backend == 'pypdf2':
+            return self._doc.pages[page_num].extract_text() or ''
+        return self._doc[page_num].get_text() or ''
+
+    def close(self):
+        self._doc.close()
+        if self._file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PDFTextCache:
+    """페이지 단위 PDF 텍스트 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._hash_index = None  # 절대 경로 -> [mtime, size, sha256]
+        self._entries = {}  # (sha256, layout) -> 캐시 항목 (프로세스 내 메모리)
+
+    # ---- 파일 해시 ----
+
+    def _load_hash_index(self):
+        if self._hash_index is None:
+            try:
+                with open(self.cache_dir / HASH_INDEX_FILE, 'r', encoding='utf-8') as f:
+                    self._hash_index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._hash_index = {}
+        return self._hash_index
+
+    def file_hash(self, pdf_path):
+        """
+        PDF 내용 해시 (경로+mtime+크기가 같으면 저장된 해시 재사용)
+        """
+        pdf_path = os.path.abspath(str(pdf_path))
+        stat = os.stat(pdf_path)
+        hash_index = self._load_hash_index()
+
+        known = hash_index.get(pdf_path)
+        if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        file_hash = digest.hexdigest()
+
+        hash_index[pdf_path] = [stat.st_mtime, stat.st_size, file_hash]
+        self._write_json(self.cache_dir / HASH_INDEX_FILE, hash_index)
+        return file_hash
+
+    # ---- 캐시 항목 ----
+
+    def _entry_path(self, file_hash, layout=False):
+        suffix = '.layout.json.gz' if layout else '.json.gz'
+        return self.cache_dir / f"{file_hash}{suffix}"
+
+    def _load_entry(self, file_hash, layout=False):
+        entry = self._entries.get((file_hash, layout))
+        if entry is not None:
+            return entry
+        try:
+            with gzip.open(self._entry_path(file_hash, layout), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, OSError, json.JSONDecodeError):
+            entry = {'hash': file_hash, 'page_count': None, 'backend': None, 'pages': {}}
+        entry['layout'] = layout
+        self._entries[(file_hash, layout)] = entry
+        return entry
+
+    def _save_entry(self, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(entry['hash'], entry.get('layout', False))
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def _write_json(self, path, data):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    # ---- 공개 API ----
+
+    def page_count(self, pdf_path):
+        """전체 페이지 수 (캐시에 없으면 PDF를 열어서 확인)"""
+        entry = self._load_entry(self.file_hash(pdf_path))
+        if entry['page_count'] is None:
+            self._fill(pdf_path, entry, [])
+        return entry['page_count']
+
+    def get_pages(self, pdf_path, start=0, end=None, max_workers=1, layout=False):
+        """
+        페이지 범위 텍스트 (없는 페이지만 파싱 후 저장)
+
+        Args:
+            pdf_path: PDF 경로
+            start: 시작 페이지 (0부터)
+            end: 끝 페이지 (미포함, None이면 마지막까지)
+            max_workers: 2 이상이면 누락 페이지를 프로세스 풀로 나눠 추출
+            layout: 레이아웃 보존 텍스트 (별도 캐시, pdfplumber 우선)
+
+        Returns:
+            페이지 텍스트 리스트 (PDF 라이브러리가 없으면 None)
+        """
+        entry = self._load_entry(self.file_hash(pdf_path), layout)
+
+        if entry['page_count'] is None and not self._fill(pdf_path, entry, []):
+            return None
+
+        page_count = entry['page_count']
+        end = page_count if end is None else min(end, page_count)
+        pages = entry['pages']
+        missing = [i for i in range(start, end) if str(i) not in pages]
+        if missing and not self._fill(pdf_path, entry, missing, max_workers):
+            return None
+
+        return [pages[str(i)] for i in range(start, end)]
+
+    def _fill(self, pdf_path, entry, page_nums, max_workers=1):
+        """
+        필요한 페이지만 추출하여 캐시에 저장
+
+        page_nums가 비어 있으면 페이지 수와 백엔드만 확정
+        """
+        backend = entry.get('backend') or select_backend(pdf_path, entry.get('layout', False))
+        if backend is None:
+            print('[경고] PDF 라이브러리를 찾을 수 없습니다. (pdfplumber, PyPDF2, pymupdf 중 하나 설치 필요)')
+            return False
+
+        if max_workers > 1 and len(page_nums) >= PARALLEL_MIN_PAGES:
+            if entry['page_count'] is None:
+                self._fill(pdf_path, entry, [])
+            self._fill_parallel(pdf_path, backend, entry, page_nums, max_workers)
+        else:
+            with _PDFDocument(pdf_path, backend) as doc:
+                entry['page_count'] = doc.page_count
+                entry['backend'] = backend
+                for page_num in page_nums:
+                    entry['pages'][str(page_num)] = doc.page_text(page_num)
+
+        self._save_entry(entry)
+        return True
+
+    def _fill_parallel(self, pdf_path, backend, entry, page_nums, max_workers):
+        """
+        누락 페이지를 연속 구간으로 나눠 프로세스 풀에서 추출
+
+        실패한 구간이 있어도 끝난 구간은 캐시에 남기고, 실패한 구간만 현재 프로세스에서 다시 추출
+        """
+        chunk_count = min(max_workers, len(page_nums))
+        size, rest = divmod(len(page_nums), chunk_count)
+        chunks = []
+        start = 0
+        for i in range(chunk_count):
+            end = start + size + (1 if i < rest else 0)
+            chunks.append(page_nums[start:end])
+            start = end
+
+        pdf_path = str(pdf_path)
+        failed = []
+        with ProcessPoolExecutor(max_workers=chunk_count) as executor:
+            futures = {executor.submit(_extract_page_chunk, pdf_path, backend, chunk): chunk
+                       for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f'[경고] 페이지 병렬 추출 실패, 순차 추출로 재시도: {e}')
+                    failed.extend(futures[future])
+                    continue
+                for page_num, text in results:
+                    entry['pages'][str(page_num)] = text
+
+        if failed:
+            # 끝난 구간을 먼저 저장 (순차 재시도가 실패해도 유지)
+            self._save_entry(entry)
+            for page_num, text in _extract_page_chunk(pdf_path, backend, sorted(failed)):
+                entry['pages'][str(page_num)] = text
+
+
+_pdf_text_cache = None
+
+
+def get_pdf_text_cache():
+    """프로세스 공용 캐시 인스턴스"""
+    global _pdf_text_cache
+    if _pdf_text_cache is None:
+        _pdf_text_cache = PDFTextCache()
+    return _pdf_text_cache
+
+
+def get_page_texts(pdf_path, start=0, end=None, max_workers=1, layout=False):
+    """페이지 범위 텍스트 리스트 (get_pdf_text_cache().get_pages 단축 함수)"""
+    return get_pdf_text_cache().get_pages(pdf_path, start, end, max_workers, layout)
+
+
+def get_page_count(pdf_path):
+    """전체 페이지 수"""
+    return get_pdf_text_cache().page_count(pdf_path)
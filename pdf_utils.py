@@ -4,6 +4,8 @@
 import sys
 import os
 from pathlib import Path
+from path_index import find_newest
+from pdf_text_cache import get_pdf_text_cache
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -12,71 +14,62 @@ if sys.platform == 'win32':
         sys.stdout.reconfigure(encoding='utf-8')
 
 
-def extract_text_from_pdf(pdf_path, page_num=None):
+def extract_text_from_pdf(pdf_path, page_num=None, max_workers=1, layout=False, ocr=False):
     """
     PDF에서 텍스트 추출 (전체 또는 특정 페이지)
     
     Args:
         pdf_path: PDF 파일 경로
         page_num: 페이지 번호 (None이면 전체 페이지)
+        max_workers: 2 이상이면 아직 캐시에 없는 페이지를 프로세스 병렬 추출
+        layout: 레이아웃이 중요한 페이지면 True (pdfplumber 우선, 별도 캐시)
+        ocr: True면 페이지별 텍스트 레이어 품질을 판정해 품질이 낮은 페이지만 OCR (page_router)
     
     Returns:
         추출된 텍스트 (실패 시 None)
+    
+    백엔드는 pdf_text_cache.select_backend가 표본 페이지 측정으로 선택
+    (일반 텍스트는 품질이 비슷하면 가장 빠른 백엔드, 보통 PyMuPDF)
     """
     try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            if page_num is not None:
-                if page_num >= len(pdf.pages):
-                    print(f'[경고] 페이지 {page_num}이 존재하지 않습니다. 총 페이지: {len(pdf.pages)}')
-                    return None
-                return pdf.pages[page_num].extract_text()
-            else:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-                return text
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                if page_num is not None:
-                    if page_num >= len(reader.pages):
-                        print(f'[경고] 페이지 {page_num}이 존재하지 않습니다. 총 페이지: {len(reader.pages)}')
-                        return None
-                    return reader.pages[page_num].extract_text()
-                else:
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                    return text
-        except ImportError:
-            try:
-                import fitz
-                doc = fitz.open(pdf_path)
-                if page_num is not None:
-                    if page_num >= len(doc):
-                        print(f'[경고] 페이지 {page_num}이 존재하지 않습니다. 총 페이지: {len(doc)}')
-                        doc.close()
-                        return None
-                    text = doc[page_num].get_text()
-                    doc.close()
-                    return text
-                else:
-                    text = ""
-                    for page in doc:
-                        text += page.get_text() + "\n"
-                    doc.close()
-                    return text
-            except ImportError:
-                print('[경고] PDF 라이브러리를 찾을 수 없습니다. (pdfplumber, PyPDF2, pymupdf 중 하나 설치 필요)')
+        if ocr:
+            return _extract_text_routed(pdf_path, page_num, max_workers)
+
+        # 페이지 텍스트 캐시 사용 (같은 PDF/페이지는 한 번만 파싱)
+        cache = get_pdf_text_cache()
+        if page_num is not None:
+            page_count = cache.page_count(pdf_path)
+            if page_count is None:
+                return None
+            if page_num >= page_count:
+                print(f'[경고] 페이지 {page_num}이 존재하지 않습니다. 총 페이지: {page_count}')
+                return None
+            return cache.get_pages(pdf_path, page_num, page_num + 1, layout=layout)[0]
+        else:
+            pages = cache.get_pages(pdf_path, max_workers=max_workers, layout=layout)
+            if pages is None:
                 return None
+            return ''.join(page + "\n" for page in pages)
     except Exception as e:
         print(f'[오류] 텍스트 추출 중 오류 발생: {e}')
         return None
 
 
+def _extract_text_routed(pdf_path, page_num, max_workers):
+    """텍스트 레이어/OCR 페이지 라우터 경로 (판정은 저장되어 다음 실행에서 재사용)"""
+    from page_router import get_page_router
+    page_nums = None if page_num is None else [page_num]
+    texts = get_page_router().page_texts(pdf_path, page_nums, max_workers=max_workers)
+    if texts is None:
+        return None
+    if page_num is not None:
+        if page_num not in texts:
+            print(f'[경고] 페이지 {page_num}이 존재하지 않습니다.')
+            return None
+        return texts[page_num]
+    return ''.join(texts[i] + "\n" for i in sorted(texts))
+
+
 def find_pdf(base_dir=None, filename_patterns=None):
     """
     원본 PDF 파일 찾기
@@ -112,9 +105,10 @@ def find_pdf(base_dir=None, filename_patterns=None):
             continue
         
         for pattern in filename_patterns:
-            matches = list(search_dir.rglob(pattern))
-            if matches:
+            # 경로 인덱스 조회 (rglob + stat 대체)
+            newest = find_newest(search_dir, pattern)
+            if newest:
                 # 가장 최근 수정된 파일 반환
-                return max(matches, key=lambda p: p.stat().st_mtime)
+                return newest
     
     return None
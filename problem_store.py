@@ -0,0 +1,527 @@
+# problem_store.py
+# 문제/분석 레코드 컬럼 저장소 (범주형 컬럼 인터닝 + 숫자 컬럼 배열 + 메모리 맵 파일)
+
+"""
+dict 리스트 대신 컬럼별 배열로 보관:
+  - 범주형(과목, 중단원, 난이도등급 등): 문자열은 한 번만 저장하고 행마다 정수 코드만 보관
+  - 숫자(출제년도, 문항번호, 배점, 정답률, 풀이시간 등): 타입이 정해진 연속 배열
+    (NumPy가 있으면 ndarray, 없으면 표준 라이브러리 array/memoryview - 결과는 같음)
+  - 텍스트(문제 본문 등): UTF-8 바이트 하나 + 오프셋 배열
+  - 행 접근은 __slots__ RowView (행마다 dict를 만들지 않음)
+
+파일 형식 (.pstore, 한 파일):
+  MAGIC(8바이트) + 헤더 길이(uint64 LE) + 헤더 JSON + 8바이트 정렬된 컬럼 블록들
+  → load()는 파일을 mmap으로 열고 컬럼을 복사 없이 바로 배열로 사용
+
+사용 예시:
+    from problem_store import load_analysis_store
+
+    store = load_analysis_store('output/csat_meta_analysis.csv')   # CSV가 바뀌었을 때만 다시 변환
+    rates = store.column('공식정답률')          # 숫자 배열 (없는 값은 NaN)
+    subjects = store.categories('과목구분')     # ['기하', '미적분', ...]
+    codes = store.codes('과목구분')             # 행별 범주 코드
+    for row in store:                           # RowView
+        row['중단원'], row.get('배점')
+"""
+
+import array
+import csv
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+STORE_MAGIC = b'PSTORE1\n'
+STORE_VERSION = 1
+STORE_SUFFIX = '.pstore'
+
+# 컬럼 종류
+CATEGORY = 'category'
+INT = 'int'
+FLOAT = 'float'
+TEXT = 'text'
+
+MISSING_INT = -1          # 정수 컬럼의 빈 값
+_CODE_LIMITS = {'H': 0xFFFF, 'I': 0xFFFFFFFF}
+_LEADING_NUMBER = re.compile(r'\s*(-?\d+(?:\.\d+)?)')
+
+
+# ========== 값 파서 ==========
+
+def parse_int(value):
+    """'3', '3단계', '2분' → 3, 3, 2 (숫자로 시작하지 않으면 MISSING_INT)"""
+    if value is None:
+        return MISSING_INT
+    match = _LEADING_NUMBER.match(str(value))
+    return int(float(match.group(1))) if match else MISSING_INT
+
+
+def parse_number(value):
+    """'2분', '4.8' → 2.0, 4.8 (숫자로 시작하지 않으면 NaN)"""
+    if value is None:
+        return math.nan
+    match = _LEADING_NUMBER.match(str(value))
+    return float(match.group(1)) if match else math.nan
+
+
+def parse_rate(value):
+    """'86.0%' → 86.0 (기존 분석 코드의 float(값.replace('%', ''))와 같은 규칙, 실패 시 NaN)"""
+    try:
+        return float(str(value).replace('%', ''))
+    except (TypeError, ValueError):
+        return math.nan
+
+
+# ========== 스키마 ==========
+
+def column(name, kind, typecode=None, parser=None):
+    """
+    컬럼 정의
+
+    Args:
+        kind: CATEGORY, INT, FLOAT, TEXT
+        typecode: 숫자 컬럼 배열 타입 ('h' int16, 'i' int32, 'f' float32, 'd' float64)
+        parser: 원본 값(보통 문자열) → 숫자 변환 함수
+    """
+    if kind == INT:
+        typecode, parser = typecode or 'i', parser or parse_int
+    elif kind == FLOAT:
+        typecode, parser = typecode or 'd', parser or parse_number
+    return {'name': name, 'kind': kind, 'typecode': typecode, 'parser': parser}
+
+
+# 수능 메타/심층 분석 레코드 (analyze_csat_meta / analyze_csat_deep의 25개 항목)
+CSAT_ANALYSIS_SCHEMA = [
+    column('출제년도', INT, 'h'),
+    column('시행월', CATEGORY),
+    column('문항번호', INT, 'h'),
+    column('배점', INT, 'h'),
+    column('과목구분', CATEGORY),
+    column('공식정답률', FLOAT, 'd', parse_rate),
+    column('난이도등급', CATEGORY),
+    column('풀이소요시간', FLOAT, 'd'),
+    column('오답률1위선지', CATEGORY),
+    column('체감난이도', FLOAT, 'd'),
+    column('대단원', CATEGORY),
+    column('중단원', CATEGORY),
+    column('핵심개념태그', CATEGORY),
+    column('개념난이도', CATEGORY),
+    column('필수선행개념', CATEGORY),
+    column('문제형식', CATEGORY),
+    column('조건제시방식', CATEGORY),
+    column('풀이단계수', INT, 'h'),
+    column('계산복잡도', CATEGORY),
+    column('함정유형', CATEGORY),
+    column('출제의도', CATEGORY),
+    column('출제빈도', CATEGORY),
+    column('연계여부', CATEGORY),
+    column('변별력지수', CATEGORY),
+    column('킬러여부판정', CATEGORY),
+]
+
+# PDF 문제집 추출 결과 (pdf_math_extractor.Problem)
+EXTRACTED_PROBLEM_SCHEMA = [
+    column('unit', CATEGORY),
+    column('number', INT, 'i'),
+    column('page', INT, 'i'),
+    column('content', TEXT),
+    column('sub_problems', TEXT),   # 줄바꿈으로 이은 하위 문제
+]
+
+
+def _as_column(buffer, typecode):
+    """버퍼(array/bytes/mmap 구간)를 숫자 배열로 (복사 없음)"""
+    if NUMPY_AVAILABLE:
+        return np.frombuffer(buffer, dtype=np.dtype(typecode))
+    return memoryview(buffer).cast('B').cast(typecode)
+
+
+def _code_typecode(category_count):
+    return 'H' if category_count <= _CODE_LIMITS['H'] + 1 else 'I'
+
+
+# ========== 행 뷰 ==========
+
+class RowView:
+    """저장소 한 행 (값은 접근할 때 컬럼에서 읽음)"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self):
+        return self._index
+
+    def __getitem__(self, name):
+        return self._store.value(name, self._index)
+
+    def get(self, name, default=None):
+        if name not in self._store.kinds:
+            return default
+        value = self._store.value(name, self._index)
+        return default if value is None else value
+
+    def to_dict(self):
+        return {name: self._store.value(name, self._index) for name in self._store.field_names}
+
+    def __repr__(self):
+        return f"RowView({self._index}, {self.to_dict()!r})"
+
+
+# ========== 저장소 ==========
+
+class ProblemStore:
+    """컬럼 저장소 (행 수 고정, 읽기 전용)"""
+
+    def __init__(self, schema, rows, columns, categories, meta=None, mapped=None, path=None):
+        self.schema = [{'name': c['name'], 'kind': c['kind'], 'typecode': c.get('typecode')}
+                       for c in schema]
+        self.field_names = [c['name'] for c in schema]
+        self.kinds = {c['name']: c['kind'] for c in schema}
+        self.rows = rows
+        self.meta = meta or {}
+        self._columns = columns          # 이름 → 숫자 배열 / 코드 배열 / (오프셋 배열, 바이트)
+        self._categories = categories    # 범주형 이름 → 문자열 리스트
+        self._mapped = mapped            # load()로 연 mmap (컬럼이 참조하는 동안 유지)
+        self._path = path                # load()로 연 파일 경로 (pickle 시 다시 열기)
+
+    # ---------- 생성 ----------
+
+    @classmethod
+    def from_records(cls, records, schema, meta=None):
+        """
+        dict 레코드에서 생성 (레코드를 한 번만 순회, 값 파싱/범주 인터닝도 이때 한 번)
+        """
+        builders = {}
+        interned = {}
+        for col in schema:
+            name, kind = col['name'], col['kind']
+            if kind == CATEGORY:
+                builders[name] = array.array('I')
+                interned[name] = {}
+            elif kind == TEXT:
+                builders[name] = (array.array('q', [0]), bytearray())
+            else:
+                builders[name] = array.array(col['typecode'])
+
+        rows = 0
+        for record in records:
+            rows += 1
+            for col in schema:
+                name, kind = col['name'], col['kind']
+                raw = record.get(name)
+                if kind == CATEGORY:
+                    text = '' if raw is None else str(raw)
+                    lookup = interned[name]
+                    code = lookup.get(text)
+                    if code is None:
+                        code = lookup[sys.intern(text)] = len(lookup)
+                    builders[name].append(code)
+                elif kind == TEXT:
+                    offsets, data = builders[name]
+                    if isinstance(raw, (list, tuple)):
+                        raw = '\n'.join(raw)
+                    data.extend(('' if raw is None else str(raw)).encode('utf-8'))
+                    offsets.append(len(data))
+                else:
+                    builders[name].append(col['parser'](raw))
+
+        columns = {}
+        categories = {}
+        for col in schema:
+            name, kind = col['name'], col['kind']
+            if kind == CATEGORY:
+                categories[name] = list(interned[name])
+                codes = array.array(_code_typecode(len(categories[name])), builders[name])
+                columns[name] = _as_column(codes, codes.typecode)
+            elif kind == TEXT:
+                offsets, data = builders[name]
+                columns[name] = (_as_column(offsets, 'q'), bytes(data))
+            else:
+                columns[name] = _as_column(builders[name], col['typecode'])
+        return cls(schema, rows, columns, categories, meta)
+
+    @classmethod
+    def from_csv(cls, csv_path, schema, meta=None, required=None):
+        """CSV(utf-8-sig)에서 생성 (required 필드가 비어 있는 행은 제외)"""
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            rows = (row for row in reader if row.get(required)) if required else reader
+            return cls.from_records(rows, schema, meta)
+
+    # ---------- 조회 ----------
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        return RowView(self, index)
+
+    def __iter__(self):
+        for index in range(self.rows):
+            yield RowView(self, index)
+
+    def column(self, name):
+        """숫자 컬럼 배열 (범주형은 코드 배열, NumPy 있으면 ndarray)"""
+        if self.kinds[name] == TEXT:
+            raise TypeError(f"텍스트 컬럼은 숫자 배열이 없습니다: {name}")
+        return self._columns[name]
+
+    def codes(self, name):
+        if self.kinds[name] != CATEGORY:
+            raise TypeError(f"범주형 컬럼이 아닙니다: {name}")
+        return self._columns[name]
+
+    def categories(self, name):
+        """범주 문자열 (코드 순서 = 처음 등장한 순서)"""
+        return self._categories[name]
+
+    def value(self, name, index):
+        """한 칸 값 (정수 빈 값/NaN은 None)"""
+        kind = self.kinds[name]
+        if kind == CATEGORY:
+            return self._categories[name][self._columns[name][index]]
+        if kind == TEXT:
+            offsets, data = self._columns[name]
+            return bytes(data[offsets[index]:offsets[index + 1]]).decode('utf-8')
+        value = self._columns[name][index]
+        if kind == INT:
+            value = int(value)
+            return None if value == MISSING_INT else value
+        value = float(value)
+        return None if value != value else value
+
+    def values(self, name):
+        """컬럼 전체를 파이썬 값 리스트로"""
+        kind = self.kinds[name]
+        if kind == CATEGORY:
+            categories = self._categories[name]
+            return [categories[code] for code in self._columns[name]]
+        return [self.value(name, index) for index in range(self.rows)]
+
+    def to_records(self):
+        return [row.to_dict() for row in self]
+
+    def nbytes(self):
+        """컬럼 데이터 크기 (범주 문자열 제외)"""
+        total = 0
+        for name, kind in self.kinds.items():
+            col = self._columns[name]
+            if kind == TEXT:
+                total += memoryview(col[0]).nbytes + len(col[1])
+            else:
+                total += memoryview(col).nbytes
+        return total
+
+    # ---------- 파일 ----------
+
+    def save(self, path):
+        """
+        .pstore 파일로 저장 (임시 파일에 쓴 뒤 교체)
+
+        Returns:
+            저장 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        blocks = []  # 헤더 뒤에 이어 쓸 바이트 블록 (순서대로)
+
+        def add_block(buffer):
+            blocks.append(memoryview(buffer).cast('B'))
+            return len(blocks) - 1
+
+        columns = {}
+        for col in self.schema:
+            name, kind = col['name'], col['kind']
+            if kind == TEXT:
+                offsets, data = self._columns[name]
+                columns[name] = {'kind': kind, 'offsets': add_block(offsets), 'data': add_block(data)}
+            else:
+                entry = {'kind': kind, 'typecode': self._typecode(name), 'block': add_block(self._columns[name])}
+                if kind == CATEGORY:
+                    entry['categories'] = self._categories[name]
+                columns[name] = entry
+
+        header = {
+            'version': STORE_VERSION,
+            'byteorder': sys.byteorder,
+            'rows': self.rows,
+            'schema': self.schema,
+            'meta': self.meta,
+            'columns': columns,
+        }
+        # 블록 위치는 헤더 길이에 따라 달라지므로 위치를 채운 뒤 길이가 변하지 않을 때까지 반복
+        layout = []
+        while True:
+            header['blocks'] = layout
+            header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+            pos = _align(len(STORE_MAGIC) + 8 + len(header_bytes))
+            new_layout = []
+            for block in blocks:
+                new_layout.append([pos, block.nbytes])
+                pos = _align(pos + block.nbytes)
+            if new_layout == layout:
+                break
+            layout = new_layout
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(STORE_MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            for (offset, _), block in zip(layout, blocks):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(block)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        .pstore 파일 로드 (use_mmap=True면 파일을 메모리 맵으로 열고 컬럼을 복사하지 않음)
+
+        Raises:
+            ValueError: 형식이 다른 파일
+        """
+        with open(path, 'rb') as f:
+            if use_mmap and os.fstat(f.fileno()).st_size > 0:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                mapped = buffer
+            else:
+                buffer = f.read()
+                mapped = None
+
+        view = memoryview(buffer)
+        if bytes(view[:len(STORE_MAGIC)]) != STORE_MAGIC:
+            raise ValueError(f"problem store 파일이 아닙니다: {path}")
+        (header_len,) = struct.unpack_from('<Q', view, len(STORE_MAGIC))
+        start = len(STORE_MAGIC) + 8
+        header = json.loads(bytes(view[start:start + header_len]).decode('utf-8'))
+        if header.get('version') != STORE_VERSION:
+            raise ValueError(f"지원하지 않는 problem store 버전: {header.get('version')}")
+        swap = header.get('byteorder') != sys.byteorder
+
+        def block(index, typecode):
+            offset, nbytes = header['blocks'][index]
+            raw = view[offset:offset + nbytes]
+            if swap and typecode is not None:
+                # 다른 바이트 순서로 저장된 파일: 복사 후 변환
+                converted = array.array(typecode, bytes(raw))
+                converted.byteswap()
+                return _as_column(converted, typecode)
+            return raw if typecode is None else _as_column(raw, typecode)
+
+        columns = {}
+        categories = {}
+        for name, entry in header['columns'].items():
+            if entry['kind'] == TEXT:
+                columns[name] = (block(entry['offsets'], 'q'), block(entry['data'], None))
+            else:
+                columns[name] = block(entry['block'], entry['typecode'])
+                if entry['kind'] == CATEGORY:
+                    categories[name] = [sys.intern(text) for text in entry['categories']]
+        return cls(header['schema'], header['rows'], columns, categories, header.get('meta'), mapped,
+                   str(path))
+
+    def __reduce__(self):
+        """
+        pickle (워커 프로세스 전달용)
+
+        mmap/memoryview는 pickle할 수 없으므로 load()로 연 저장소는 같은 경로를 다시 열고,
+        메모리에서 만든 저장소는 컬럼 바이트를 복사해 다시 구성함
+        """
+        if self._path is not None:
+            return (self.__class__.load, (self._path, self._mapped is not None))
+        blocks = {}
+        for name, kind in self.kinds.items():
+            if kind == TEXT:
+                offsets, data = self._columns[name]
+                blocks[name] = (bytes(offsets), bytes(data))
+            else:
+                blocks[name] = (self._typecode(name), bytes(self._columns[name]))
+        return (_restore_store, (self.__class__, self.schema, self.rows, blocks, self._categories, self.meta))
+
+    def _typecode(self, name):
+        col = self._columns[name]
+        if NUMPY_AVAILABLE:
+            return col.dtype.char
+        return col.format
+
+
+def _restore_store(cls, schema, rows, blocks, categories, meta):
+    """ProblemStore.__reduce__로 복사한 컬럼 바이트 → 저장소"""
+    columns = {}
+    for col in schema:
+        name = col['name']
+        if col['kind'] == TEXT:
+            offsets, data = blocks[name]
+            columns[name] = (_as_column(offsets, 'q'), data)
+        else:
+            typecode, data = blocks[name]
+            columns[name] = _as_column(data, typecode)
+    return cls(schema, rows, columns, categories, meta)
+
+
+def _align(pos, alignment=8):
+    return (pos + alignment - 1) // alignment * alignment
+
+
+def _source_fingerprint(path):
+    stat = os.stat(path)
+    return {'path': str(Path(path).resolve()), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def load_analysis_store(csv_path, schema=CSAT_ANALYSIS_SCHEMA, store_path=None, rebuild=False,
+                        required='출제년도'):
+    """
+    분석 CSV를 컬럼 저장소로 로드 (같은 폴더의 .pstore를 캐시로 사용)
+
+    CSV의 수정 시간/크기가 .pstore에 기록된 값과 같으면 .pstore를 메모리 맵으로 열고,
+    다르면 CSV에서 다시 만들어 저장함 (required 필드가 빈 행은 제외)
+
+    Returns:
+        ProblemStore (CSV가 없으면 None)
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return None
+    store_path = Path(store_path) if store_path else csv_path.with_suffix(STORE_SUFFIX)
+    source = _source_fingerprint(csv_path)
+    # 컬럼 타입까지 비교 (타입이 바뀐 스키마로 저장된 .pstore는 다시 생성)
+    schema_names = [[c['name'], c['kind'], c.get('typecode')] for c in schema]
+
+    if store_path.exists() and not rebuild:
+        try:
+            store = ProblemStore.load(store_path)
+            if (store.meta.get('source') == source and store.meta.get('required') == required
+                    and [[c['name'], c['kind'], c.get('typecode')] for c in store.schema] == schema_names):
+                return store
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[경고] problem store 로드 실패, CSV에서 다시 생성: {e}")
+
+    store = ProblemStore.from_csv(csv_path, schema, meta={'source': source, 'required': required},
+                                  required=required)
+    try:
+        store.save(store_path)
+    except OSError as e:
+        print(f"[경고] problem store 저장 실패: {e}")
+    return store
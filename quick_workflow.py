@@ -5,12 +5,15 @@
 사용법:
 python quick_workflow.py --problem "수2_2025학년도_현우진_드릴_P4_문제" --latex "LaTeX 내용"
 python quick_workflow.py --full --problem-file "문제파일.tex" --solution-file "해설파일.tex"
+python quick_workflow.py --problem-file "문제파일.tex" --filename "..." --profile trace.json [--profile-samples samples.txt]
+  → 단계별/문제별 시간 출력 + Chrome trace 저장 (chrome://tracing 또는 ui.perfetto.dev에서 열기)
 """
 
 import argparse
 import sys
 from pathlib import Path
 from integrated_workflow import IntegratedWorkflow
+from stage_profiler import StageProfiler, profile_stage
 
 def main():
     parser = argparse.ArgumentParser(description='Mathpix-노션 통합 워크플로우')
@@ -24,22 +27,51 @@ def main():
     parser.add_argument('--full', action='store_true', help='전체 워크플로우 실행')
     parser.add_argument('--validate-only', action='store_true', help='검증만 실행')
     parser.add_argument('--fix-only', action='store_true', help='수정만 실행')
+    parser.add_argument('--profile', type=str, help='단계별/문제별 시간 측정 후 Chrome trace JSON 저장 경로')
+    parser.add_argument('--profile-top', type=int, default=10, help='출력할 가장 느린 문제 수 (기본 10)')
+    parser.add_argument('--profile-samples', type=str,
+                        help='샘플링 프로파일 저장 경로 (folded stack, 플레임그래프용)')
     
     args = parser.parse_args()
     
-    workflow = IntegratedWorkflow()
+    profiler = None
+    if args.profile or args.profile_samples:
+        profiler = StageProfiler(args.filename)
+        if args.profile_samples:
+            profiler.start_sampling()
+    
+    try:
+        return run_workflow(args, IntegratedWorkflow(profiler=profiler))
+    finally:
+        if profiler is not None:
+            finish_profile(profiler, args)
+
+
+def finish_profile(profiler, args):
+    """프로파일 결과 출력 및 저장"""
+    profiler.stop_sampling()
+    profiler.print_report(top=args.profile_top)
+    if args.profile:
+        print(f"\n[trace 저장] {profiler.export_chrome_trace(args.profile)}")
+    if args.profile_samples:
+        print(f"[샘플 저장] {profiler.export_folded_stacks(args.profile_samples)}")
+
+
+def run_workflow(args, workflow):
+    """실행 모드에 따라 워크플로우 실행"""
     
     # LaTeX 내용 읽기
     problem_latex = args.problem
     solution_latex = args.solution
     
-    if args.problem_file:
-        with open(args.problem_file, 'r', encoding='utf-8') as f:
-            problem_latex = f.read()
-    
-    if args.solution_file:
-        with open(args.solution_file, 'r', encoding='utf-8') as f:
-            solution_latex = f.read()
+    with profile_stage(workflow.profiler, 'read_input'):
+        if args.problem_file:
+            with open(args.problem_file, 'r', encoding='utf-8') as f:
+                problem_latex = f.read()
+        
+        if args.solution_file:
+            with open(args.solution_file, 'r', encoding='utf-8') as f:
+                solution_latex = f.read()
     
     # 실행 모드 선택
     if args.validate_only:
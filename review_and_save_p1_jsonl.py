@@ -6,6 +6,8 @@ import csv
 import sys
 import os
 from pathlib import Path
+from path_index import glob_indexed
+from pdf_utils import extract_text_from_pdf
 from datetime import datetime
 import re
 
@@ -129,36 +131,6 @@ def review_data(problems):
     
     return len(issues) == 0
 
-def extract_text_from_pdf(pdf_path):
-    """PDF에서 텍스트 추출"""
-    try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except ImportError:
-            try:
-                import fitz
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
-            except ImportError:
-                return None
-
 def find_pdf():
     """원본 PDF 찾기"""
     base_dir = Path(r'C:\Users\a\Documents\MathPDF')
@@ -176,13 +148,13 @@ def find_pdf():
     organized_dir = base_dir / 'organized' / '미적분'
     if organized_dir.exists():
         for pattern in search_patterns:
-            for pdf_file in organized_dir.glob(pattern):
+            for pdf_file in glob_indexed(organized_dir, pattern):
                 if pdf_file.exists():
                     return pdf_file
     
     # base_dir에서 검색
     for pattern in search_patterns:
-        for pdf_file in base_dir.glob(pattern):
+        for pdf_file in glob_indexed(base_dir, pattern):
             if 'organized' not in str(pdf_file) and pdf_file.exists():
                 return pdf_file
     
@@ -6,6 +6,8 @@ import csv
 import sys
 import os
 from pathlib import Path
+from path_index import glob_indexed
+from pdf_utils import extract_text_from_pdf
 from datetime import datetime
 import re
 
@@ -117,36 +119,6 @@ def review_data():
     
     return len(issues) == 0
 
-def extract_text_from_pdf(pdf_path):
-    """PDF에서 텍스트 추출"""
-    try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-        return text
-    except ImportError:
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except ImportError:
-            try:
-                import fitz
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
-            except ImportError:
-                return None
-
 def compare_with_pdf():
     """원본 PDF와 대조"""
     base_dir = Path(r'C:\Users\a\Documents\MathPDF')
@@ -154,12 +126,12 @@ def compare_with_pdf():
     
     pdf_path = None
     if organized_dir.exists():
-        for pdf_file in organized_dir.glob('*드릴*P2*.pdf'):
+        for pdf_file in glob_indexed(organized_dir, '*드릴*P2*.pdf'):
             pdf_path = pdf_file
             break
     
     if pdf_path is None:
-        for pdf_file in base_dir.glob('*드릴*P2*.pdf'):
+        for pdf_file in glob_indexed(base_dir, '*드릴*P2*.pdf'):
             if 'organized' not in str(pdf_file):
                 pdf_path = pdf_file
                 break
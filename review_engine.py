@@ -0,0 +1,384 @@
+# review_engine.py
+# 문제/해설 데이터 검토 엔진 (출력 없이 구조화된 결과 반환) + 콘솔 요약 렌더러
+
+"""
+사용 예시:
+    from review_engine import validate_problems, render_report
+
+    report = validate_problems(problems, source='수2_2025학년도_현우진_드릴_P4_문제')
+    report['passed']      # 기존 review_problems()의 반환값과 같음
+    report['findings']    # [{'item_id': '03', 'rule': 'latex_dollar_unbalanced', 'severity': 'error',
+                          #   'offset': 120, 'field': 'question', 'message': '...'}, ...]
+    render_report(report) # 콘솔 요약 (문제마다 출력하지 않음)
+
+여러 파일 일괄 검토 (책/과목 단위 집계):
+    python review_engine.py output/*_deepseek.json --group-by subject
+    python review_engine.py --dir output --group-by book --output review_summary.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import os
+from collections import Counter
+from pathlib import Path
+
+from path_index import parse_name
+
+# Windows 콘솔 인코딩 설정
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+# 규칙 이름 → 설명 (렌더러 출력용)
+RULES = {
+    'latex_dollar_unbalanced': 'LaTeX 수식 괄호 불일치',
+    'option_count': '선택지 수 오류 (5개여야 함)',
+    'math_sin_range': 'sin 함수 범위 오류 가능성',
+    'math_cosine_law': '코사인법칙 공식 구조 확인 필요',
+}
+
+# $$는 블록 수식 구분자라 짝 검사에서 제외 (해설 검사 규칙)
+_DOLLAR_TOKEN = re.compile(r'\$\$|\$')
+
+
+def _finding(item_id, rule, severity, offset=None, field=None, **detail):
+    finding = {
+        'item_id': item_id,
+        'rule': rule,
+        'severity': severity,
+        'offset': offset,
+        'field': field,
+        'message': RULES[rule],
+    }
+    if detail:
+        finding['detail'] = detail
+    return finding
+
+
+def _new_report(kind, source, total, counts, findings):
+    return {
+        'kind': kind,
+        'source': source,
+        'total': total,
+        'counts': counts,
+        'findings': findings,
+        'passed': not findings,
+    }
+
+
+def _last_single_dollar(text):
+    """$$를 뺀 단독 '$' 중 마지막 위치 (없으면 None)"""
+    last = None
+    for match in _DOLLAR_TOKEN.finditer(text):
+        if len(match.group()) == 1:
+            last = match.start()
+    return last
+
+
+def validate_problems(problems, source=None):
+    """
+    문제 데이터 검토 (출력 없음)
+
+    규칙 (기존 review_problems와 같음):
+      - latex_dollar_unbalanced: question의 '$' 개수가 홀수 (offset: 마지막 '$')
+      - option_count: 객관식인데 선택지가 5개가 아님
+
+    Returns:
+        {'kind': 'problem', 'source', 'total', 'counts': {'multiple_choice', 'short_answer'},
+         'findings': [...], 'passed'}
+    """
+    findings = []
+    counts = {'multiple_choice': 0, 'short_answer': 0}
+
+    for prob in problems:
+        idx = prob.get("index", "?")
+        question = prob.get("question", "")
+        if '$' in question and question.count('$') % 2 != 0:
+            findings.append(_finding(idx, 'latex_dollar_unbalanced', SEVERITY_ERROR,
+                                     offset=question.rfind('$'), field='question'))
+
+        answer_type = prob.get("answer_type", "")
+        if answer_type in counts:
+            counts[answer_type] += 1
+        if answer_type == "multiple_choice":
+            options = prob.get("options", [])
+            if len(options) != 5:
+                findings.append(_finding(idx, 'option_count', SEVERITY_ERROR,
+                                         field='options', count=len(options)))
+
+    return _new_report('problem', source, len(problems), counts, findings)
+
+
+def validate_solutions(solutions, check_math_logic=True, source=None):
+    """
+    해설 데이터 검토 (출력 없음)
+
+    규칙 (기존 review_solutions와 같음):
+      - latex_dollar_unbalanced: content + topic의 단독 '$' 개수가 홀수 (error)
+      - math_sin_range, math_cosine_law: 수학적 논리 오류 가능성 (warning)
+
+    Returns:
+        {'kind': 'solution', 'source', 'total', 'counts': {'concept', 'strategy'},
+         'findings': [...], 'passed'} (passed는 경고까지 없어야 True, 기존 반환값과 같음)
+    """
+    findings = []
+    counts = {'concept': 0, 'strategy': 0}
+
+    for i, sol in enumerate(solutions, 1):
+        item_id = sol.get("index") or str(i)
+        sol_type = sol.get("type", "")
+        if sol_type in counts:
+            counts[sol_type] += 1
+
+        content = sol.get("content", "")
+        topic = sol.get("topic", "")
+        content_singles = content.count('$') - 2 * content.count('$$')
+        topic_singles = topic.count('$') - 2 * topic.count('$$')
+        if (content_singles + topic_singles) % 2 != 0:
+            field, text = ('content', content) if content_singles % 2 else ('topic', topic)
+            findings.append(_finding(item_id, 'latex_dollar_unbalanced', SEVERITY_ERROR,
+                                     offset=_last_single_dollar(text), field=field))
+
+        if not check_math_logic:
+            continue
+
+        # 삼각함수 범위 확인
+        if 'sin' in content and ('> 1' in content or '< -1' in content):
+            if '최댓값' not in content and '최솟값' not in content and '범위' not in content:
+                offset = content.find('> 1')
+                if offset == -1:
+                    offset = content.find('< -1')
+                findings.append(_finding(item_id, 'math_sin_range', SEVERITY_WARNING,
+                                         offset=offset, field='content'))
+
+        # 코사인법칙 공식 확인
+        if '코사인법칙' in content or 'cos' in content:
+            c_pos = content.find('c^{2}')
+            if c_pos == -1:
+                c_pos = content.find('c^2')
+            if (c_pos != -1
+                    and ('a^{2}' in content or 'a^2' in content)
+                    and ('b^{2}' in content or 'b^2' in content)
+                    and '2ab' not in content and '2 a b' not in content):
+                findings.append(_finding(item_id, 'math_cosine_law', SEVERITY_WARNING,
+                                         offset=c_pos, field='content'))
+
+    return _new_report('solution', source, len(solutions), counts, findings)
+
+
+# ========== 파일 일괄 검토 ==========
+
+def load_items(path):
+    """문제/해설 JSON 로드 (파트별 스크립트 형식 {"metadata", "문제데이터": [...]} 지원)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for key in ('문제데이터', '해설데이터', 'problems', 'solutions'):
+            if isinstance(data.get(key), list):
+                return data[key]
+        return []
+    return data if isinstance(data, list) else []
+
+
+def detect_kind(items, name=''):
+    """파일명(문제/해설) 또는 항목 형태로 종류 판단"""
+    info = parse_name(name)
+    if info:
+        return 'solution' if info['kind'] == '해설' else 'problem'
+    if '해설' in name or 'solution' in name:
+        return 'solution'
+    if '문제' in name or 'problem' in name:
+        return 'problem'
+    if items and all(isinstance(item, dict) and item.get('type') in ('concept', 'strategy')
+                     for item in items):
+        return 'solution'
+    return 'problem'
+
+
+def validate_file(path, kind=None, check_math_logic=True):
+    """
+    JSON 파일 하나 검토
+
+    Returns:
+        validate_problems/validate_solutions 결과 + 'meta' (파일명 규칙 정보)
+        (읽기 실패 시 'error' 키가 있는 리포트)
+    """
+    path = Path(path)
+    name = path.stem[:-len('_deepseek')] if path.stem.endswith('_deepseek') else path.stem
+    try:
+        items = load_items(path)
+    except (OSError, json.JSONDecodeError) as e:
+        report = _new_report(kind or 'unknown', str(path), 0, {}, [])
+        report['passed'] = False
+        report['error'] = str(e)
+        report['meta'] = parse_name(name)
+        return report
+
+    kind = kind or detect_kind(items, name)
+    if kind == 'solution':
+        report = validate_solutions(items, check_math_logic=check_math_logic, source=str(path))
+    else:
+        report = validate_problems(items, source=str(path))
+    report['meta'] = parse_name(name)
+    return report
+
+
+def validate_files(paths, kind=None, check_math_logic=True):
+    """여러 파일 검토 (입력 순서대로 리포트 리스트)"""
+    return [validate_file(path, kind, check_math_logic) for path in paths]
+
+
+def _group_key(report, group_by):
+    if not group_by:
+        return '전체'
+    meta = report.get('meta') or {}
+    value = meta.get(group_by)
+    if value is None:
+        return '(규칙 외 파일명)'
+    if group_by == 'book':
+        return f"{meta['subject']}_{meta['year']}학년도_{value}"
+    return str(value)
+
+
+def aggregate_reports(reports, group_by=None):
+    """
+    리포트 집계 (책/과목 단위)
+
+    Args:
+        group_by: None(전체), 'subject', 'book', 'year', 'kind' (path_index.parse_name 키)
+
+    Returns:
+        {그룹: {'files', 'failed_files', 'items', 'errors', 'warnings',
+                'rules': {규칙: 건수}, 'counts': {유형: 개수}}} (그룹 이름 순)
+    """
+    groups = {}
+    for report in reports:
+        key = _group_key(report, group_by)
+        group = groups.setdefault(key, {
+            'files': 0, 'failed_files': 0, 'items': 0, 'errors': 0, 'warnings': 0,
+            'rules': Counter(), 'counts': Counter(),
+        })
+        group['files'] += 1
+        group['items'] += report['total']
+        if not report['passed']:
+            group['failed_files'] += 1
+        group['counts'].update(report['counts'])
+        for finding in report['findings']:
+            group['rules'][finding['rule']] += 1
+            if finding['severity'] == SEVERITY_ERROR:
+                group['errors'] += 1
+            else:
+                group['warnings'] += 1
+
+    for group in groups.values():
+        group['rules'] = dict(group['rules'])
+        group['counts'] = dict(group['counts'])
+    return dict(sorted(groups.items()))
+
+
+# ========== 렌더러 ==========
+
+_KIND_LABELS = {
+    'problem': ('문제', {'multiple_choice': '객관식', 'short_answer': '주관식'}),
+    'solution': ('해설', {'concept': '개념', 'strategy': '전략'}),
+}
+
+
+def render_report(report, max_findings=20):
+    """리포트 하나를 콘솔 요약으로 출력"""
+    title, count_labels = _KIND_LABELS.get(report['kind'], ('데이터', {}))
+    print("=" * 60)
+    header = f"[{title} 데이터 검토]"
+    if report.get('source'):
+        header += f" {report['source']}"
+    print(header)
+    print("=" * 60)
+
+    if report.get('error'):
+        print(f"❌ 읽기 실패: {report['error']}")
+        return
+
+    counts = ', '.join(f"{count_labels.get(name, name)} {n}개" for name, n in report['counts'].items())
+    print(f"[총 {title} 수] {report['total']}개" + (f" ({counts})" if counts else ''))
+
+    findings = report['findings']
+    if not findings:
+        print("[오류] 없음")
+        return
+
+    errors = sum(1 for f in findings if f['severity'] == SEVERITY_ERROR)
+    print(f"[오류] {errors}건, [경고] {len(findings) - errors}건")
+    for finding in findings[:max_findings]:
+        mark = '❌' if finding['severity'] == SEVERITY_ERROR else '⚠️'
+        where = f" @{finding['field']}:{finding['offset']}" if finding['offset'] is not None else ''
+        detail = finding.get('detail')
+        extra = f" ({', '.join(f'{k}={v}' for k, v in detail.items())})" if detail else ''
+        print(f"  {mark} {title} {finding['item_id']}: {finding['message']}{extra}{where}")
+    if len(findings) > max_findings:
+        print(f"  ... 외 {len(findings) - max_findings}건")
+
+
+def render_aggregate(groups):
+    """aggregate_reports() 결과 출력"""
+    print("=" * 80)
+    print("[검토 집계]")
+    print("=" * 80)
+    print(f"{'그룹':<36}{'파일':>6}{'실패':>6}{'항목':>8}{'오류':>8}{'경고':>8}")
+    print("-" * 80)
+    total_rules = Counter()
+    for key, group in groups.items():
+        print(f"{key:<36}{group['files']:>6}{group['failed_files']:>6}{group['items']:>8}"
+              f"{group['errors']:>8}{group['warnings']:>8}")
+        total_rules.update(group['rules'])
+    if total_rules:
+        print("\n[규칙별 건수]")
+        for rule, count in total_rules.most_common():
+            print(f"  - {rule} ({RULES.get(rule, rule)}): {count}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='문제/해설 JSON 일괄 검토')
+    parser.add_argument('paths', nargs='*', help='검토할 JSON 파일')
+    parser.add_argument('--dir', type=str, help='*_deepseek.json을 찾을 디렉토리 (하위 폴더 포함)')
+    parser.add_argument('--kind', type=str, choices=['problem', 'solution'],
+                        help='종류 지정 (기본: 파일명/내용으로 판단)')
+    parser.add_argument('--group-by', type=str, choices=['subject', 'book', 'year', 'kind'],
+                        help='집계 기준 (기본: 전체)')
+    parser.add_argument('--no-math-check', action='store_true', help='해설 수학적 논리 검사 생략')
+    parser.add_argument('--details', action='store_true', help='파일별 리포트도 출력')
+    parser.add_argument('--output', type=str, help='리포트/집계 JSON 저장 경로')
+
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths]
+    if args.dir:
+        paths.extend(sorted(Path(args.dir).rglob('*_deepseek.json')))
+    if not paths:
+        print("❌ 검토할 파일이 없습니다.")
+        return False
+
+    reports = validate_files(paths, kind=args.kind, check_math_logic=not args.no_math_check)
+    if args.details:
+        for report in reports:
+            render_report(report)
+            print()
+    groups = aggregate_reports(reports, group_by=args.group_by)
+    render_aggregate(groups)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'groups': groups, 'reports': reports}, f, ensure_ascii=False, indent=2)
+        print(f"\n[저장] {args.output}")
+
+    return all(report['passed'] for report in reports)
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
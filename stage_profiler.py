@@ -0,0 +1,268 @@
+# stage_profiler.py
+# 변환 워크플로우 단계별/문제별 시간 측정 + Chrome trace(Perfetto) 내보내기
+
+"""
+사용 예시:
+    from stage_profiler import StageProfiler
+
+    profiler = StageProfiler('수2_드릴_P4')
+    profiler.start_sampling()                      # 선택: 전체 실행 샘플링 (플레임그래프용)
+    with profiler.stage('extract', mode='fast'):
+        for i, marker in enumerate(markers, 1):
+            with profiler.problem(i) as info:
+                problem = extract(marker)
+                info['extracted'] = problem is not None
+    profiler.stop_sampling()
+
+    profiler.print_report(top=10)                  # 단계별 합계 + 가장 느린 문제
+    profiler.export_chrome_trace('trace.json')     # chrome://tracing 또는 ui.perfetto.dev에서 열기
+    profiler.export_folded_stacks('samples.txt')   # flamegraph.pl / speedscope 입력 형식
+
+- 벽시계 시간은 time.perf_counter, CPU 시간은 단계는 process_time(프로세스 전체),
+  문제는 thread_time(해당 스레드만, 스레드 병렬 모드에서도 문제별로 분리됨)
+- 프로파일러를 넘기지 않으면(None) 측정 코드는 전혀 실행되지 않음
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# 샘플링 간격 (초)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+def profile_stage(profiler, name, **args):
+    """profiler가 None이면 아무것도 하지 않는 컨텍스트 (호출부에서 분기하지 않기 위함)"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name, **args)
+
+
+def problem_event_name(problem_index):
+    return f"문제 {problem_index:02d}"
+
+
+class StageProfiler:
+    """단계(stage)/문제(problem) 구간 기록기 (스레드 안전)"""
+
+    def __init__(self, name='workflow'):
+        self.name = name
+        self.events = []  # {'name', 'cat', 'start', 'wall', 'cpu', 'pid', 'tid', 'thread', 'args'}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._samples = Counter()
+        self._sample_count = 0
+        self._sampler = None
+        self._sampler_stop = None
+
+    # ========== 구간 기록 ==========
+
+    def record(self, name, cat, start, wall, cpu, pid=None, tid=None, thread=None, args=None):
+        """
+        측정이 끝난 구간 하나 추가 (프로세스 워커에서 돌려받은 측정값 병합용)
+
+        Args:
+            start: time.perf_counter() 기준 시작 시각 (초)
+            wall, cpu: 벽시계/CPU 시간 (초)
+        """
+        event = {
+            'name': name,
+            'cat': cat,
+            'start': start,
+            'wall': wall,
+            'cpu': cpu,
+            'pid': os.getpid() if pid is None else pid,
+            'tid': threading.get_ident() if tid is None else tid,
+            'thread': thread or threading.current_thread().name,
+            'args': args or {},
+        }
+        with self._lock:
+            self.events.append(event)
+        return event
+
+    @contextmanager
+    def stage(self, name, **args):
+        """
+        단계 구간 측정 (중첩 가능)
+
+        Yields:
+            args dict (구간 안에서 값을 추가하면 trace의 args에 함께 기록됨)
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield args
+        finally:
+            self.record(name, 'stage', wall_start, time.perf_counter() - wall_start,
+                        time.process_time() - cpu_start, args=args)
+
+    @contextmanager
+    def problem(self, problem_index, **args):
+        """문제 하나 처리 구간 측정 (CPU 시간은 현재 스레드 기준)"""
+        args['index'] = problem_index
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield args
+        finally:
+            self.record(problem_event_name(problem_index), 'problem', wall_start,
+                        time.perf_counter() - wall_start, time.thread_time() - cpu_start, args=args)
+
+    # ========== 집계 ==========
+
+    def stage_summary(self):
+        """
+        단계 이름별 합계 (처음 기록된 순서)
+
+        Returns:
+            [{'name', 'count', 'wall', 'cpu'}, ...]
+        """
+        summary = {}
+        for event in self.events:
+            if event['cat'] != 'stage':
+                continue
+            row = summary.setdefault(event['name'], {'name': event['name'], 'count': 0,
+                                                     'wall': 0.0, 'cpu': 0.0})
+            row['count'] += 1
+            row['wall'] += event['wall']
+            row['cpu'] += event['cpu']
+        return list(summary.values())
+
+    def slowest_problems(self, top=10):
+        """벽시계 시간 기준 가장 느린 문제 구간 top개"""
+        problems = [event for event in self.events if event['cat'] == 'problem']
+        problems.sort(key=lambda event: event['wall'], reverse=True)
+        return problems[:top]
+
+    def print_report(self, top=10):
+        """단계별 합계와 가장 느린 문제 출력"""
+        print("\n" + "=" * 60)
+        print(f"[프로파일] {self.name}")
+        print("=" * 60)
+        print(f"{'단계':<28}{'횟수':>6}{'벽시계(ms)':>14}{'CPU(ms)':>12}")
+        print("-" * 60)
+        for row in self.stage_summary():
+            print(f"{row['name']:<28}{row['count']:>6}{row['wall'] * 1000:>14.2f}{row['cpu'] * 1000:>12.2f}")
+        if self._sample_count:
+            print(f"\n[샘플링] {self._sample_count}회, 스택 {len(self._samples)}종")
+
+        problems = [event for event in self.events if event['cat'] == 'problem']
+        if not problems:
+            return
+        total_wall = sum(event['wall'] for event in problems)
+        print(f"\n[문제별] {len(problems)}개, 합계 {total_wall * 1000:.2f}ms, "
+              f"평균 {total_wall / len(problems) * 1000:.2f}ms")
+        print(f"가장 느린 문제 {min(top, len(problems))}개:")
+        for event in self.slowest_problems(top):
+            args = event['args']
+            note = '' if args.get('extracted', True) else ' (추출 안 됨)'
+            print(f"  문제 {args['index']:>3}: {event['wall'] * 1000:8.2f}ms "
+                  f"(CPU {event['cpu'] * 1000:.2f}ms){note}")
+
+    # ========== Chrome trace ==========
+
+    def to_chrome_trace(self):
+        """
+        Chrome Trace Event 형식 dict (chrome://tracing, ui.perfetto.dev에서 열 수 있음)
+
+        구간은 'X'(complete) 이벤트, 프로세스/스레드 이름은 'M'(metadata) 이벤트
+        """
+        main_pid = os.getpid()
+        trace_events = []
+        names = {}
+        for event in sorted(self.events, key=lambda e: (e['start'], -e['wall'])):
+            args = dict(event['args'])
+            args['cpu_ms'] = round(event['cpu'] * 1000, 3)
+            trace_events.append({
+                'name': event['name'],
+                'cat': event['cat'],
+                'ph': 'X',
+                'ts': round((event['start'] - self._origin) * 1e6, 1),
+                'dur': round(event['wall'] * 1e6, 1),
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': args,
+            })
+            names.setdefault((event['pid'], event['tid']), event['thread'])
+
+        metadata = []
+        for pid in sorted({pid for pid, _ in names}):
+            process_name = self.name if pid == main_pid else f"worker {pid}"
+            metadata.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                             'args': {'name': process_name}})
+        for (pid, tid), thread_name in names.items():
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                             'args': {'name': thread_name}})
+        return {'traceEvents': metadata + trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+
+    # ========== 샘플링 (플레임그래프) ==========
+
+    def start_sampling(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        백그라운드 스레드에서 interval초마다 모든 스레드의 호출 스택을 수집
+
+        현재 프로세스의 스레드만 수집함 (process 모드의 워커 프로세스는 제외)
+        """
+        if self._sampler is not None:
+            return
+        self._sampler_stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, args=(interval,),
+                                         name='stage-profiler-sampler', daemon=True)
+        self._sampler.start()
+
+    def stop_sampling(self):
+        if self._sampler is None:
+            return
+        self._sampler_stop.set()
+        self._sampler.join()
+        self._sampler = None
+
+    def _sample_loop(self, interval):
+        own_id = threading.get_ident()
+        while not self._sampler_stop.wait(interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    self._samples[_folded_stack(frame)] += 1
+                self._sample_count += 1
+
+    def export_folded_stacks(self, path):
+        """
+        수집한 샘플을 folded stack 형식으로 저장 ("바깥;...;안쪽 횟수" 한 줄씩)
+
+        flamegraph.pl, speedscope(https://www.speedscope.app)에서 바로 열 수 있음
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            samples = sorted(self._samples.items())
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in samples:
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+def _folded_stack(frame):
+    """프레임에서 바깥 호출부터 이어 붙인 스택 문자열 (';' 구분)"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        label = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+        parts.append(label.replace(';', ':'))
+        frame = frame.f_back
+    parts.reverse()
+    return ';'.join(parts)
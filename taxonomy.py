@@ -0,0 +1,298 @@
+# taxonomy.py
+# 주제/개념/함정 분류 키워드 사전 + 한 번의 스캔으로 모든 키워드를 찾는 매처
+
+"""
+사용 예시:
+    from taxonomy import scan_keywords, TOPIC_KEYWORDS, TOPIC_PRIORITY
+
+    hits = scan_keywords(problem_text)          # 텍스트당 한 번만 스캔 (결과 캐시)
+    topic = hits.first_group(TOPIC_KEYWORDS, TOPIC_PRIORITY) or '기타'
+    hits.count('조건')                           # 등장 횟수
+    hits.positions('미분')                       # 등장 위치 (시작 오프셋)
+
+분류 함수들은 `any(kw in text for kw in keywords)`를 키워드마다 반복하는 대신
+scan_keywords() 결과 하나에서 답을 읽음 (판정 결과는 기존과 동일)
+"""
+
+import re
+from functools import lru_cache
+
+# ========== 키워드 사전 ==========
+
+# 본문 주제 감지 (mathpix_utils.detect_topic_from_content)
+TOPIC_KEYWORDS = {
+    '경우의 수': [
+        '경우의 수', '순열', '조합', '원순열', '중복순열', '중복조합',
+        '이웃', '이웃하지', '부정방정식', '음이 아닌 정수',
+        '함수의 개수', '치역', '정의역'
+    ],
+    '확률': [
+        '확률', '사건', '독립', '종속', '조건부확률', '여사건',
+        '독립시행', '이항분포', 'P(', '확률변수'
+    ],
+    '통계': [
+        '통계', '확률변수', '확률질량함수', '확률밀도함수',
+        '평균', '분산', '표준편차', 'E(', 'V(',
+        '정규분포', '표준정규분포', 'N('
+    ],
+    '함수의 극한과 연속': ['극한', '연속', '불연속', '\\lim', 'Chapter 1'],
+    '미분': ['미분', '도함수', 'f\'', 'f^{\\prime}', 'Chapter 2'],
+    '적분': ['적분', '\\int', '정적분', '부정적분', 'Chapter 3'],
+    '수열': ['수열', '등차수열', '등비수열', 'Chapter 3', '점화식'],
+    '기하': ['삼각형', '원', '선분', '각', '기하'],
+    '삼각함수': ['삼각함수', 'sin', 'cos', 'tan'],
+}
+
+# 우선순위: 확통 > 미분 > 적분 > 극한과 연속
+TOPIC_PRIORITY = [
+    '경우의 수', '확률', '통계',  # 확통 우선
+    '미분', '적분', '함수의 극한과 연속',
+    '수열', '삼각함수', '기하'
+]
+
+# 간이 주제 감지 (OptimizedMathpixProcessor._detect_topic_cached, 사전 순서가 우선순위)
+QUICK_TOPIC_KEYWORDS = {
+    '수열': ['수열', '등차수열', '등비수열', 'Chapter 3'],
+    '기하': ['삼각형', '원', '선분', '각', '기하'],
+    '삼각함수': ['삼각함수', 'sin', 'cos', 'tan'],
+    '미적분': ['미분', '적분', '도함수'],
+}
+
+# 과목별 중단원 (DeepCSATAnalyzer.analyze_concepts_advanced)
+MINOR_UNIT_KEYWORDS = {
+    '미적분': {
+        '수열의극한': ['수열', '극한', '급수'],
+        '미분법': ['미분', '도함수', '접선'],
+        '적분법': ['적분', '넓이', '부피']
+    },
+    '기하': {
+        '이차곡선': ['포물선', '타원', '쌍곡선'],
+        '평면벡터': ['벡터', '내적', '외적'],
+        '공간도형': ['공간', '도형', '좌표']
+    },
+    '확률과통계': {
+        '경우의수': ['경우', '순열', '조합'],
+        '확률': ['확률', '사건', '조건부'],
+        '통계': ['평균', '분산', '표준편차']
+    }
+}
+
+# 핵심 개념 (DeepCSATAnalyzer.count_concepts_advanced)
+CONCEPT_KEYWORDS = {
+    '함수': ['함수', 'f(x)', 'g(x)'],
+    '미분': ['미분', '도함수', 'f\'(x)'],
+    '적분': ['적분', '∫', '넓이'],
+    '극한': ['극한', 'lim', '수렴'],
+    '수열': ['수열', '등차', '등비'],
+    '확률': ['확률', 'P(', '사건'],
+    '통계': ['평균', '분산', '표준편차'],
+    '벡터': ['벡터', '내적', '외적'],
+    '곡선': ['포물선', '타원', '쌍곡선'],
+    '로그': ['로그', 'log'],
+    '지수': ['지수', 'a^x'],
+    '삼각': ['삼각', 'sin', 'cos', 'tan']
+}
+
+# 함정 유형 (DeepCSATAnalyzer.determine_trap_type_advanced)
+TRAP_KEYWORDS = {
+    '특수경우형': ['특수', '경우', '예외'],
+    '부호실수형': ['부호', '+', '-', '양수', '음수'],
+    '조건누락형': ['조건', '단', '단,'],
+    '복합함정형': ['조건', '특수', '부호']
+}
+
+# 힌트1 핵심 개념 (AramedProblemGenerator.generate_hint1, 사전 순서대로 나열)
+HINT_CONCEPT_KEYWORDS = {
+    '실수인 n제곱근의 개수': ['n제곱근', '거듭제곱근'],
+    '등차수열': ['등차수열'],
+    '등비수열': ['등비수열'],
+    '로그함수': ['로그'],
+    '지수함수': ['지수'],
+}
+
+
+def _iter_keywords(groups):
+    """중첩 사전/리스트에서 키워드 문자열만 순회"""
+    if isinstance(groups, dict):
+        for value in groups.values():
+            yield from _iter_keywords(value)
+    else:
+        yield from groups
+
+
+ALL_KEYWORD_GROUPS = [
+    TOPIC_KEYWORDS, QUICK_TOPIC_KEYWORDS, MINOR_UNIT_KEYWORDS,
+    CONCEPT_KEYWORDS, TRAP_KEYWORDS, HINT_CONCEPT_KEYWORDS,
+]
+
+
+# ========== 매처 ==========
+
+class KeywordHits:
+    """스캔 결과: 키워드 -> 시작 위치 리스트"""
+
+    __slots__ = ('_positions',)
+
+    def __init__(self, positions):
+        self._positions = positions
+
+    def __contains__(self, keyword):
+        return keyword in self._positions
+
+    def has(self, keyword):
+        return keyword in self._positions
+
+    def count(self, keyword):
+        """키워드 등장 횟수 (겹치는 등장 포함)"""
+        return len(self._positions.get(keyword, ()))
+
+    def positions(self, keyword):
+        return list(self._positions.get(keyword, ()))
+
+    def keywords(self):
+        """등장한 모든 키워드"""
+        return set(self._positions)
+
+    def any(self, keywords):
+        """`any(kw in text for kw in keywords)`와 같음"""
+        return any(kw in self._positions for kw in keywords)
+
+    def count_present(self, keywords):
+        """`sum(1 for kw in keywords if kw in text)`와 같음"""
+        return sum(1 for kw in keywords if kw in self._positions)
+
+    def matched_groups(self, groups):
+        """키워드가 하나라도 등장한 그룹 이름 (사전 순서 유지)"""
+        return [name for name, keywords in groups.items() if self.any(keywords)]
+
+    def first_group(self, groups, order=None):
+        """order(없으면 사전 순서) 기준으로 처음 일치하는 그룹 이름, 없으면 None"""
+        for name in (order or groups):
+            if name in groups and self.any(groups[name]):
+                return name
+        return None
+
+    def group_scores(self, groups):
+        """그룹별 등장한 키워드 수 (0인 그룹 제외)"""
+        scores = {}
+        for name, keywords in groups.items():
+            score = self.count_present(keywords)
+            if score > 0:
+                scores[name] = score
+        return scores
+
+
+def _trie_pattern(keywords):
+    """
+    키워드 집합을 접두사 트리 형태의 정규식으로 변환
+
+    예: ['수열', '수렴', '수'] → 수(?:(?:렴|열))?
+    - 한 위치에서 공통 접두사를 한 번만 비교하므로 단순 alternation보다 빠름
+    - 선택적 그룹이 탐욕적이라 한 위치에서 가장 긴 키워드가 잡힘
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    전체 키워드를 하나의 정규식으로 컴파일한 매처 (텍스트를 왼쪽에서 오른쪽으로 한 번 스캔)
+
+    - 한 위치에서는 가장 긴 키워드만 잡히므로, 그 키워드 안에 들어 있는 키워드
+      (예: '확률변수' 안의 '확률', '변수')를 미리 계산해 함께 기록
+    - 잡힌 키워드의 뒷부분에서 시작해 밖으로 이어지는 키워드가 있을 수 있으면
+      그 위치부터 다시 찾음 (없으면 잡힌 키워드 끝에서 계속)
+    → 결과는 키워드마다 `keyword in text`를 검사한 것과 같음
+    """
+
+    def __init__(self, keywords):
+        unique = sorted({kw for kw in keywords if kw})
+        self.keywords = unique
+        self._pattern = re.compile(_trie_pattern(unique)) if unique else None
+
+        # 키워드 안에 들어 있는 키워드: kw -> [(오프셋, 키워드), ...]
+        self._contained = {}
+        # 다음 검색 시작 오프셋: kw[i:]로 시작하는 더 긴 키워드가 있는 가장 작은 i
+        self._restart = {}
+        for kw in unique:
+            contained = []
+            for other in unique:
+                start = kw.find(other)
+                while start != -1:
+                    contained.append((start, other))
+                    start = kw.find(other, start + 1)
+            self._contained[kw] = contained
+
+            restart = len(kw)
+            for i in range(1, len(kw)):
+                tail = kw[i:]
+                if any(other.startswith(tail) and len(other) > len(tail) for other in unique):
+                    restart = i
+                    break
+            self._restart[kw] = restart
+
+    def scan(self, text):
+        """
+        텍스트를 한 번 스캔해서 모든 키워드 등장 위치 수집
+
+        Returns:
+            KeywordHits
+        """
+        found = {}
+        if self._pattern is None or not text:
+            return KeywordHits({})
+
+        search = self._pattern.search
+        contained = self._contained
+        restart = self._restart
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            keyword = match.group()
+            for offset, other in contained[keyword]:
+                found.setdefault(other, set()).add(start + offset)
+            pos = start + restart[keyword]
+
+        return KeywordHits({kw: sorted(positions) for kw, positions in found.items()})
+
+
+_matcher = None
+
+
+def get_matcher():
+    """분류 사전 전체를 컴파일한 공용 매처 (최초 호출 시 한 번만 컴파일)"""
+    global _matcher
+    if _matcher is None:
+        keywords = []
+        for groups in ALL_KEYWORD_GROUPS:
+            keywords.extend(_iter_keywords(groups))
+        _matcher = KeywordMatcher(keywords)
+    return _matcher
+
+
+@lru_cache(maxsize=256)
+def scan_keywords(text):
+    """
+    공용 매처로 텍스트 스캔 (같은 텍스트는 캐시된 결과 재사용)
+
+    한 문제 텍스트를 여러 분류 함수가 읽을 때 스캔은 한 번만 일어남
+    """
+    return get_matcher().scan(text)
@@ -0,0 +1,184 @@
+# test_pdf_segmenter.py
+# 문제 번호 분할 (pdf_segmenter) 확인
+
+import os
+import tempfile
+
+import pdf_segmenter
+from pdf_segmenter import (PageWordCache, available_word_backend, join_pages, missing_numbers,
+                           segment_pages, segment_text, select_anchor_sequence)
+from pdf_text_cache import PDFTextCache
+
+
+def make_problem(number, body='다음 조건을 만족시키는 함수 f(x)에 대하여 f(2)의 값은?'):
+    return f'{number}. {body}\n① 1 ② 2 ③ 3 ④ 4 ⑤ 5\n'
+
+
+def numbers(problems):
+    return [problem['number'] for problem in problems]
+
+
+def make_page(lines, width=600.0, height=800.0):
+    """한 단짜리 페이지 단어 상자 (read_page_words 형식, 줄마다 왼쪽 여백 50pt)"""
+    words = []
+    for index, line in enumerate(lines):
+        x, top = 50.0, 20.0 + index * 14.0
+        for word in line.split():
+            words.append((x, top, x + len(word) * 6.0, top + 10.0, 10.0, word))
+            x += len(word) * 6.0 + 4.0
+    return (width, height, words)
+
+
+def page_lines(numbers, body='함수 f(x)에 대하여 f(2)의 값은?'):
+    return [line for number in numbers for line in (f'{number}. {body}', '① 1 ② 2 ③ 3 ④ 4 ⑤ 5')]
+
+
+def test_inner_numbered_list_keeps_later_problems():
+    # 7번 문제 안의 조건 목록 '1. … 2. …'가 번호를 다시 시작시키면 안 됨
+    text = ''.join(make_problem(n) for n in range(1, 7))
+    text += '7. 함수 f(x)가 다음 조건을 만족시킨다.\n1. f(0) = 0\n2. f(1) = 1\nf(3)의 값은?\n'
+    text += ''.join(make_problem(n) for n in range(8, 31))
+
+    problems = segment_text(text)
+
+    assert numbers(problems) == list(range(1, 31))
+    assert '1. f(0) = 0' in problems[6]['text']
+    assert '2. f(1) = 1' in problems[6]['text']
+    assert missing_numbers(problems) == []
+
+
+def test_missing_numbers_keep_later_problems():
+    # 9~15번이 빠진 텍스트 (이미지만 있는 페이지 등)에서도 16~30번을 잃지 않음
+    text = ''.join(make_problem(n) for n in list(range(1, 9)) + list(range(16, 31)))
+
+    problems = segment_text(text)
+
+    assert numbers(problems) == list(range(1, 9)) + list(range(16, 31))
+    assert missing_numbers(problems) == list(range(9, 16))
+
+
+def test_stray_numbers_are_skipped():
+    # 보기 속 숫자, 번호 사이의 엉뚱한 번호는 앞 문제의 일부
+    text = make_problem(1) + '100. 이 줄은 번호가 아님\n' + make_problem(2) + '1. 보기 안의 목록\n' + make_problem(3)
+
+    problems = segment_text(text)
+
+    assert numbers(problems) == [1, 2, 3]
+    assert '100.' in problems[0]['text']
+    assert '1. 보기 안의 목록' in problems[1]['text']
+
+
+def test_restart_only_at_page_boundary():
+    # 공통 1~3번 + 선택 과목 1~2번: 두 번째 '1.'이 새 페이지 첫 후보일 때만 다시 시작
+    first = ''.join(make_problem(n) for n in range(1, 4))
+    second = ''.join(make_problem(n) for n in range(1, 3))
+
+    text, page_starts = join_pages([first, '', second])
+    problems = segment_text(text, page_starts)
+    assert numbers(problems) == [1, 2, 3, 1, 2]
+    assert [problem['page'] for problem in problems] == [1, 1, 1, 3, 3]
+    assert missing_numbers(problems) == []
+
+    # 같은 페이지 안의 '1.'에서는 다시 시작하지 않음
+    problems = segment_text(first + second)
+    assert numbers(problems) == [1, 2, 3]
+    assert all(problem['page'] is None for problem in problems)
+
+
+def test_zero_number_is_not_an_anchor():
+    # '0.' 줄은 문제 번호가 아님 (번호 0이 선택 단계에서 멈추지 않아야 함)
+    problems = segment_text('1. 함수\n0.\n2. 다음\n')
+    assert numbers(problems) == [1, 2]
+    assert '0.' in problems[0]['text']
+
+    result = segment_pages([make_page(['1. 함수', '0.', '2. 다음'])])
+    assert numbers(result['problems']) == [1, 2]
+
+    assert select_anchor_sequence([(1, False), (0, False), (2, False)]) == [0, 2]
+    assert select_anchor_sequence([(0, False)]) == []
+
+
+def test_join_pages_matches_plain_join():
+    pages = ['첫 페이지', '', None, '셋째 페이지', '']
+    text, page_starts = join_pages(pages)
+
+    assert text == '\n'.join(page for page in pages if page)
+    assert page_starts == [0, 6, 6, 6, 13]
+
+
+def test_segment_pages_stray_margin_number():
+    # 왼쪽 여백의 엉뚱한 '1.'과 빠진 번호가 뒤 문제를 잘라내면 안 됨
+    first = page_lines(range(1, 4)) + ['1. 조건 (가)'] + page_lines(range(4, 6))
+    second = page_lines(range(12, 16))
+
+    result = segment_pages([make_page(first), make_page(second)])
+    problems = result['problems']
+
+    assert numbers(problems) == [1, 2, 3, 4, 5, 12, 13, 14, 15]
+    assert '1. 조건 (가)' in problems[2]['text']
+    assert [problem['page'] for problem in problems] == [1] * 5 + [2] * 4
+    assert missing_numbers(problems) == list(range(6, 12))
+
+
+def test_segment_pages_restart_at_page():
+    # 선택 과목 문제지처럼 새 페이지에서 1번부터 다시 시작
+    result = segment_pages([make_page(page_lines(range(1, 4))), make_page(page_lines(range(1, 3)))])
+
+    assert numbers(result['problems']) == [1, 2, 3, 1, 2]
+    assert missing_numbers(result['problems']) == []
+    assert all(problem['bbox'] is not None for problem in result['problems'])
+
+
+def test_page_word_cache_parses_once():
+    backend = available_word_backend()
+    if backend != 'pymupdf':
+        return
+    import fitz
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, 'sample.pdf')
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_text((72, 72), '1. sample problem', fontsize=11)
+            doc.save(pdf_path)
+
+        # 파일 해시 목록까지 임시 폴더에 저장 (저장소의 data/pdf_text_cache에 남기지 않음)
+        cache_dir = os.path.join(temp_dir, 'cache')
+        cache = PageWordCache(cache_dir, text_cache=PDFTextCache(cache_dir))
+        parse = pdf_segmenter.parse_page_words
+        calls = []
+
+        def counting_parse(*args):
+            calls.append(args)
+            return parse(*args)
+
+        pdf_segmenter.parse_page_words = counting_parse
+        try:
+            first = cache.get_pages(pdf_path, backend)
+            second = cache.get_pages(pdf_path, backend)
+        finally:
+            pdf_segmenter.parse_page_words = parse
+
+        assert len(calls) == 1
+        assert first == second
+        assert [word[5] for word in first[0][2]] == ['1.', 'sample', 'problem']
+
+
+def test_select_anchor_sequence():
+    assert select_anchor_sequence([]) == []
+    # 번호 순서: 3 뒤의 '1.'(다시 시작 불가)은 건너뜀
+    assert select_anchor_sequence([(1, False), (2, False), (1, False), (3, False)]) == [0, 1, 3]
+    # 같은 번호가 두 번이면 다음 번호에 가까운 뒤쪽
+    assert select_anchor_sequence([(1, False), (2, False), (2, False), (3, False)]) == [0, 2, 3]
+    # 끝에 붙은 엉뚱한 번호 하나는 제외, 번호가 건너뛰어도 뒤 문제가 둘 이상이면 포함
+    assert select_anchor_sequence([(1, False), (2, False), (3, False), (100, False)]) == [0, 1, 2]
+    assert select_anchor_sequence([(1, False), (2, False), (9, False), (10, False)]) == [0, 1, 2, 3]
+    # 다시 시작 가능한 '1.'만 번호 1로 다시 시작
+    assert select_anchor_sequence([(1, False), (2, False), (1, True), (2, False), (3, False)]) == [0, 1, 2, 3, 4]
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f'[OK] {name}')
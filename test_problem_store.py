@@ -0,0 +1,59 @@
+# test_problem_store.py
+# 컬럼 저장소 (problem_store) pickle 확인 - 워커 프로세스(spawn)로 넘길 때
+
+import os
+import pickle
+import tempfile
+
+from problem_store import CATEGORY, FLOAT, INT, TEXT, ProblemStore, column
+
+SCHEMA = [
+    column('출제년도', INT, 'h'),
+    column('과목구분', CATEGORY),
+    column('풀이소요시간', FLOAT, 'd'),
+    column('본문', TEXT),
+]
+
+RECORDS = [
+    {'출제년도': '2023', '과목구분': '기하', '풀이소요시간': '2.5', '본문': '첫 문제'},
+    {'출제년도': '2024', '과목구분': '미적분', '풀이소요시간': '', '본문': '둘째 문제'},
+    {'출제년도': '2024', '과목구분': '기하', '풀이소요시간': '4', '본문': ''},
+]
+
+
+def rows(store):
+    return [row.to_dict() for row in store]
+
+
+def same_rows(left, right):
+    # NaN(빈 값)은 문자열로 비교
+    return repr(rows(left)) == repr(rows(right))
+
+
+def test_pickle_mapped_store():
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
+        path = os.path.join(temp_dir, 'sample.pstore')
+        ProblemStore.from_records(RECORDS, SCHEMA, meta={'source': 'test'}).save(path)
+
+        store = ProblemStore.load(path)
+        assert store._mapped is not None
+        restored = pickle.loads(pickle.dumps(store))
+
+        assert same_rows(restored, store)
+        assert restored.meta == {'source': 'test'}
+        assert restored.categories('과목구분') == store.categories('과목구분')
+
+
+def test_pickle_memory_store():
+    store = ProblemStore.from_records(RECORDS, SCHEMA)
+    restored = pickle.loads(pickle.dumps(store))
+
+    assert same_rows(restored, store)
+    assert list(restored.codes('과목구분')) == list(store.codes('과목구분'))
+
+
+if __name__ == '__main__':
+    for name, func in list(globals().items()):
+        if name.startswith('test_') and callable(func):
+            func()
+            print(f'[OK] {name}')
@@ -0,0 +1,350 @@
+# trend_engine.py
+# 수능 경향 집계 엔진 (연도 × 과목 × 문항번호 구간 group-by를 한 번에 계산) + 조회 API
+
+"""
+problem_store 컬럼을 한 번 인코딩해서 (연도, 과목, 문항번호 구간) 셀마다
+문제 수, 정답률(평균/중앙값), 킬러 비율, 풀이시간 분포를 한 번에 집계함.
+NumPy가 있으면 bincount/lexsort로 벡터화, 없으면 행을 한 번 도는 같은 결과의 순수 파이썬 경로 사용.
+
+사용 예시:
+    from problem_store import load_analysis_store
+    from trend_engine import TrendEngine
+
+    engine = TrendEngine.from_store(load_analysis_store(csv_path))
+    engine.query(subject='미적분', number=25)           # 해당 과목 23-28번 구간 통계
+    engine.query(year=[2024, 2025, 2026])               # 최근 3년
+    engine.group_by('year')                             # {2022: 통계, 2023: 통계, ...}
+    engine.group_by('subject', 'band', year=2026)       # {(과목, 구간): 통계}
+
+    # trends_analysis.json에 저장된 셀로도 같은 조회 가능 (원본 CSV 불필요)
+    engine = TrendEngine.from_trends(json.load(open('trends_analysis.json', encoding='utf-8')))
+
+통계 형식:
+    {'count', 'killer_count', 'killer_share'(%),
+     'answer_rate': {'n', 'mean', 'median'},                 # 0보다 큰 정답률만
+     'solving_time': {'n', 'mean', 'median', 'histogram': {구간: 개수}}}
+"""
+
+import heapq
+import statistics
+from collections import Counter
+
+from problem_store import NUMPY_AVAILABLE, MISSING_INT
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# 문항번호 구간 (analyze_trends의 문항번호별 경향과 같은 구간)
+NUMBER_BANDS = (
+    ('1-15번 (기본)', 1, 15),
+    ('16-22번 (중급)', 16, 22),
+    ('23-28번 (고급)', 23, 28),
+    ('29-30번 (킬러)', 29, 30),
+)
+
+# 풀이시간 분포 구간 (분, 오른쪽 끝 포함)
+TIME_EDGES = (2, 4, 6, 8)
+TIME_LABELS = ('~2분', '3-4분', '5-6분', '7-8분', '9분~')
+
+KILLER_KEYWORD = '킬러'   # 킬러여부판정에 이 글자가 있으면 킬러 계열 (준킬러/슈퍼킬러 포함)
+
+DIMENSIONS = ('year', 'subject', 'band')
+
+
+def band_of(number, bands=NUMBER_BANDS):
+    """문항번호 → 구간 이름 (어느 구간에도 없으면 None)"""
+    if number is None:
+        return None
+    for label, start, end in bands:
+        if start <= number <= end:
+            return label
+    return None
+
+
+def _time_bin(minutes):
+    for i, edge in enumerate(TIME_EDGES):
+        if minutes <= edge:
+            return i
+    return len(TIME_EDGES)
+
+
+def _summary(values):
+    if not values:
+        return {'n': 0, 'mean': None, 'median': None}
+    return {'n': len(values), 'mean': statistics.mean(values), 'median': statistics.median(values)}
+
+
+def _cell_sort_key(cell, band_order):
+    year = cell['year']
+    return (MISSING_INT if year is None else year, cell['subject'],
+            band_order.get(cell['band'], len(band_order)))
+
+
+def _matches(value, wanted):
+    if wanted is None:
+        return True
+    if isinstance(wanted, (list, tuple, set, frozenset)):
+        return value in wanted
+    return value == wanted
+
+
+class TrendEngine:
+    """(연도, 과목, 문항번호 구간) 셀 집계 + 조회"""
+
+    def __init__(self, cells, bands=NUMBER_BANDS, store=None):
+        """
+        Args:
+            cells: [{'year', 'subject', 'band', 'count', 'killer',
+                     'rates': 정렬된 정답률, 'times': 정렬된 풀이시간, 'time_hist': [구간별 개수]}, ...]
+            store: 원본 ProblemStore (category_counts 등 행 단위 조회용, 없으면 셀 조회만 가능)
+        """
+        self.bands = tuple(tuple(band) for band in bands)
+        self._band_order = {label: i for i, (label, _, _) in enumerate(self.bands)}
+        self.cells = sorted(cells, key=lambda cell: _cell_sort_key(cell, self._band_order))
+        self.store = store
+
+    # ========== 생성 ==========
+
+    @classmethod
+    def from_store(cls, store, bands=NUMBER_BANDS):
+        """컬럼 저장소에서 집계 (값 파싱은 저장소에서 이미 끝남, 여기서는 인코딩 + 집계 한 번)"""
+        builder = cls._cells_numpy if NUMPY_AVAILABLE else cls._cells_python
+        return cls(builder(store, bands), bands, store)
+
+    @classmethod
+    def from_trends(cls, trends):
+        """trends_analysis.json의 'cube'에서 복원 (없으면 None)"""
+        cube = trends.get('cube') if trends else None
+        if not cube:
+            return None
+        return cls(cube['cells'], cube.get('bands', NUMBER_BANDS))
+
+    @staticmethod
+    def _cells_python(store, bands):
+        """순수 파이썬: 행을 한 번 돌면서 셀별 누적"""
+        subjects = store.categories('과목구분')
+        killer_flags = [KILLER_KEYWORD in text for text in store.categories('킬러여부판정')]
+        years = store.column('출제년도')
+        numbers = store.column('문항번호')
+        subject_codes = store.codes('과목구분')
+        killer_codes = store.codes('킬러여부판정')
+        rates = store.column('공식정답률')
+        times = store.column('풀이소요시간')
+
+        cells = {}
+        for i in range(len(store)):
+            year = int(years[i])
+            key = (None if year == MISSING_INT else year, subjects[subject_codes[i]],
+                   band_of(None if numbers[i] == MISSING_INT else int(numbers[i]), bands))
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = {'year': key[0], 'subject': key[1], 'band': key[2], 'count': 0,
+                                     'killer': 0, 'rates': [], 'times': [],
+                                     'time_hist': [0] * len(TIME_LABELS)}
+            cell['count'] += 1
+            if killer_flags[killer_codes[i]]:
+                cell['killer'] += 1
+            rate = float(rates[i])
+            if rate > 0:      # NaN은 비교가 모두 거짓이라 제외됨
+                cell['rates'].append(rate)
+            minutes = float(times[i])
+            if minutes > 0:
+                cell['times'].append(minutes)
+                cell['time_hist'][_time_bin(minutes)] += 1
+
+        for cell in cells.values():
+            cell['rates'].sort()
+            cell['times'].sort()
+        return list(cells.values())
+
+    @staticmethod
+    def _cells_numpy(store, bands):
+        """NumPy: 셀 번호를 한 번 계산하고 bincount/lexsort로 모든 셀을 동시에 집계"""
+        n = len(store)
+        if n == 0:
+            return []
+        subjects = store.categories('과목구분')
+        years = np.asarray(store.column('출제년도'), dtype=np.int64)
+        numbers = np.asarray(store.column('문항번호'), dtype=np.int64)
+        subject_codes = np.asarray(store.codes('과목구분'), dtype=np.int64)
+        killer_lookup = np.array([KILLER_KEYWORD in text for text in store.categories('킬러여부판정')])
+        killer = killer_lookup[np.asarray(store.codes('킬러여부판정'), dtype=np.int64)]
+        rates = np.asarray(store.column('공식정답률'), dtype=np.float64)
+        times = np.asarray(store.column('풀이소요시간'), dtype=np.float64)
+
+        # 셀 번호 = ((연도 순번 × 과목 수) + 과목 코드) × (구간 수 + 1) + 구간 번호
+        year_values, year_index = np.unique(years, return_inverse=True)
+        band_index = np.full(n, len(bands), dtype=np.int64)   # 마지막 번호 = 구간 밖
+        for b in range(len(bands) - 1, -1, -1):               # 앞 구간이 우선
+            _, start, end = bands[b]
+            band_index[(numbers >= start) & (numbers <= end)] = b
+        band_slots = len(bands) + 1
+        key = (year_index.reshape(-1) * len(subjects) + subject_codes) * band_slots + band_index
+        cell_count = len(year_values) * len(subjects) * band_slots
+
+        counts = np.bincount(key, minlength=cell_count)
+        killer_counts = np.bincount(key, weights=killer, minlength=cell_count)
+
+        def grouped_values(valid, values):
+            """셀 번호별로 정렬된 값 목록 (셀 번호, 값 순으로 한 번 정렬)"""
+            keys, vals = key[valid], values[valid]
+            order = np.lexsort((vals, keys))
+            keys, vals = keys[order], vals[order]
+            bounds = np.searchsorted(keys, present, side='left'), np.searchsorted(keys, present, side='right')
+            return vals, bounds
+
+        present = np.flatnonzero(counts)
+        with np.errstate(invalid='ignore'):
+            rate_valid = rates > 0
+            time_valid = times > 0
+        rate_vals, (rate_lo, rate_hi) = grouped_values(rate_valid, rates)
+        time_vals, (time_lo, time_hi) = grouped_values(time_valid, times)
+        time_bins = np.searchsorted(np.asarray(TIME_EDGES, dtype=np.float64), times[time_valid], side='left')
+        time_hist = np.bincount(key[time_valid] * len(TIME_LABELS) + time_bins,
+                                minlength=cell_count * len(TIME_LABELS)).reshape(cell_count, len(TIME_LABELS))
+
+        cells = []
+        for j, cell_key in enumerate(present.tolist()):
+            rest, band = divmod(cell_key, band_slots)
+            year_pos, subject_code = divmod(rest, len(subjects))
+            year = int(year_values[year_pos])
+            cells.append({
+                'year': None if year == MISSING_INT else year,
+                'subject': subjects[subject_code],
+                'band': bands[band][0] if band < len(bands) else None,
+                'count': int(counts[cell_key]),
+                'killer': int(killer_counts[cell_key]),
+                'rates': rate_vals[rate_lo[j]:rate_hi[j]].tolist(),
+                'times': time_vals[time_lo[j]:time_hi[j]].tolist(),
+                'time_hist': time_hist[cell_key].tolist(),
+            })
+        return cells
+
+    # ========== 조회 ==========
+
+    def _select(self, filters):
+        unknown = set(filters) - set(DIMENSIONS) - {'number'}
+        if unknown:
+            raise ValueError(f"알 수 없는 조건: {sorted(unknown)}")
+        filters = dict(filters)
+        number = filters.pop('number', None)
+        if number is not None:
+            filters['band'] = band_of(number, self.bands)
+            if filters['band'] is None:
+                return []
+        return [cell for cell in self.cells
+                if all(_matches(cell[dim], wanted) for dim, wanted in filters.items())]
+
+    def _stats(self, cells):
+        count = sum(cell['count'] for cell in cells)
+        killer = sum(cell['killer'] for cell in cells)
+        rates = list(heapq.merge(*(cell['rates'] for cell in cells)))
+        times = list(heapq.merge(*(cell['times'] for cell in cells)))
+        histogram = [0] * len(TIME_LABELS)
+        for cell in cells:
+            for i, value in enumerate(cell['time_hist']):
+                histogram[i] += value
+        solving_time = _summary(times)
+        solving_time['histogram'] = dict(zip(TIME_LABELS, histogram))
+        return {
+            'count': count,
+            'killer_count': killer,
+            'killer_share': killer / count * 100 if count else 0.0,
+            'answer_rate': _summary(rates),
+            'solving_time': solving_time,
+        }
+
+    def query(self, **filters):
+        """
+        조건에 맞는 셀을 합친 통계
+
+        Args (모두 선택, 값 하나 또는 리스트):
+            year: 출제년도 (int, 빈 값은 None)
+            subject: 과목구분
+            band: 문항번호 구간 이름 (NUMBER_BANDS, 구간 밖은 None)
+            number: 문항번호 (해당 구간으로 변환)
+        """
+        return self._stats(self._select(filters))
+
+    def group_by(self, *dims, **filters):
+        """
+        dims 기준으로 묶은 통계 (셀 정렬 순서: 연도, 과목, 구간 순)
+
+        Returns:
+            {키: 통계} - dims가 하나면 키는 값 하나, 여러 개면 튜플
+        """
+        for dim in dims:
+            if dim not in DIMENSIONS:
+                raise ValueError(f"알 수 없는 기준: {dim}")
+        groups = {}
+        for cell in self._select(filters):
+            key = tuple(cell[dim] for dim in dims)
+            groups.setdefault(key[0] if len(dims) == 1 else key, []).append(cell)
+        return {key: self._stats(cells) for key, cells in groups.items()}
+
+    def category_counts(self, name, exclude=(), **filters):
+        """
+        범주형 컬럼 값별 개수 (조건에 맞는 행에서 처음 등장한 순서, Counter와 같은 순서)
+
+        원본 store가 있을 때만 사용 가능 (from_store로 만든 엔진)
+        """
+        if self.store is None:
+            raise ValueError("category_counts는 from_store()로 만든 엔진에서만 사용할 수 있습니다")
+        rows = self._row_mask(filters)
+        categories = self.store.categories(name)
+        codes = self.store.codes(name)
+        if NUMPY_AVAILABLE:
+            selected = np.asarray(codes, dtype=np.int64)
+            if rows is not None:
+                selected = selected[rows]
+            present, first, counts = np.unique(selected, return_index=True, return_counts=True)
+            order = np.argsort(first, kind='stable')
+            pairs = ((categories[present[i]], int(counts[i])) for i in order)
+        else:
+            indices = range(len(codes)) if rows is None else rows
+            pairs = Counter(categories[codes[i]] for i in indices).items()
+        return Counter({value: count for value, count in pairs if value not in exclude})
+
+    def _row_mask(self, filters):
+        """행 조건 (NumPy면 bool 배열, 아니면 행 번호 리스트, 조건 없으면 None)"""
+        if not filters:
+            return None
+        store = self.store
+        band_of_row = lambda number: band_of(None if number == MISSING_INT else int(number), self.bands)
+        tests = []
+        for dim, wanted in filters.items():
+            if dim == 'year':
+                tests.append((store.column('출제년도'), lambda v, w=wanted: _matches(None if v == MISSING_INT else int(v), w)))
+            elif dim == 'subject':
+                subjects = store.categories('과목구분')
+                tests.append((store.codes('과목구분'), lambda v, w=wanted: _matches(subjects[v], w)))
+            elif dim == 'band':
+                tests.append((store.column('문항번호'), lambda v, w=wanted: _matches(band_of_row(v), w)))
+            elif dim == 'number':
+                # _select와 같게: None이면 조건 없음, 어느 구간에도 없는 번호면 결과 없음
+                if wanted is None:
+                    continue
+                band = band_of(wanted, self.bands)
+                tests.append((store.column('문항번호'), lambda v, w=band: w is not None and band_of_row(v) == w))
+            else:
+                raise ValueError(f"알 수 없는 조건: {dim}")
+
+        if NUMPY_AVAILABLE:
+            mask = np.ones(len(store), dtype=bool)
+            for values, test in tests:
+                # 값 종류가 적으므로 고유값마다 한 번만 판정
+                unique, inverse = np.unique(np.asarray(values), return_inverse=True)
+                mask &= np.array([test(v) for v in unique.tolist()], dtype=bool)[inverse.reshape(-1)]
+            return mask
+        return [i for i in range(len(store)) if all(test(values[i]) for values, test in tests)]
+
+    # ========== 저장 ==========
+
+    def to_dict(self):
+        """trends_analysis.json 'cube' 항목"""
+        return {
+            'dimensions': list(DIMENSIONS),
+            'bands': [list(band) for band in self.bands],
+            'time_bins': list(TIME_LABELS),
+            'cells': self.cells,
+        }